@@ -0,0 +1,69 @@
+"""
+Measures the latency of menu searches on a synthetic 5,000 item catalog, comparing
+the previous linear substring scan with the MenuCatalog search index. Needs no database.
+
+    python Benchmarks/bench_menu_search.py [items]
+"""
+import sys
+import os
+import random
+import statistics
+import time
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.MenuItems import MenuItems
+from Helpers.menu_catalog import MenuCatalog
+
+ITEMS = 5000
+REPEATS = 200
+WORDS = ["Chicken", "Beef", "Pork", "Duck", "Prawn", "Shrimp", "Vegetable", "Mushroom", "Egg", "Tofu",
+         "Fried", "Rice", "Noodles", "Curry", "Sweet", "Sour", "Chilli", "Black", "Bean", "Sauce",
+         "Satay", "Kung", "Po", "Szechuan", "Lemon", "Honey", "Garlic", "Ginger", "Spring", "Roll"]
+QUERIES = ["1234", "12", "chicken", "chick", "chikcen", "fried rice", "nodles", "curry sauce", "szechaun beef", "zzz"]
+
+def synthetic_menu(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [MenuItems(f"{i}{rng.choice(['', 'a', 'b'])}", " ".join(rng.sample(WORDS, rng.randint(2, 4))), rng.uniform(2, 15))
+            for i in range(1, count + 1)]
+
+def linear_search(items: list, text: str) -> list:
+    """The previous search, a substring scan over every item."""
+    text = text.lower()
+    return [item for item in items if text in item.menuName.lower() or text in item.menuNumber.lower()]
+
+def latency(function, *args) -> tuple:
+    """Median and 95th percentile milliseconds of REPEATS calls, and the last result."""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)], result
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ITEMS
+    items = synthetic_menu(count)
+    catalog = MenuCatalog(lambda: items)
+
+    start = time.perf_counter()
+    catalog.refresh()
+    print(f"{count} items, index built in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    start = time.perf_counter()
+    for item in items[:100]:
+        catalog.upsert(MenuItems(item.menuNumber, item.menuName + " Special", item.menuPrice, item.menuTags))
+    print(f"Incremental update: {(time.perf_counter() - start) * 10:.3f}ms per edited item")
+
+    all_items = catalog.all_items()
+    print(f"{'query':<16} {'scan p50':>9} {'scan p95':>9} {'hits':>6} {'index p50':>10} {'index p95':>10} {'hits':>6}")
+    for query in QUERIES:
+        scan_p50, scan_p95, scan_hits = latency(linear_search, all_items, query)
+        index_p50, index_p95, index_hits = latency(catalog.search, query)
+        print(f"{query:<16} {scan_p50:>8.3f}ms {scan_p95:>8.3f}ms {len(scan_hits):>6} "
+              f"{index_p50:>9.3f}ms {index_p95:>9.3f}ms {len(index_hits):>6}")
+
+if __name__ == "__main__":
+    main()
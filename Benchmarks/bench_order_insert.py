@@ -0,0 +1,78 @@
+"""
+Compares the old one INSERT per line item order persistence with the single
+multi-row insert used by add_customer_order.
+
+Every order is written inside a transaction that is rolled back, so the
+benchmark leaves the database unchanged. Needs a configured .env, at least
+one menu item and at least one user. Runs against the backend selected by
+DB_BACKEND, e.g. an SQLite file set up with admin_setup.py:
+
+    python Benchmarks/bench_order_insert.py
+    DB_BACKEND=sqlite python Benchmarks/bench_order_insert.py
+"""
+import sys
+import os
+import json
+import time
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Helpers.storage import get_storage
+from gui_functions import insert_order, fetch_menu_items, get_all_user
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+
+LINE_COUNTS = [1, 5, 10, 20, 40, 60, 80, 100]
+REPEATS = 20
+
+def insert_order_per_row(cursor, order: CustomerOrder) -> int:
+    """The previous behaviour of add_customer_order, one round trip per line item."""
+    query = """
+            INSERT INTO customer_orders(employee_username, time_of_order, total_price, total_no_of_items)
+            VALUES (%s, %s, %s, %s)"""
+    cursor.execute(query,(order.employeeID, order.datetime, order.totalprice, order.total_items))
+    last_inserted_id = cursor.lastrowid
+    for menuItem in order.menu_items:
+        query = """
+            INSERT INTO menu_item_order(order_id, menuNo, quantity, total_price, modifications)
+            VALUES (%s, %s, %s, %s, %s)"""
+        modifications_json = json.dumps(menuItem.modifications)
+        cursor.execute(query,(last_inserted_id, menuItem.menuNumber, menuItem.quantity, menuItem.total_price,modifications_json ))
+    return last_inserted_id
+
+def build_order(employee: str, menu_item, lines: int) -> CustomerOrder:
+    """Build an order with the given number of distinct lines of the same menu item."""
+    order = CustomerOrder(employee)
+    for i in range(lines):
+        order.add_item(MenuItemOrder(menu_item, modifications={f"Extra {i}": 0.0}))
+    order.update_total_items()
+    return order
+
+def time_insert(insert, order: CustomerOrder) -> float:
+    """Average seconds taken by insert over REPEATS rolled back transactions."""
+    with get_storage().connection() as db:
+        cursor = db.cursor()
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            insert(cursor, order)
+            db.rollback()
+        return (time.perf_counter() - start) / REPEATS
+
+def main() -> None:
+    menu_items = fetch_menu_items("*", 1)
+    users = get_all_user()
+    if not menu_items or not users:
+        print("The benchmark needs at least one menu item and one user in the database.")
+        return
+
+    print(f"Backend: {get_storage().name}")
+    print(f"{'lines':>6} {'per row (ms)':>14} {'multi-row (ms)':>16} {'speed up':>10}")
+    for lines in LINE_COUNTS:
+        order = build_order(users[0][1], menu_items[0], lines)
+        old = time_insert(insert_order_per_row, order)
+        new = time_insert(insert_order, order)
+        print(f"{lines:>6} {old * 1000:>14.2f} {new * 1000:>16.2f} {old / new:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
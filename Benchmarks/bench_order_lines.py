@@ -0,0 +1,64 @@
+"""
+Measures the memory held by 100,000 order lines spread over orders of 20 lines,
+the time taken to build them, and copying a line for modification with
+copy.deepcopy compared with MenuItemOrder.with_quantity(). Needs no database.
+
+    python Benchmarks/bench_order_lines.py [lines]
+"""
+import sys
+import os
+import copy
+import time
+import tracemalloc
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+
+LINES = 100000
+LINES_PER_ORDER = 20
+COPIES = 20000
+
+def build_orders(menu: list, lines: int) -> list:
+    """Build orders of LINES_PER_ORDER distinct lines until there are the given number of lines."""
+    orders = []
+    for start in range(0, lines, LINES_PER_ORDER):
+        order = CustomerOrder("bench")
+        for i in range(start, min(start + LINES_PER_ORDER, lines)):
+            order.add_item(MenuItemOrder(menu[i % len(menu)], 1 + i % 3, {"Extra egg": 0.5} if i % 2 else None))
+        orders.append(order)
+    return orders
+
+def time_copies(copy_line, line) -> float:
+    """Average microseconds of COPIES copies of a line."""
+    start = time.perf_counter()
+    for _ in range(COPIES):
+        copy_line(line)
+    return (time.perf_counter() - start) / COPIES * 1e6
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    menu = [MenuItems(str(i), f"Dish {i}", 3.5 + i % 10, ["Chicken", "Rice"]) for i in range(1, 201)]
+
+    start = time.perf_counter()
+    build_orders(menu, lines)
+    seconds = time.perf_counter() - start
+
+    # Built again while tracing, which slows it down too much to time
+    tracemalloc.start()
+    orders = build_orders(menu, lines)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{lines} lines in {len(orders)} orders built in {seconds * 1000:.0f}ms, "
+          f"{held / 2 ** 20:.1f}MiB held, {held / lines:.0f} bytes per line")
+
+    line = orders[0].menu_items[1]
+    print(f"copy.deepcopy:   {time_copies(copy.deepcopy, line):.2f}us per line")
+    if hasattr(line, "with_quantity"):
+        print(f"with_quantity(1): {time_copies(lambda item: item.with_quantity(1), line):.2f}us per line")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measures reading the totals of orders of growing size, comparing the previous
+full recount of every line with the running totals CustomerOrder now keeps, and
+the cost of the changes keeping them up to date. Needs no database.
+
+    python Benchmarks/bench_order_totals.py [max_lines]
+"""
+import sys
+import os
+import time
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+
+MAX_LINES = 10000
+READS = 10000
+
+def build_order(lines: int) -> CustomerOrder:
+    """Build an order with the given number of distinct lines."""
+    menu_item = MenuItems("1", "Egg Rice", 3.5)
+    order = CustomerOrder("bench")
+    for i in range(lines):
+        order.add_item(MenuItemOrder(menu_item, modifications={f"Extra {i}": 0.5}))
+    return order
+
+def recount(order: CustomerOrder) -> tuple:
+    """The previous totals, summed over every line on each read."""
+    return order.calculate_total(), sum(item.quantity for item in order.menu_items)
+
+def running(order: CustomerOrder) -> tuple:
+    return order.totalprice, order.total_items
+
+def per_call(function, order: CustomerOrder) -> float:
+    """Average microseconds of a call over READS calls."""
+    start = time.perf_counter()
+    for _ in range(READS):
+        function(order)
+    return (time.perf_counter() - start) / READS * 1e6
+
+def per_change(order: CustomerOrder) -> float:
+    """Average microseconds of incrementing and decrementing each line once."""
+    start = time.perf_counter()
+    for item in order.menu_items:
+        item.increment_quantity()
+        item.decrement_quantity()
+    return (time.perf_counter() - start) / (2 * len(order.menu_items)) * 1e6
+
+def main() -> None:
+    max_lines = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_LINES
+    print(f"{'lines':>6} {'recount':>12} {'running':>12} {'change':>12}")
+    lines = 1
+    while lines <= max_lines:
+        order = build_order(lines)
+        assert recount(order) == running(order)
+        print(f"{lines:>6} {per_call(recount, order):>10.3f}us {per_call(running, order):>10.3f}us "
+              f"{per_change(order):>10.3f}us")
+        order.verify_totals()
+        lines *= 10
+
+if __name__ == "__main__":
+    main()
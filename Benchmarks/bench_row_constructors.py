@@ -0,0 +1,79 @@
+"""
+Compares building objects from database rows through the validating constructors
+with the trusted from_rows() constructors the data layer uses, for a large menu and
+a month of order history made of synthetic rows shaped like those it reads. Needs no database.
+
+    python Benchmarks/bench_row_constructors.py [menu_items] [order_lines]
+"""
+import sys
+import os
+import json
+import random
+import time
+from decimal import Decimal
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.MenuItems import MenuItems
+from Classes.MenuItemOrder import MenuItemOrder
+from gui_functions import build_order_items
+
+MENU_ITEMS = 5000
+ORDER_LINES = 100000  # About a month of a busy restaurant
+REPEATS = 5
+TAGS = ["Chicken", "Beef", "Pork", "Duck", "Prawn", "Vegetarian", "Rice", "Noodles", "Spicy"]
+MODIFICATIONS = ["{}", "{}", "{}", '{"Extra egg": 0.5}', '{"No onions": 0.0, "Extra chilli": 0.3}']
+
+def menu_rows(count: int, rng: random.Random) -> list:
+    """(menuNo, name, price, tags) rows as grouped by rows_to_menu_items."""
+    return [(f"{i}{rng.choice(['', 'a', 'b'])}", f"Dish {i}", Decimal(rng.randint(250, 1500)) / 100,
+             rng.sample(TAGS, rng.randint(0, 3)))
+            for i in range(1, count + 1)]
+
+def order_rows(count: int, menu: list, rng: random.Random) -> list:
+    """(menuNo, name, quantity, unit price, modifications JSON) rows as read by get_past_order_items."""
+    rows = []
+    for _ in range(count):
+        menu_number, name, price, _ = rng.choice(menu)
+        rows.append((menu_number, name, rng.randint(1, 3), price, rng.choice(MODIFICATIONS)))
+    return rows
+
+def validated_menu(rows: list) -> list:
+    """The previous path, every row through MenuItems.__init__."""
+    return [MenuItems(menu_number, name, price, tags) for menu_number, name, price, tags in rows]
+
+def validated_lines(rows: list) -> list:
+    """The previous path, a MenuItems and a MenuItemOrder built through __init__ for every row."""
+    return [MenuItemOrder(MenuItems(menu_number, name, price, []), quantity, json.loads(modifications))
+            for menu_number, name, quantity, price, modifications in rows]
+
+def best_of(function, rows: list) -> tuple:
+    """Fastest milliseconds of REPEATS runs, and the last result."""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function(rows)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main() -> None:
+    menu_count = int(sys.argv[1]) if len(sys.argv) > 1 else MENU_ITEMS
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else ORDER_LINES
+    rng = random.Random(1)
+    menu = menu_rows(menu_count, rng)
+    lines = order_rows(line_count, menu, rng)
+
+    for label, rows, validated, trusted in [
+        (f"{menu_count} menu items", menu, validated_menu, MenuItems.from_rows),
+        (f"{line_count} order lines", lines, validated_lines, build_order_items),
+    ]:
+        validated_ms, expected = best_of(validated, rows)
+        trusted_ms, built = best_of(trusted, rows)
+        assert [str(item) for item in expected] == [str(item) for item in built]
+        print(f"{label:<20} __init__ {validated_ms:>8.1f}ms   from_rows {trusted_ms:>8.1f}ms   "
+              f"{validated_ms / trusted_ms:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
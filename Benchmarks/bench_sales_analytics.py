@@ -0,0 +1,72 @@
+"""
+Compares grouping a year of synthetic order lines into revenue by hour x
+weekday x item x employee with a Python dictionary loop against the vectorized
+SalesCube, then times the reports read from the cube. Needs no database.
+
+    python Benchmarks/bench_sales_analytics.py [lines]
+"""
+import sys
+import os
+import time
+from collections import defaultdict
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+import numpy as np
+from Helpers.sales_analytics import SalesCube
+
+LINES = 1_000_000  # About a year of a busy restaurant
+ITEMS = 150
+EMPLOYEES = 12
+TAGS = ["Rice", "Noodles", "Chicken", "Beef", "Pork", "Duck", "Prawns", "Curry", "Side", "Starters"]
+
+def synthetic_lines(count: int, seed: int = 1) -> tuple:
+    """Order lines spread over a year, the same every run."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2024-01-01T11:00:00")
+    times = start + rng.integers(0, 365, count).astype("timedelta64[D]") + rng.integers(0, 12 * 3600, count).astype("timedelta64[s]")
+    employees = np.array([f"employee{i}" for i in range(EMPLOYEES)])[rng.integers(0, EMPLOYEES, count)]
+    menu_numbers = np.array([str(i) for i in range(1, ITEMS + 1)])[rng.integers(0, ITEMS, count)]
+    quantities = rng.integers(1, 4, count)
+    revenues = quantities * rng.choice([3.5, 4.8, 6.2, 7.9, 9.5], count)
+    item_tags = {str(i): [TAGS[i % len(TAGS)], TAGS[(i * 7) % len(TAGS)]] for i in range(1, ITEMS + 1)}
+    return times, employees, menu_numbers, quantities, revenues, item_tags
+
+def python_group_by(times, employees, menu_numbers, revenues) -> dict:
+    """Revenue per (hour, weekday, item, employee) summed one line at a time."""
+    totals = defaultdict(float)
+    for when, employee, item, revenue in zip(times.tolist(), employees.tolist(), menu_numbers.tolist(), revenues.tolist()):
+        totals[(when.hour, when.weekday(), item, employee)] += revenue
+    return totals
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LINES
+    times, employees, menu_numbers, quantities, revenues, item_tags = synthetic_lines(count)
+
+    loop_totals, loop_time = timed(python_group_by, times, employees, menu_numbers, revenues)
+    cube, cube_time = timed(SalesCube, times, employees, menu_numbers, quantities, revenues, item_tags)
+    assert np.isclose(sum(loop_totals.values()), cube.revenue.sum())
+
+    print(f"{count} order lines")
+    print(f"Python loop group by:  {loop_time:8.3f}s")
+    print(f"SalesCube group by:    {cube_time:8.3f}s ({loop_time / cube_time:.1f}x faster)")
+
+    reports = [
+        ("revenue by hour x weekday", lambda: cube.by("hour", "weekday")),
+        ("revenue by tag x employee", lambda: cube.by("tag", "employee")),
+        ("top 10 items", lambda: cube.top("item", 10)),
+        ("top 5 tags by quantity", lambda: cube.top("tag", 5, measure="quantity")),
+        ("percent of total by employee", lambda: cube.percent_of_total("employee")),
+    ]
+    for name, report in reports:
+        _, seconds = timed(report)
+        print(f"{name:<30} {seconds * 1000:8.2f}ms")
+
+if __name__ == "__main__":
+    main()
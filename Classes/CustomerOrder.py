@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 from Classes.MenuItemOrder import MenuItemOrder
+from Classes.Money import Money
 
 class CustomerOrder:
     """
@@ -11,9 +12,23 @@ class CustomerOrder:
         order_id (str): Unique order identifier
         menu_items (List[MenuItemOrder]): List of ordered items
         datetime (datetime): Order timestamp
-        totalprice (float): Total price of the order
+        totalprice (Money): Total price of the order
         total_items (int): Total quantity of items in order
+
+    Both totals are running values. Adding and removing lines changes them by
+    the line's totals, and every line tells the order holding it how its totals
+    changed when its quantity or modifications change, so reading them never
+    goes through the items. With debug set every change checks them against a
+    full recount.
+
+    The lines are kept in an insertion ordered dict used as a set, and indexed by
+    line_key(), so finding, adding and removing a line never goes through the
+    other lines however long the order gets.
     """
+    __slots__ = ("__employeeID", "__order_id", "__datetime", "_menu_items", "_line_index",
+                 "_shared_keys", "_totalprice", "_total_items")
+    debug = False
+
     
     def __init__(self, 
                  employeeID: str, 
@@ -29,7 +44,8 @@ class CustomerOrder:
             order_id (int, optional): The unique identifier for the order.
             menu_items (list[MenuItemOrder], optional): List of MenuItemOrder objects.
             date_time (datetime, optional): Order datetime, defaults to current time.
-            totalprice (float, optional): Initial total price, recalculated if items exist.
+            total_items (int, optional): Total quantity of an order loaded without its items,
+                                         counted from the items if there are any.
 
         Raises:
             TypeError: If employeeID is not an str or menu_items is not a list.
@@ -44,15 +60,18 @@ class CustomerOrder:
             
         self.__employeeID = employeeID
         self.__order_id = order_id
-        self._menu_items = menu_items or []
+        self._menu_items = dict.fromkeys(menu_items or ())
+        self._build_line_index()
         self.__datetime = date_time or datetime.now() #Ensure datetime is set to current time if not provided
         self._totalprice = self.calculate_total()  # Always calculate from items
-        self._total_items = total_items
+        self._total_items = sum(item.quantity for item in self._menu_items) if self._menu_items else total_items
+        for item in self._menu_items:
+            item._order = self
 
         # Additional validation
         if order_id is not None and not isinstance(order_id, int):
             raise TypeError("order_id must be a int or None")
-        if not isinstance(date_time, datetime):
+        if date_time is not None and not isinstance(date_time, datetime):
             raise TypeError("date_time must be a datetime object")
         if menu_items:
             if not all(isinstance(item, MenuItemOrder) for item in menu_items):
@@ -67,8 +86,9 @@ class CustomerOrder:
         return self.__order_id
 
     @property
-    def menu_items(self):
-        return self._menu_items
+    def menu_items(self) -> List[MenuItemOrder]:
+        """The lines of the order in the order they were added, as a new list."""
+        return list(self._menu_items)
 
     @menu_items.setter
     def menu_items(self, items):
@@ -77,8 +97,78 @@ class CustomerOrder:
 
         :param items: A list of MenuItemOrder objects.
         """
-        self._menu_items = items
+        for item in self._menu_items:
+            item._order = None
+        self._menu_items = dict.fromkeys(items)
+        self._build_line_index()
         self._totalprice = self.calculate_total()
+        self._total_items = sum(item.quantity for item in items)
+        for item in items:
+            item._order = self
+
+    @staticmethod
+    def line_key(menu_number: str, modifications: Optional[dict] = None) -> tuple:
+        """
+        Key identifying a line of the order, lines with the same key are merged.
+
+        Args:
+            menu_number (str): Menu number of the item
+            modifications (dict, optional): The item's modifications and their costs
+
+        Returns:
+            tuple: (menu number, MenuItemOrder.modification_key() of the modifications)
+        """
+        return (menu_number, MenuItemOrder.modification_key(modifications))
+
+    def _build_line_index(self) -> None:
+        """
+        Index every line by its key.
+
+        Lines normally have keys of their own, as adding merges lines with the same
+        key, but a line whose modifications are changed while it is in the order can
+        come to share the key of another one. Those lines are kept apart rather than
+        merged, so a line held by the caller stays in the order. The first line with
+        a key is in _line_index and the others in _shared_keys, which stays empty
+        in the usual case so an order only holds one index entry per line.
+        """
+        self._line_index = {}
+        self._shared_keys = {}
+        for item in self._menu_items:
+            self._index_line(self.line_key(item.menuNumber, item.modifications), item)
+
+    def _index_line(self, key: tuple, item: MenuItemOrder) -> None:
+        """Add a line to the index."""
+        if key in self._line_index:
+            self._shared_keys.setdefault(key, {})[item] = None
+        else:
+            self._line_index[key] = item
+
+    def _unindex_line(self, key: tuple, item: MenuItemOrder) -> None:
+        """Remove a line from the index, putting the next line with its key in its place."""
+        others = self._shared_keys.get(key)
+        if self._line_index.get(key) is item:
+            if others:
+                self._line_index[key] = next(iter(others))
+                del others[self._line_index[key]]
+            else:
+                del self._line_index[key]
+        elif others:
+            others.pop(item, None)
+        if not others and others is not None:
+            del self._shared_keys[key]
+
+    def find_item(self, menu_number: str, modifications: Optional[dict] = None) -> Optional[MenuItemOrder]:
+        """
+        Find the line of an item with exactly the given modifications.
+
+        Args:
+            menu_number (str): Menu number of the item
+            modifications (dict, optional): The modifications, none by default
+
+        Returns:
+            MenuItemOrder: The first such line, None if the order has no such line
+        """
+        return self._line_index.get(self.line_key(menu_number, modifications))
 
     @property
     def datetime(self):
@@ -97,13 +187,13 @@ class CustomerOrder:
         return self.__datetime.time()
 
     @property
-    def totalprice(self) -> str:
+    def totalprice(self) -> Money:
         """
-        Calculate the total price of the order.
+        Get the running total price of the order.
 
-        :return: The total price as a float.
+        :return: The total price as Money.
         """
-        return self.calculate_total()
+        return self._totalprice
 
     @totalprice.setter
     def totalprice(self, value):
@@ -116,12 +206,9 @@ class CustomerOrder:
         """
         Calculate the total price of the order. Sums all the prices of all the items in the order
 
-        :return: The total price as a float.
+        :return: The total price as Money.
         """
-        total = 0.00
-        for item in self._menu_items:
-            total += item.total_price
-        return round(total,2)
+        return Money(sum(item.total_price.pence for item in self._menu_items))
     
     @property
     def total_items(self):
@@ -136,9 +223,44 @@ class CustomerOrder:
     
     def update_total_items(self) -> None:
         """
-        Updates the number of total items that are in the order
+        Recounts the number of total items that are in the order. The count is kept
+        up to date as the order changes, so this is only needed to resynchronise it.
         """
-        self._total_items = sum(item.quantity for item in self.menu_items)
+        self._total_items = sum(item.quantity for item in self._menu_items)
+
+    def verify_totals(self) -> None:
+        """
+        Check the running totals against a full recount of the items.
+
+        Raises:
+            AssertionError: If either total has drifted from the items
+        """
+        total_price = self.calculate_total()
+        total_items = sum(item.quantity for item in self._menu_items)
+        if self._totalprice != total_price or self._total_items != total_items:
+            raise AssertionError(f"Order totals out of step: £{self._totalprice:.2f} and {self._total_items} items "
+                                 f"kept, £{total_price:.2f} and {total_items} items counted")
+
+    def _line_changed(self, item: MenuItemOrder, price_delta: Money, quantity_delta: int,
+                      modifications: Optional[tuple] = None) -> None:
+        """
+        Apply the change of one of the order's lines to the running totals.
+
+        Args:
+            item (MenuItemOrder): The line that changed
+            price_delta (Money): Change of the line's total price
+            quantity_delta (int): Change of the line's quantity
+            modifications (tuple, optional): The modification_key() of the line before the change,
+                                             given when its modifications changed so the line is re-indexed
+        """
+        self._totalprice += price_delta
+        self._total_items += quantity_delta
+        if modifications is not None:
+            old_key = (item.menuNumber, modifications)
+            self._unindex_line(old_key, item)
+            self._index_line(self.line_key(item.menuNumber, item.modifications), item)
+        if self.debug:
+            self.verify_totals()
 
     def add_item(self, menu_item_order: MenuItemOrder) -> None:
         """
@@ -153,25 +275,22 @@ class CustomerOrder:
         Note:
             If an item with the same menu number and modifications exists,
             its quantity will be incremented instead of adding a new item.
+            The line is found through the line index, so this doesn't depend on
+            the size of the order.
         """
         if not isinstance(menu_item_order, MenuItemOrder):
             raise TypeError("menu_item_order must be an instance of MenuItemOrder")
 
-        # Look for matching item by menu number and modifications
-        for existing_item in self._menu_items:
-            if (existing_item.menuNumber == menu_item_order.menuNumber and
-                    existing_item.modifications == menu_item_order.modifications):
-                existing_item.increment_quantity()
-                self._update_order_totals()
-                return
-
-        self._menu_items.append(menu_item_order)
-        self._update_order_totals()
+        key = self.line_key(menu_item_order.menuNumber, menu_item_order.modifications)
+        existing_item = self._line_index.get(key)
+        if existing_item is not None:
+            existing_item.increment_quantity()  # Updates the totals through _line_changed
+            return
 
-    def _update_order_totals(self) -> None:
-        """Update both total price and total items count."""
-        self._totalprice = self.calculate_total()
-        self._total_items = self.update_total_items()
+        self._menu_items[menu_item_order] = None
+        self._line_index[key] = menu_item_order
+        menu_item_order._order = self
+        self._line_changed(menu_item_order, menu_item_order.total_price, menu_item_order.quantity)
 
     def delete_item(self, item):
         """
@@ -183,7 +302,9 @@ class CustomerOrder:
         3. Remove the item if decrementing would result in 0 quantity
         
         Args:
-            item: MenuItems object representing the item to remove/decrement
+            item: MenuItems object representing the item to remove/decrement. If it is
+                  one of the order's lines that line is changed, otherwise the first line
+                  with the same menu number and modifications is
             
         Raises:
             ValueError: If the item is not found in the order
@@ -191,16 +312,18 @@ class CustomerOrder:
         """
         if not hasattr(item, 'menuNumber'):
             raise TypeError("Invalid menu item object")
-            
-        for menu_item_order in self._menu_items:
-            if menu_item_order.menuNumber == item.menuNumber and menu_item_order.modifications == item.modifications:
-                # If quantity is 1 or decrementing fails, remove the item
-                if menu_item_order.quantity == 1 or not menu_item_order.decrement_quantity():
-                    self._menu_items.remove(menu_item_order)
-                self._update_order_totals()
-                return
-                
-        raise ValueError(f"Item '{item.menuName}' not found in the order.")
+
+        key = self.line_key(item.menuNumber, item.modifications)
+        menu_item_order = item if item in self._menu_items else self._line_index.get(key)
+        if menu_item_order is None:
+            raise ValueError(f"Item '{item.menuName}' not found in the order.")
+
+        # If quantity is 1 or decrementing fails, remove the item
+        if menu_item_order.quantity == 1 or not menu_item_order.decrement_quantity():
+            del self._menu_items[menu_item_order]
+            self._unindex_line(key, menu_item_order)
+            menu_item_order._order = None
+            self._line_changed(menu_item_order, -menu_item_order.total_price, -menu_item_order.quantity)
 
     def get_items_by_tag(self, tag: str) -> List[MenuItemOrder]:
         """
@@ -216,9 +339,13 @@ class CustomerOrder:
 
     def clear_order(self) -> None:
         """Clear all items from the order."""
+        for item in self._menu_items:
+            item._order = None
         self._menu_items.clear()
-        self._totalprice = 0.0
-        self.update_total_items()
+        self._line_index.clear()
+        self._shared_keys.clear()
+        self._totalprice = Money()
+        self._total_items = 0
 
     def get_order_summary(self) -> dict:
         """
@@ -231,7 +358,7 @@ class CustomerOrder:
             'order_id': self.__order_id,
             'datetime': self.__datetime,
             'employee_id': self.__employeeID,
-            'total_items': sum(item.quantity for item in self._menu_items),
+            'total_items': self._total_items,
             'total_price': self.totalprice,
             'items': [{'name': item.menuName, 
                       'quantity': item.quantity, 
@@ -1,6 +1,10 @@
-from Classes.MenuItems import MenuItems
+import copy
+from Classes.MenuItems import MenuItems, _cached_money
+from Classes.Money import Money
 
 class MenuItemOrder(MenuItems):
+    __slots__ = ("_quantity", "_modifications", "_modification_cost", "_total_price", "_order")
+
     def __init__(self, menu_item, quantity=1, modifications=None):
         """
         Initialize a MenuItemOrder instance.
@@ -8,14 +12,113 @@ class MenuItemOrder(MenuItems):
         Args:
         menu_item(MenuItem): The base MenuItems object.
         quantity(int): The quantity of the menu item ordered.
-        modifications(dictionary): A dictionary of modifications (e.g., {"extra onions": 0.50, "no prawns": 0.00}).
+        modifications(dictionary): A dictionary of modifications and their costs in pounds (e.g., {"extra onions": 0.50, "no prawns": 0.00}).
         """
         if not isinstance(menu_item, MenuItems):
             raise TypeError("menu_item must be an instance of MenuItems")
         super().__init__(menu_item.menuNumber, menu_item.menuName, menu_item.menuPrice, menu_item.menuTags)
         self._quantity = quantity
         self._modifications = modifications or {}  # Default to no modifications
+        self._modification_cost = self._sum_modifications()
         self._total_price = self.calculate_total()
+        self._order = None  # The CustomerOrder holding this line, told of every change to it
+
+    def __deepcopy__(self, memo):
+        """
+        Copy the line without the order holding it, the copy belongs to no order.
+        """
+        line = self.clone()
+        line._modifications = copy.deepcopy(self._modifications, memo)
+        line._menuTags = copy.deepcopy(self._menuTags, memo)
+        return line
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a line from a row of our own order tables without validating it again.
+
+        :param row: (menuNo, name, quantity, unit price, modifications) as stored, with the modifications as a dictionary.
+        :return: The line as a MenuItemOrder, belonging to no order.
+        """
+        return cls.from_rows([row])[0]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build lines from rows of our own order tables in bulk, see from_row().
+
+        Rows come from our own schema, so nothing is checked again. Unit prices and
+        modification costs are converted to Money once for each distinct amount,
+        and the lines share one ["None"] list of tags, as history has no tags.
+
+        :param rows: Iterable of (menuNo, name, quantity, unit price, modifications) tuples.
+        :return: A list of MenuItemOrder objects in the order of the rows.
+        """
+        amounts = {}
+        tags = ["None"]
+        lines = []
+        for menu_number, name, quantity, unit_price, modifications in rows:
+            price = _cached_money(amounts, unit_price)
+            line = cls._from_fields(menu_number, name, price, tags)
+            line._quantity = quantity
+            line._modifications = modifications
+            line._modification_cost = (sum(_cached_money(amounts, cost).pence for cost in modifications.values())
+                                       if modifications else 0)
+            line._total_price = Money((price.pence + line._modification_cost) * quantity)
+            line._order = None
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def modification_key(modifications):
+        """
+        Identify a set of modifications independently of the order they were added in.
+
+        :param modifications: A dictionary of modifications and their costs, or None.
+        :return: The sorted (modification, cost) pairs as a tuple, the shared empty tuple for none.
+        """
+        # Smaller than a frozenset, and every line without modifications shares the empty tuple
+        return tuple(sorted(modifications.items())) if modifications else ()
+
+    def clone(self):
+        """
+        Copy the line, see with_quantity().
+
+        :return: The copy as a MenuItemOrder.
+        """
+        return self.with_quantity(self._quantity)
+
+    def with_quantity(self, quantity):
+        """
+        Copy the line with another quantity without validating it again.
+
+        The copy belongs to no order and has its own modifications, so they can be
+        changed without touching this line. The list of tags is shared, lines never change it.
+
+        :param quantity: The quantity of the copy.
+        :return: The copy as a MenuItemOrder.
+        :raises ValueError: If quantity is not a positive int.
+        """
+        if not isinstance(quantity, int) or quantity < 1:
+            raise ValueError("quantity must be a positive whole number")
+        line = self._copy_fields()
+        line._quantity = quantity
+        line._modifications = dict(self._modifications)
+        line._modification_cost = self._modification_cost
+        line._total_price = line.calculate_total()
+        line._order = None
+        return line
+
+    def _changed(self, price, quantity, modifications=None):
+        """
+        Tell the order holding this line how its totals changed.
+
+        :param price: The total price before the change.
+        :param quantity: The quantity before the change.
+        :param modifications: The modification_key() before the change, if the modifications changed.
+        """
+        if self._order is not None:
+            self._order._line_changed(self, self._total_price - price, self._quantity - quantity, modifications)
 
     @property
     def modifications(self):
@@ -36,15 +139,19 @@ class MenuItemOrder(MenuItems):
         Sets the quantity to 1 in case of creating temp copies. 
         Consider refactoring so this isn't needed
         """
+        price, quantity = self._total_price, self._quantity
         self._quantity = 1
-        self.calculate_total()
+        self._total_price = self.calculate_total()
+        self._changed(price, quantity)
 
     def increment_quantity(self):
         """
         Increment the quantity of the menu item ordered by 1.
         """
+        price, quantity = self._total_price, self._quantity
         self._quantity += 1
         self._total_price = self.calculate_total()
+        self._changed(price, quantity)
 
     def decrement_quantity(self) -> bool:
         """
@@ -53,8 +160,10 @@ class MenuItemOrder(MenuItems):
         :return: True if the quantity was decremented, False if it was already 1.
         """
         if self._quantity > 1:
+            price, quantity = self._total_price, self._quantity
             self._quantity -= 1
             self._total_price = self.calculate_total()
+            self._changed(price, quantity)
             return True
         else:
             self._total_price = self.calculate_total()
@@ -65,7 +174,7 @@ class MenuItemOrder(MenuItems):
         """
         Calculate the total price of this menu item order, including modifications.
 
-        :return: The total price as a float.
+        :return: The total price as Money.
         """
         return self._total_price
 
@@ -73,11 +182,18 @@ class MenuItemOrder(MenuItems):
         """
         Calculate the total price of the menu item order, including modifications.
 
-        :return: The total price as a float.
+        :return: The total price as Money.
+        """
+        # The cost of the modifications is only summed again when they change
+        return Money((self.menuPrice.pence + self._modification_cost) * self._quantity)
+
+    def _sum_modifications(self):
+        """
+        Sum the costs of the modifications, which are kept in pounds as they are stored.
+
+        :return: The cost in pence.
         """
-        base_price = self.menuPrice  # Base price of the menu item
-        mod_price = sum(self.modifications.values())  # Sum all price changes from modifications
-        return round((base_price + mod_price) * self.quantity, 2)
+        return sum(Money.of(cost).pence for cost in self._modifications.values())
 
     def add_modification(self, modification, cost, mod_type):
         """
@@ -88,6 +204,7 @@ class MenuItemOrder(MenuItems):
         :param mod_type: The type of modification (e.g., "No", "Extra", "Swap").
         """
         new_key = f"{mod_type} {modification}"
+        price, modifications = self._total_price, self.modification_key(self._modifications)
 
         # Search for existing keys that reference the same "modification" but different types
         existing_key = next((key for key in self._modifications if key.endswith(modification)), None)
@@ -98,7 +215,9 @@ class MenuItemOrder(MenuItems):
 
         # Add the new modification with the updated type and cost and updates total price
         self._modifications[new_key] = cost
+        self._modification_cost = self._sum_modifications()
         self._total_price = self.calculate_total()
+        self._changed(price, self._quantity, modifications)
 
 
     def remove_modification(self, modification):
@@ -108,11 +227,14 @@ class MenuItemOrder(MenuItems):
         :param modification: A string representing the modification to remove.
         :raises KeyError: If the modification is not found.
         """
+        price, modifications = self._total_price, self.modification_key(self._modifications)
         if modification in self._modifications:
             del self._modifications[modification]
         else:
             raise KeyError(f"Modification '{modification}' not found.")
+        self._modification_cost = self._sum_modifications()
         self._total_price = self.calculate_total()
+        self._changed(price, self._quantity, modifications)
 
     def __str__(self):
         """
@@ -1,4 +1,12 @@
 import re
+from Classes.Money import Money
+
+def _cached_money(cache: dict, amount) -> Money:
+    """Convert an amount in pounds to Money, once per distinct amount of a batch of rows."""
+    money = cache.get(amount)
+    if money is None:
+        money = cache[amount] = Money.of(amount)
+    return money
     
 class MenuItems():
     """
@@ -7,11 +15,14 @@ class MenuItems():
     Attributes:
         menuNumber (str): The menu item number (digits + optional single letter).
         menuName (str): The name of the menu item.
-        menuPrice (float): The price of the menu item.
+        menuPrice (Money): The price of the menu item.
         menuTags (list): Tags describing the menu item (e.g., "Chicken", "Beef").
     Raises:
         ValueError : If the given menuNumber is not in the correct format of any number of digits followed by 1 or 0 letters
     """
+    # No per-instance __dict__, menus and order history hold many of these
+    __slots__ = ("__menuNumber", "_menuName", "_menuPrice", "_menuTags")
+
     def __init__(self,menuNo,name,price,tags = None):
         newMenuNo = str(menuNo).strip().replace(" ", "")
         
@@ -55,28 +66,25 @@ class MenuItems():
     
     #TODO check if additional checks are required
     @menuPrice.setter
-    def menuPrice(self,newVal : float) -> None:
+    def menuPrice(self,newVal) -> None:
         """
         Sets the menu item price.
 
         Args:
-            newVal (float): The new price to set. Must be a non-negative number, formatted to 2 decimal places.
+            newVal (Money | float | Decimal | str): The new price to set, in pounds unless it is Money. Must be a non-negative number.
 
         Raises:
             ValueError: If newVal is None, negative, or not a valid numeric value.
 
-        The value is validated, rounded to two decimal places, and stored as a float.
+        The value is validated, rounded to the nearest penny, and stored as Money.
         """
         try:
-            if newVal is None:
-                raise ValueError("Error: Price cannot be None.")
-            price = round(float(newVal), 2) 
-            if price < 0:
-                raise ValueError("Please enter a valid price")
-            #Rounds the number to 2 decimal places and then ensures it's always in .xx format
-            self._menuPrice = float("{:.2f}".format(price))
+            price = Money.of(newVal)
         except (ValueError, TypeError):
             raise ValueError("Please enter a number")
+        if price.pence < 0:
+            raise ValueError("Please enter a valid price")
+        self._menuPrice = price
 
     @property
     def menuTags(self):
@@ -111,6 +119,68 @@ class MenuItems():
             else:
                 self._menuTags = tags[:]  # Use a copy of the list to avoid external modification
 
+    def clone(self):
+        """
+        Copy the menu item without validating its fields again.
+
+        Returns:
+            MenuItems: The copy, with its own list of tags
+        """
+        item = self._copy_fields()
+        item._menuTags = self._menuTags[:]
+        return item
+
+    def _copy_fields(self):
+        """
+        Make an instance of the same class holding the fields of this menu item, sharing its list of tags.
+        Subclasses fill in their own fields.
+        """
+        return type(self)._from_fields(self.__menuNumber, self._menuName, self._menuPrice, self._menuTags)
+
+    @classmethod
+    def _from_fields(cls, menu_number, name, price, tags):
+        """
+        Make an instance holding already valid fields, without running the setters.
+        Subclasses fill in their own fields.
+        """
+        item = object.__new__(cls)
+        item.__menuNumber = menu_number
+        item._menuName = name
+        item._menuPrice = price
+        item._menuTags = tags
+        return item
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a menu item from a row of our own menu tables without validating it again.
+
+        Args:
+            row (tuple): (menuNo, name, price, tags) as stored, tags being a list that is kept, not copied
+
+        Returns:
+            MenuItems: The menu item, tagged ["None"] if it has no tags
+        """
+        return cls.from_rows([row])[0]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build menu items from rows of our own menu tables in bulk, see from_row().
+
+        Rows come from our own schema, so the menu number, name and tags aren't
+        checked again. Prices are converted to Money once for each distinct price.
+
+        Args:
+            rows (iterable): (menuNo, name, price, tags) tuples
+
+        Returns:
+            list: The MenuItems objects in the order of the rows
+        """
+        prices = {}
+        return [cls._from_fields(menu_number, name, _cached_money(prices, price), tags or ["None"])
+                for menu_number, name, price, tags in rows]
+
     def __str__(self):
         tags = ", ".join(self.menuTags) if self.menuTags else "No Tags"
         return f"Menu item {self.menuNumber} : {self.menuName} - Price : £{self.menuPrice:.2f}  ({', '.join(self.menuTags)})"
\ No newline at end of file
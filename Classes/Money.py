@@ -0,0 +1,128 @@
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from functools import total_ordering
+
+PENNY = Decimal("0.01")
+
+@total_ordering
+class Money:
+    """
+    An amount of money held as a whole number of pence.
+
+    Adding amounts and multiplying them by quantities is exact integer arithmetic,
+    so totals never drift the way sums of floats do and nothing needs rounding.
+    Amounts in pounds are only converted at the edges: Money.of() when a price is
+    entered or read from the database, format() and float() for display, and
+    to_decimal() for the database's DECIMAL columns.
+
+    Attributes:
+        pence (int): The amount in pence
+    """
+    __slots__ = ("_pence",)
+
+    def __init__(self, pence: int = 0):
+        """
+        Initialize an amount.
+
+        Args:
+            pence (int): The amount in pence
+
+        Raises:
+            TypeError: If pence is not an int
+        """
+        if isinstance(pence, bool) or not isinstance(pence, int):
+            raise TypeError("pence must be an int, use Money.of() for amounts in pounds")
+        self._pence = pence
+
+    @classmethod
+    def of(cls, pounds) -> "Money":
+        """
+        Convert an amount in pounds, rounding half pennies up.
+
+        Args:
+            pounds (Money | Decimal | int | float | str): The amount in pounds
+
+        Returns:
+            Money: The amount
+
+        Raises:
+            ValueError: If pounds is None or not a number
+        """
+        if isinstance(pounds, Money):
+            return pounds
+        if pounds is None or isinstance(pounds, bool):
+            raise ValueError("Amount cannot be None")
+        try:
+            # Through str so a float like 2.675 is read as written
+            amount = pounds if isinstance(pounds, Decimal) else Decimal(str(pounds).strip())
+            if not amount.is_finite():
+                raise ValueError(f"Not an amount: {pounds!r}")
+            return _money(int((amount / PENNY).quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+        except InvalidOperation:
+            raise ValueError(f"Not an amount: {pounds!r}")
+
+    @property
+    def pence(self) -> int:
+        return self._pence
+
+    def to_decimal(self) -> Decimal:
+        """Get the amount in pounds as a Decimal with two places, as DECIMAL columns hold it."""
+        return Decimal(self._pence).scaleb(-2)
+
+    def __float__(self) -> float:
+        return self._pence / 100
+
+    def __format__(self, spec: str) -> str:
+        """Format the amount in pounds, so f"£{price:.2f}" works as it does for floats."""
+        return format(self.to_decimal(), spec)
+
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self) -> str:
+        return f"Money('{self.to_decimal()}')"
+
+    def __hash__(self) -> int:
+        return hash(self._pence)
+
+    def __bool__(self) -> bool:
+        return self._pence != 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self._pence == other._pence
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, Money):
+            return self._pence < other._pence
+        return NotImplemented
+
+    def __add__(self, other) -> "Money":
+        if isinstance(other, Money):
+            return _money(self._pence + other._pence)
+        if other == 0 and isinstance(other, int):
+            return self  # So sum() works without a start value
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Money":
+        if isinstance(other, Money):
+            return _money(self._pence - other._pence)
+        return NotImplemented
+
+    def __neg__(self) -> "Money":
+        return _money(-self._pence)
+
+    def __mul__(self, quantity) -> "Money":
+        if isinstance(quantity, int) and not isinstance(quantity, bool):
+            return _money(self._pence * quantity)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+def _money(pence: int) -> Money:
+    """Make an amount from a number of pence known to be an int, without the check of __init__."""
+    money = object.__new__(Money)
+    money._pence = pence
+    return money
@@ -59,12 +59,13 @@ class AddUserGUI:
         username = self.username_entry.get()
         password = self.password_entry.get()
         permission = self.selected_permission.get()
-        # Ensure all fields are filled and then calls the function to add user to database
-        try:
-            if not (name and username and password and permission):
-                raise Exception("All fields are required!")
-            else:
-                add_user(name, username, password, permission)
-                messagebox.showinfo("Success", "User added successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # Ensure all fields are filled and then adds the user to the database in the background
+        if not (name and username and password and permission):
+            messagebox.showerror("Error", "All fields are required!")
+            return
+        self.window_manager.db_executor.submit(
+            add_user, name, username, password, permission,
+            on_success=lambda _: messagebox.showinfo("Success", "User added successfully!"),
+            on_error=lambda e: messagebox.showerror("Error", str(e)),
+            owner=self.root
+        )
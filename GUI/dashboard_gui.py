@@ -0,0 +1,127 @@
+import sys
+import os
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from gui_functions import live_sales
+import tkinter as tk
+
+REFRESH_MS = 2000
+HOURS_SHOWN = 12
+BAR_WIDTH = 30
+
+class DashboardGUI:
+    """
+    A live view of the current service's sales.
+
+    Shows the takings, orders and items so far, the last hours of trading and
+    the best selling items. The figures come from the in-memory live sales
+    aggregates, which are updated as orders are accepted, and are redrawn every
+    REFRESH_MS milliseconds without querying the database.
+
+    Attributes:
+        root (tk.Tk): The window of the dashboard.
+        window_manager: The manager handling window transitions.
+    """
+
+    def __init__(self, root: tk.Tk, windows_manager=None) -> None:
+        """
+        Initialize the DashboardGUI.
+
+        Args:
+            root (tk.Tk): The window of the dashboard.
+            windows_manager: The manager handling window transitions.
+        """
+        self.root = root
+        self.window_manager = windows_manager
+        self.refresh_job = None
+
+        self._setup_main_window()
+        self._setup_totals_section()
+        self._setup_hours_section()
+        self._setup_top_items_section()
+        self._setup_navigation()
+        self.refresh()
+
+    def _setup_main_window(self) -> None:
+        """Configure the main window properties."""
+        self.root.title("Live Sales")
+        self.root.geometry("900x500")
+        self.root.protocol("WM_DELETE_WINDOW", self.go_back)
+
+        self.day_label = tk.Label(self.root, text="", font=("Arial", 14))
+        self.day_label.grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+
+    def _setup_totals_section(self) -> None:
+        """Set up the running totals."""
+        totals_frame = tk.Frame(self.root)
+        totals_frame.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w")
+
+        self.total_labels = {}
+        for column, (key, title) in enumerate([("revenue", "Takings"), ("orders", "Orders"),
+                                               ("items", "Items"), ("average_order", "Average order")]):
+            tk.Label(totals_frame, text=title, font=("Arial", 10)).grid(row=0, column=column, padx=20)
+            label = tk.Label(totals_frame, text="", font=("Arial", 18, "bold"))
+            label.grid(row=1, column=column, padx=20)
+            self.total_labels[key] = label
+
+    def _setup_hours_section(self) -> None:
+        """Set up the sales of the last hours."""
+        tk.Label(self.root, text="Takings by hour").grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.hours_listbox = tk.Listbox(self.root, width=55, height=HOURS_SHOWN, font=("Courier", 10))
+        self.hours_listbox.grid(row=3, column=0, padx=10, pady=5, sticky="nw")
+
+    def _setup_top_items_section(self) -> None:
+        """Set up the best selling items."""
+        tk.Label(self.root, text="Top sellers").grid(row=2, column=1, padx=10, pady=5, sticky="w")
+        self.top_listbox = tk.Listbox(self.root, width=45, height=HOURS_SHOWN, font=("Courier", 10))
+        self.top_listbox.grid(row=3, column=1, padx=10, pady=5, sticky="nw")
+
+    def _setup_navigation(self) -> None:
+        """Set up navigation buttons."""
+        self.back_button = tk.Button(
+            self.root,
+            text="Back",
+            command=self.go_back,
+            bg="gray",
+            fg="white"
+        )
+        self.back_button.grid(row=4, column=0, padx=10, pady=10, sticky="w")
+
+    def refresh(self) -> None:
+        """Redraw the figures and schedule the next refresh."""
+        self.show_snapshot(live_sales.snapshot(hours=HOURS_SHOWN))
+        self.refresh_job = self.root.after(REFRESH_MS, self.refresh)
+
+    def show_snapshot(self, snapshot: dict) -> None:
+        """
+        Display a snapshot of the live sales.
+
+        Args:
+            snapshot (dict): As returned by LiveSales.snapshot()
+        """
+        day = snapshot["day"]
+        self.day_label.config(text=f"Service of {day:%A %d %B %Y}" if day else "No orders taken yet")
+        self.total_labels["revenue"].config(text=f"£{snapshot['revenue']:.2f}")
+        self.total_labels["orders"].config(text=str(snapshot["orders"]))
+        self.total_labels["items"].config(text=str(snapshot["items"]))
+        self.total_labels["average_order"].config(text=f"£{snapshot['average_order']:.2f}")
+
+        busiest = max((revenue.pence for _, _, _, revenue in snapshot["hours"]), default=0) or 1
+        self.hours_listbox.delete(0, tk.END)
+        for hour, orders, _, revenue in snapshot["hours"]:
+            bar = "#" * round(BAR_WIDTH * revenue.pence / busiest)
+            self.hours_listbox.insert(tk.END, f"{hour:02d}:00 £{revenue:>8.2f} {orders:>3} {bar}")
+
+        self.top_listbox.delete(0, tk.END)
+        for menu_number, name, quantity, revenue in snapshot["top"]:
+            self.top_listbox.insert(tk.END, f"{quantity:>4} x {menu_number:<5} {name[:20]:<20} £{revenue:.2f}")
+
+    def go_back(self) -> None:
+        """Stop refreshing and return to the owner GUI screen."""
+        if self.refresh_job:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.root.destroy()
+        self.window_manager.show_owner_screen()
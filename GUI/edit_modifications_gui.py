@@ -1,8 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox, simpledialog
-import json
-from gui_functions import add_mod_to_database, get_mod_from_tag, remove_mod
+from gui_functions import add_mod_to_database, get_mod_from_tag, remove_mod, modification_catalog
 
 class EditModsGUI():
 
@@ -72,12 +71,7 @@ class EditModsGUI():
         # Dropdown for tags
         tk.Label(popup, text="Tag:").grid(row=2, column=0, padx=10, pady=10)
 
-        try:
-            with open('MISC/mod_tags.json', 'r') as file:
-                data = json.load(file)
-            tags = data.get("tags", [""])  # Fallback to an empty list if "tags" is missing
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading tags.json: {e}")
+        tags = modification_catalog.tags()
 
         # Handle default value for tags
         selected_tag_var = tk.StringVar(value=tags[0] if tags else "Select a Tag")
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import json
-from gui_functions import remove_menu_item_tags
+from gui_functions import load_tags, save_tag_changes
 
 class EditTagsGUI():
 
@@ -11,6 +10,7 @@ class EditTagsGUI():
         self.root.title("Tag Editor")
         self.tags = set(self.get_tags())  # Using a set to store tags
         self.tags_to_remove = set() # Holds a set of tags to be removed from the database
+        self.tags_to_rename = {} # Maps tags on the database to the tag they are renamed or merged into
 
         # Create GUI elements
         self.listbox = tk.Listbox(root, selectmode=tk.SINGLE, width=40, height=15)
@@ -26,48 +26,36 @@ class EditTagsGUI():
         self.remove_button = tk.Button(root, text="Remove Selected Tag", command=self.remove_tag)
         self.remove_button.pack(pady=5)
 
+        self.rename_button = tk.Button(root, text="Rename/Merge Selected Tag", command=self.rename_tag)
+        self.rename_button.pack(pady=5)
+
         self.save_button = tk.Button(root, text="Save Tags", command=self.save_tags)
         self.save_button.pack(pady=5)
 
         self.save_button = tk.Button(root, text="Go back", command=self.owner_gui_return)
         self.save_button.pack(pady=5)
 
-    def get_tags(self) -> set[str]:
+    def get_tags(self) -> list[str]:
         """
         Retrieves the currently saved tags.
         Returns:
-            tags(set[str]): A set of all tags currently on file.
+            tags(list[str]): A list of all tags currently on file.
         """
-        try:
-            with open('MISC/tags.json', 'r') as file:
-                data = json.load(file)
-            return data.get("tags", set())  # Fallback to an empty list if "tags" is missing
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading tags.json: {e}")
-            return set()
+        return load_tags()
 
     def save_tags(self) -> None:
         """
-        Updates the file containing the saved tags.
+        Saves the tags to file and applies the removed, renamed and merged tags to the
+        menu items on the database in one step.
         """
         try:
-            with open('MISC/tags.json', 'w') as file:
-                data = {"tags": list(self.tags)}  # Convert set to list for JSON serialization
-                json.dump(data, file)
-            self.update_tags_in_database(self.tags_to_remove)
-        except IOError as e:
+            changed = save_tag_changes(sorted(self.tags), self.tags_to_remove, self.tags_to_rename)
+        except Exception as e:
             messagebox.showerror("Error", f"An error occurred while saving: {e}")
-
-    def update_tags_in_database(self, tags: set[str]) -> None:
-        """
-        Updates all the tags of menu items currently on database by removing all the tags that no longer exist in file
-        Args:
-            tags (set[str]): A set of tags that are to be removed from the file
-        """
-        if remove_menu_item_tags(tags):
-            messagebox.showinfo("Success", "Tags successfully changed")
-        else:
-            messagebox.showerror("Error", "Tags could not be updated")
+            return
+        self.tags_to_remove = set()
+        self.tags_to_rename = {}
+        messagebox.showinfo("Success", f"Tags successfully changed, {changed} menu item(s) updated")
 
     def add_tag(self):
         """
@@ -92,6 +80,32 @@ class EditTagsGUI():
         else:
             messagebox.showwarning("Warning", "No tag selected!")
 
+    def rename_tag(self):
+        """
+        Rename the selected tag. Renaming it to an existing tag merges the two.
+        """
+        selected_index = self.listbox.curselection()
+        if not selected_index:
+            messagebox.showwarning("Warning", "No tag selected!")
+            return
+        old_tag = self.listbox.get(selected_index)
+        new_tag = simpledialog.askstring("Rename Tag", f"Rename '{old_tag}' to:")
+        if not new_tag or new_tag == old_tag:
+            return
+        if new_tag in self.tags and not messagebox.askyesno("Merge Tags", f"'{new_tag}' already exists. Merge '{old_tag}' into it?"):
+            return
+
+        # Earlier renames into the old tag now go to the new tag, keeping a single step per database tag
+        for source, target in self.tags_to_rename.items():
+            if target == old_tag:
+                self.tags_to_rename[source] = new_tag
+        self.tags_to_rename[old_tag] = new_tag
+        self.tags_to_rename.pop(new_tag, None)
+        self.tags_to_remove.discard(new_tag)
+        self.tags.discard(old_tag)
+        self.tags.add(new_tag)
+        self.update_listbox()
+
     def update_listbox(self):
         """
         Refresh the listbox to display the current tags.
@@ -1,11 +1,12 @@
 import tkinter as tk
-from gui_functions import fetch_menu_items, add_customer_order, get_mod_from_tag
+from gui_functions import menu_catalog, modification_catalog, add_customer_order
 from tkinter import messagebox
 import Classes.MenuItems
 import Classes.MenuItemOrder
 from Classes.CustomerOrder import CustomerOrder
 import json
-import copy
+
+SEARCH_DEBOUNCE_MS = 150  # Pause in typing before the menu is searched
 
 class EmployeeGui:
     """
@@ -122,8 +123,10 @@ class EmployeeGui:
         self.search_entry = tk.Entry(self.search_frame, font=("Arial", 10))
         self.search_entry.pack(side="left", fill="x", expand=True, padx=5)
 
-        # Bind the search entry to call the search function
-        self.search_entry.bind("<KeyRelease>", self.search_menu_items)
+        # Bind the search entry to call the search function once typing pauses
+        self.search_after_id = None
+        self.last_search = None
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
 
         self.root.minsize(1000, 700)  # Set minimum window size
 
@@ -165,7 +168,7 @@ class EmployeeGui:
         Args:
             tag: The category tag to filter menu items
         """
-        items = fetch_menu_items(tag,2)
+        items = menu_catalog.items_with_tag(tag)
         self.update_listbox(self.menu_items_listbox, items)
 
     def manage_order_item(self, item_action: str) -> None:
@@ -185,8 +188,7 @@ class EmployeeGui:
                     order_item.decrement_quantity()
                 else:
                     self.current_order.delete_item(order_item)
-                    
-            self.current_order.update_total_items()
+
             self.refresh_order_display()
 
             # Reselect the same item if it still exists
@@ -216,9 +218,8 @@ class EmployeeGui:
 
         # Store the selected item
         selected_index = selected_item[0]
-        # Create a deepcopy of the selected item and set its quantity to 1
-        self.selected_order_item = copy.deepcopy(self.current_order.menu_items[selected_index])
-        self.selected_order_item.set_quantity_to_one() # Update the quantity of the copied item
+        # Copy the selected item with a quantity of 1
+        self.selected_order_item = self.current_order.menu_items[selected_index].with_quantity(1)
         self.original_order_item = self.current_order.menu_items[selected_index]  # Hold current item in case it needs to be removed
         self.remove_mod_item_checker = True  # Allows the order item currently being modified to be removed only once
         return True
@@ -231,10 +232,10 @@ class EmployeeGui:
         - Prepares the selected item for modification, ensuring its quantity is set to 1.
         - Temporarily stores the original item for potential removal or update.
         - Hides the original menu items listbox and displays a new listbox with customization options.
-        - Reads modification tags from a JSON file and populates the modifications listbox.
+        - Populates the modifications listbox from the in-memory modification cache.
         - Updates the label and buttons on the interface to reflect the modification mode.
         
-        If no item is selected or if there is an issue reading the JSON file, appropriate error handling is performed.
+        If no item is selected, nothing happens.
         """
         if not self.select_and_prepare_item_for_modification():
             return
@@ -247,13 +248,7 @@ class EmployeeGui:
         self.modifications_listbox.pack(expand=True, fill="both")  
         self.menu_items_label.config(text="Custom item")
 
-        try:
-            with open('MISC/mod_tags.json', 'r') as file:
-                data = json.load(file)
-            self.mod_tags = data.get("tags", [])  # Fallback to an empty list if "tags" is missing
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading tags.json: {e}")
-            self.mod_tags = []
+        self.mod_tags = modification_catalog.tags()
         # Populate the modifications listbox with modification options for the selected tag
         if self.mod_tags and len(self.mod_tags) > 0:    
             self.handle_column_button(self.mod_tags[0])
@@ -277,20 +272,13 @@ class EmployeeGui:
             # Get the selected item's details
             item_text = self.menu_items_listbox.get(selected_item)
             item_no = item_text.split(":")[0].strip()
-            item = fetch_menu_items(item_no, 1)[0]  # Fetch item details
+            item = menu_catalog.get(item_no)  # Fetch item details from the menu cache
+            if item is None:
+                messagebox.showerror("Error", f"Menu item {item_no} is no longer on the menu.")
+                return
             order_item = Classes.MenuItemOrder.MenuItemOrder(item)  # Create MenuItemOrder object
 
-            # Check if the item already exists in the current order
-            for existing_item in self.current_order.menu_items:
-                if existing_item.menuName == order_item.menuName and existing_item.modifications == order_item.modifications:
-                    # Item already exists, increment the quantity
-                    existing_item.increment_quantity()
-                    self.current_order.update_total_items()
-                    self.refresh_order_display()
-                    self.menu_items_listbox.selection_clear(0, tk.END)
-                    return
-
-            # If item does not exist, add it to the current order and clears listbox
+            # Adds it to the current order, or increments the quantity if it is already there, and clears listbox
             self.current_order.add_item(order_item)
             self.refresh_order_display()
             self.menu_items_listbox.selection_clear(0, tk.END)
@@ -338,31 +326,76 @@ class EmployeeGui:
 
     def accept_order(self, employee: str) -> None:
         """
-        Adds the order to the database
+        Adds the order to the database in the background and starts a new order straight away
 
         Args:
             employee: The employee who accepted the order
         """
-        messagebox.showinfo("Order Accepted", self.current_order.display_order_as_string())
-        if add_customer_order(self.current_order):
-            self.current_order = CustomerOrder(employee)
+        order = self.current_order
+        messagebox.showinfo("Order Accepted", order.display_order_as_string())
+        self.current_order = CustomerOrder(employee)
+        self.refresh_order_display()
+        self.window_manager.db_executor.submit(
+            add_customer_order, order,
+            on_success=self.order_saved,
+            on_error=lambda error: self.order_failed(order, error),
+            owner=self.root
+        )
+
+    def order_saved(self, order_id: int) -> None:
+        """
+        Lets the employee know when an order was queued because the database is unreachable
+
+        Args:
+            order_id: The id of the saved order, None if it was queued
+        """
+        if order_id is None:
+            messagebox.showwarning("Order Queued", "The database is unreachable. The order was saved on this "
+                                                   "till and will be sent automatically once it is back.")
+
+    def order_failed(self, order: CustomerOrder, error: Exception) -> None:
+        """
+        Reports an order that could not be saved and puts it back on screen if nothing new was started
+
+        Args:
+            order: The order that failed to save
+            error: The error raised while saving it
+        """
+        print(f"Error saving order: {error}")
+        if self.current_order is not None and not self.current_order.menu_items:
+            self.current_order = order
             self.refresh_order_display()
+            messagebox.showerror("Error", "The order could not be saved. It has been restored so it can be accepted again.")
+        else:
+            messagebox.showerror("Error", f"The order could not be saved:\n{order.display_order_as_string()}")
 
-    def search_menu_items(self, event: tk.Event) -> None:
+    def schedule_search(self, event: tk.Event) -> None:
         """
-        Handles the search functionality.
-        This function will filter menu items based on the input in the search box.
+        Restarts the search timer on every key so typing at full speed only searches once it pauses.
 
         Args:
             event: The event that triggered the search
         """
-        search_text = self.search_entry.get().lower()  # Get the current text in the search box
-        items = fetch_menu_items('*', 1)  # Fetch all items 
-        #Creates a list of all items where their name or menuid is similar or matches the input text
-        filtered_items = [
-            item for item in items if search_text in item.menuName.lower() or search_text in item.menuNumber.lower()
-        ]
-        self.update_listbox(self.menu_items_listbox, filtered_items)
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.search_menu_items)
+
+    def search_menu_items(self) -> None:
+        """
+        Handles the search functionality.
+        This function will filter menu items based on the input in the search box.
+        """
+        self.search_after_id = None
+        search_text = self.search_entry.get().strip()  # Get the current text in the search box
+        if search_text == self.last_search:
+            return  # e.g. only arrow or shift keys were pressed
+        self.last_search = search_text
+        if search_text:
+            # Ranked matches on menu number and name from the menu cache's search index
+            items = menu_catalog.search(search_text)
+        else:
+            items = menu_catalog.all_items()
+        self.update_listbox(self.menu_items_listbox, items)
 
     def update_listbox(self, listbox: tk.Listbox, items: list) -> None:
         """
@@ -423,7 +456,7 @@ class EmployeeGui:
         Args:
             tag: The tag for the button clicked.
         """
-        self.tag_info = get_mod_from_tag(tag)
+        self.tag_info = modification_catalog.modifications_for_tag(tag)
         self.modifications_listbox.delete(0, tk.END)
         for tag in self.tag_info:
             self.modifications_listbox.insert(tk.END, f"{tag[0]}: {tag[1]}")
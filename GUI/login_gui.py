@@ -1,6 +1,6 @@
 from tkinter import *
 from tkinter import messagebox
-from gui_functions import Validate_login
+from gui_functions import authenticate
 
 class Login_Screen:
     def __init__(self, root, window_manager):
@@ -24,8 +24,8 @@ class Login_Screen:
         self.login_status = Label(self.root, text="")
         self.login_status.grid(sticky="ew", padx=15, pady=15, row=3, column=0, columnspan=2)
 
-        login_btn = Button(self.root, text="Login", command=self.login)
-        login_btn.grid(row=2, column=1, sticky="ew")
+        self.login_btn = Button(self.root, text="Login", command=self.login)
+        self.login_btn.grid(row=2, column=1, sticky="ew")
 
     def login(self):
         username = self.username_ent.get()
@@ -33,8 +33,31 @@ class Login_Screen:
         self.username_ent.delete(0, END)
         self.password_ent.delete(0, END)
 
-        # Example validation logic
-        access_level = Validate_login(username, password)
+        if not username or not password:
+            messagebox.showerror("Error", "Username or password cannot be empty.")
+            return
+
+        # Password hashing and the database lookup run in the background
+        self.login_btn.config(state=DISABLED)
+        self.login_status.config(text="Logging in...")
+        self.window_manager.db_executor.submit(
+            authenticate, username, password,
+            on_success=lambda access_level: self.finish_login(username, access_level),
+            on_error=self.login_failed,
+            owner=self.root
+        )
+
+    def login_failed(self, error: Exception) -> None:
+        """Report an error that happened while checking the credentials."""
+        self.login_btn.config(state=NORMAL)
+        self.login_status.config(text="")
+        messagebox.showerror("Error", "An unexpected error occurred during login. Please try again.")
+        print(f"Error details: {error}")
+
+    def finish_login(self, username: str, access_level: int) -> None:
+        """Open the screen matching the user's permission level."""
+        self.login_btn.config(state=NORMAL)
+        self.login_status.config(text="")
         if access_level == 1:
             self.login_status.config(text=f"Welcome, {username}!")
             messagebox.showinfo("Login Successful", f"Welcome, {username}!")
@@ -46,4 +69,4 @@ class Login_Screen:
             messagebox.showinfo("Login Successful", f"Welcome, {username}!") 
             self.window_manager.show_employee_screen(username) # TODO
         else:
-            messagebox.showinfo("Access Denied", "You do not have the required permissions.")
+            messagebox.showinfo("Access Denied", "You do not have the required permissions.")
\ No newline at end of file
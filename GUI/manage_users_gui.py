@@ -12,6 +12,7 @@ class ManageUsersGUI:
         # Variables
         self.username_var = tk.StringVar()  # Holds username dynamically
         self.permission_levels = [1, 2, 3]  #TODO Placeholder permission levels
+        self.select_task = None
 
         self._setup_gui()
         self.fetch_and_display_users()
@@ -71,26 +72,47 @@ class ManageUsersGUI:
         back_button.pack(side=tk.RIGHT, padx=10)
 
     def fetch_and_display_users(self) -> None:
-        """Fetch users from the database and display them in the listbox."""
-        users = get_all_user()
+        """Fetch users from the database in the background and display them in the listbox."""
+        self.window_manager.db_executor.submit(
+            get_all_user,
+            on_success=self.display_users,
+            on_error=lambda e: messagebox.showerror("Error", f"Could not load users: {e}"),
+            owner=self.root
+        )
+
+    def display_users(self, users: list) -> None:
+        """Display the usernames of the given users in the listbox."""
         self.user_listbox.delete(0, tk.END)
-        for user in users:
+        for user in users or []:
             self.user_listbox.insert(tk.END, user[1])
 
     def on_user_select(self, event):
         """
         Handle user selection from the listbox.
-        Populates the selected user details.
+        Populates the selected user details once they are loaded.
         """
         selected_index = self.user_listbox.curselection()
         if selected_index:
             selected_user = self.user_listbox.get(selected_index[0])
             self.username_var.set(selected_user)  # Dynamically update username
-            user_info = get_user(selected_user)
-            self.name_entry.delete(0, tk.END)
-            self.name_entry.insert(0, user_info[0]) 
-            self.password_entry.delete(0, tk.END)  
-            self.permission_level.set(user_info[3]) 
+            if self.select_task:
+                self.select_task.cancel()  # Only the last selected user is shown
+            self.select_task = self.window_manager.db_executor.submit(
+                get_user, selected_user,
+                on_success=self.display_user,
+                on_error=lambda e: messagebox.showerror("Error", f"Could not load user: {e}"),
+                owner=self.root
+            )
+
+    def display_user(self, user_info: tuple) -> None:
+        """Populate the details fields with the given user's information."""
+        self.select_task = None
+        if not user_info:
+            return
+        self.name_entry.delete(0, tk.END)
+        self.name_entry.insert(0, user_info[0]) 
+        self.password_entry.delete(0, tk.END)  
+        self.permission_level.set(user_info[3]) 
 
     def save_changes(self):
         """Save changes made to user details to the database"""
@@ -99,13 +121,15 @@ class ManageUsersGUI:
         password = self.password_entry.get()
         permission = self.permission_level.get()
 
-        try:
-            if not (name and username and permission):
-                raise Exception("All fields are required!")
-            update_User(name, username, password, permission)
-            messagebox.showinfo("Success", "User successfully updated!")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        if not (name and username and permission):
+            messagebox.showerror("Error", "All fields are required!")
+            return
+        self.window_manager.db_executor.submit(
+            update_User, name, username, password, permission,
+            on_success=lambda _: messagebox.showinfo("Success", "User successfully updated!"),
+            on_error=lambda e: messagebox.showerror("Error", str(e)),
+            owner=self.root
+        )
 
     def go_to_add_user(self):
         """Navigate to the Add User screen."""
@@ -73,6 +73,7 @@ class Owner_Gui:
         Button(buttons_frame, text="View Past Orders", command=self.view_past_orders).pack(side=LEFT, padx=5)
         Button(buttons_frame, text="Edit Tags", command=self.edit_tags).pack(side=LEFT, padx=5)
         Button(buttons_frame, text="Edit Mods", command=self.edit_mods).pack(side=LEFT, padx=5)
+        Button(buttons_frame, text="Live Sales", command=self.view_dashboard).pack(side=LEFT, padx=5)
 
     def _setup_tags_frame(self):
         """Create the tags listbox and its controls."""
@@ -156,7 +157,7 @@ class Owner_Gui:
 
         try:
             item.menuName = self.menu_name_entry.get().strip()
-            item.menuPrice = float(self.menu_price_entry.get().strip())
+            item.menuPrice = self.menu_price_entry.get().strip()
             update_item_in_database(item)
             self.populate_menu_listbox()
             messagebox.showinfo("Success", "Changes successfully saved!")
@@ -225,4 +226,9 @@ class Owner_Gui:
     def edit_mods(self):
         """Navigate to the Tag editing screen."""
         self.root.withdraw()
-        self.window_manager.show_mod_screen()
\ No newline at end of file
+        self.window_manager.show_mod_screen()
+
+    def view_dashboard(self):
+        """Navigate to the live sales dashboard."""
+        self.root.withdraw()
+        self.window_manager.show_dashboard_screen()
@@ -1,17 +1,17 @@
 import sys
 import os
 from datetime import date
-import json
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional
 
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(parent_dir)
 
-from gui_functions import get_past_order, get_past_order_items
+from gui_functions import get_past_order_page, get_past_order_with_items, get_sales_totals, date_range_bounds, ORDER_PAGE_SIZE
+from Helpers.db_executor import DBExecutor
 from Classes.CustomerOrder import CustomerOrder
-import Classes.MenuItems
-import Classes.MenuItemOrder
+from Classes.Money import Money
 import tkinter as tk
+from tkinter import messagebox
 
 #TODO Clean up UI, consider adding more ways of viewing different stats 
 class PastOrdersGUI:
@@ -19,12 +19,14 @@ class PastOrdersGUI:
     A GUI application for viewing and managing past orders.
 
     This class provides a graphical interface for viewing historical order data,
-    including order details, items, and daily earnings.
+    including order details, items, and daily earnings. Orders are listed a page
+    at a time and the items of an order are only loaded once it is selected.
 
     Attributes:
         root (tk.Tk): The main window of the application.
         window_manager: The manager handling window transitions.
-        past_orders (List[CustomerOrder]): List of retrieved past orders.
+        order_headers (Dict[int, dict]): Headers of the listed orders by order ID.
+        loaded_orders (Dict[int, CustomerOrder]): Orders whose items have been loaded, by order ID.
         current_selected_order (Optional[CustomerOrder]): Currently selected order.
     """
 
@@ -38,7 +40,16 @@ class PastOrdersGUI:
         """
         self.root = root
         self.window_manager = windows_manager
-        self.past_orders: List[CustomerOrder] = []
+        self.order_headers: Dict[int, dict] = {}
+        self.listed_order_ids: List[int] = []  # Order ID of each row of the orders listbox
+        self.loaded_orders: Dict[int, CustomerOrder] = {}
+        self.current_date = date.today()
+        self.current_range = (self.current_date, self.current_date)
+        self.next_page_after: Optional[tuple] = None  # (time_of_order, order_id) the next page starts after
+        self.load_task = None
+        self.items_task = None
+        # Database calls run in the background so the window stays responsive while loading
+        self.db_executor = windows_manager.db_executor if windows_manager else DBExecutor(root)
         self.current_selected_order: Optional[CustomerOrder] = None
         
         self._setup_main_window()
@@ -72,20 +83,34 @@ class PastOrdersGUI:
         )
         self.total_price_label.grid(row=4, column=0, padx=10, pady=10, sticky="w")
 
+        self.more_button = tk.Button(
+            self.root,
+            text="Load more orders",
+            command=self.load_next_page,
+            state="disabled"
+        )
+        self.more_button.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+
     def _setup_search_section(self) -> None:
         """Set up the date search section."""
-        self.search_label = tk.Label(self.root, text="Enter date (YYYY-MM-DD):")
+        self.search_label = tk.Label(self.root, text="Enter date or range (YYYY-MM-DD to YYYY-MM-DD):")
         self.search_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
-        
-        self.search_entry = tk.Entry(self.root, width=20)
-        self.search_entry.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+
+        search_frame = tk.Frame(self.root)
+        search_frame.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+
+        self.search_entry = tk.Entry(search_frame, width=12)
+        self.search_entry.pack(side="left")
+        tk.Label(search_frame, text="to").pack(side="left", padx=5)
+        self.search_end_entry = tk.Entry(search_frame, width=12)
+        self.search_end_entry.pack(side="left")
         
         self.search_button = tk.Button(
-            self.root, 
+            search_frame, 
             text="Search", 
             command=self.search_past_orders_box
         )
-        self.search_button.grid(row=3, column=0, sticky="e", padx=10, pady=5)
+        self.search_button.pack(side="left", padx=10)
 
     def _setup_items_section(self) -> None:
         """Set up the order items display section."""
@@ -125,94 +150,149 @@ class PastOrdersGUI:
         current_date = date.today()
         self.retrieve_past_orders(current_date)
 
-    def retrieve_past_orders(self, date_str: str) -> None:
+    def retrieve_past_orders(self, date_str: str, end_date_str: Optional[str] = None) -> None:
         """
-        Retrieve past orders from the database for a specific date.
+        Retrieve the first page of past orders of a date or date range in the background,
+        along with the total earnings of the range. A new search cancels one that is still loading.
 
         Args:
-            date_str: The date to retrieve past orders from (YYYY-MM-DD format).
+            date_str: The first date to retrieve past orders from (YYYY-MM-DD format).
+            end_date_str: The last date of the range (inclusive), defaults to date_str.
         """
-        order_list: List[Tuple] = get_past_order(date_str)
-        self.past_orders.clear()
-        
-        for order in order_list:
-            employee_id, order_id, time_of_order, item_count = order
-            menu_item_list = self._get_order_items(order_id)
-            self.past_orders.append(
-                CustomerOrder(
-                    employee_id, 
-                    order_id, 
-                    menu_items=menu_item_list,
-                    date_time=time_of_order, 
-                    total_items=item_count
-                )
-            )
-        
-        total = self.get_day_total()
-        self.total_price_label.config(text=f"Total Earnings: £{total:.2f}")
-        self.update_past_orders_listbox()
+        try:
+            date_range_bounds(date_str, end_date_str)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter the date in YYYY-MM-DD format.")
+            return
 
-    def _get_order_items(self, order_id: int) -> List[Classes.MenuItemOrder.MenuItemOrder]:
+        self._cancel_loading()
+        self.total_price_label.config(text="Loading...")
+        self.more_button.config(state="disabled")
+        date_range = (date_str, end_date_str or date_str)
+        self.load_task = self.db_executor.submit(
+            self._fetch_first_page, *date_range,
+            on_success=lambda result: self._show_first_page(date_range, *result),
+            on_error=self._load_failed,
+            owner=self.root
+        )
+
+    def load_next_page(self) -> None:
+        """Retrieve the next page of orders of the current range in the background."""
+        if self.load_task or self.next_page_after is None:
+            return
+        self.more_button.config(state="disabled")
+        self.load_task = self.db_executor.submit(
+            self._fetch_page, *self.current_range, self.next_page_after,
+            on_success=self._show_page,
+            on_error=self._load_failed,
+            owner=self.root
+        )
+
+    @staticmethod
+    def _fetch_page(start_date, end_date, after: Optional[tuple] = None) -> list:
         """
-        Retrieve and parse items for a specific order.
+        Fetch one page of order headers. Runs on a worker thread, must not touch widgets.
 
-        Args:
-            order_id: The ID of the order to retrieve items for.
+        One extra order is fetched to tell whether there is a page after this one.
+        """
+        return get_past_order_page(start_date, end_date, after, limit=ORDER_PAGE_SIZE + 1)
+
+    @staticmethod
+    def _fetch_first_page(start_date, end_date) -> tuple:
+        """
+        Fetch the first page of order headers and the total earnings of a range.
+        Runs on a worker thread, must not touch widgets.
 
         Returns:
-            List of MenuItemOrder objects.
+            Tuple of the list of order headers and the range's total earnings.
         """
-        items = get_past_order_items(order_id)
-        menu_item_list = []
-        
-        for item in items:
-            menu_no, product_name, quantity, price, modifications = item
-            modifications = json.loads(modifications) if isinstance(modifications, str) else {}
-            
-            menu_item = Classes.MenuItems.MenuItems(menu_no, product_name, price, [])
-            order_item = Classes.MenuItemOrder.MenuItemOrder(
-                menu_item, 
-                quantity, 
-                modifications
-            )
-            menu_item_list.append(order_item)
-            
-        return menu_item_list
+        return PastOrdersGUI._fetch_page(start_date, end_date), get_sales_totals(start_date, end_date)["revenue"]
+
+    def _show_first_page(self, date_range: tuple, headers: List[dict], total: Money) -> None:
+        """Replace the listed orders with the first page of a range once it is loaded."""
+        self.current_range = date_range
+        self.current_date = date_range[0]
+        self.order_headers = {}
+        self.listed_order_ids = []
+        self.loaded_orders = {}
+        self.current_selected_order = None
+        self.orders_listbox.delete(0, tk.END)
+        self.items_listbox.delete(0, tk.END)
+        self._show_order_details("")
+        self.total_price_label.config(text=f"Total Earnings: £{total:.2f}")
+        self._show_page(headers)
+
+    def _show_page(self, headers: List[dict]) -> None:
+        """Append a page of order headers to the list once it is loaded."""
+        self.load_task = None
+        has_more = len(headers) > ORDER_PAGE_SIZE
+        headers = headers[:ORDER_PAGE_SIZE]
+        for header in headers:
+            self.order_headers[header["order_id"]] = header
+            self.listed_order_ids.append(header["order_id"])
+        self.update_past_orders_listbox(headers)
+
+        if has_more:
+            last = headers[-1]
+            self.next_page_after = (last["time_of_order"], last["order_id"])
+        else:
+            self.next_page_after = None
+        self.more_button.config(state="normal" if has_more else "disabled")
+
+    def _load_failed(self, error: Exception) -> None:
+        """Report an error that happened while loading orders."""
+        self.load_task = None
+        self.total_price_label.config(text="Total Earnings: £0.00")
+        self.more_button.config(state="normal" if self.next_page_after else "disabled")
+        messagebox.showerror("Error", f"Could not load past orders: {error}")
+
+    def _cancel_loading(self) -> None:
+        """Cancel loading a page or the items of an order."""
+        for task in (self.load_task, self.items_task):
+            if task:
+                task.cancel()
+        self.load_task = None
+        self.items_task = None
 
     def search_past_orders_box(self) -> None:
         """
-        Retrieves date input from the search box and then retrieves past orders from that date.
+        Retrieves the date range from the search boxes and then retrieves past orders in that range.
         """
         date_str = self.search_entry.get().strip()
         if not date_str:
             return
-        self.retrieve_past_orders(date_str)
-
-    def update_past_orders_listbox(self) -> None:
-        """Update the orders listbox with past orders."""
-        self.orders_listbox.delete(0, tk.END)
-        self.order_data = {}  # Store order data for quick access
-        for order in self.past_orders:
-            display_text = f"ID: {order.order_id}, Time: {order.get_time()}, Total: £{order.totalprice:.2f}"
+        end_date_str = self.search_end_entry.get().strip() or None
+        self.retrieve_past_orders(date_str, end_date_str)
+
+    def update_past_orders_listbox(self, headers: List[dict]) -> None:
+        """Append order headers to the orders listbox."""
+        for header in headers:
+            time_of_order = header["time_of_order"]
+            when = time_of_order.time() if self.current_range[0] == self.current_range[1] else time_of_order
+            display_text = f"ID: {header['order_id']}, Time: {when}, Total: £{header['total_price']:.2f}"
             self.orders_listbox.insert(tk.END, display_text)
 
+    def _show_order_details(self, text: str) -> None:
+        """Replace the text of the order details box."""
+        self.order_details_text.config(state="normal")  # Enable editing temporarily
+        self.order_details_text.delete("1.0", tk.END)
+        self.order_details_text.insert(tk.END, text)
+        self.order_details_text.config(state="disabled")  # Disable editing again
+
     def update_order_details_listbox(self) -> None:
         """Display the details of the selected order."""
         order = self.current_selected_order
         if not order:
             return
 
-        self.order_details_text.config(state="normal")  # Enable editing temporarily
-        self.order_details_text.delete("1.0", tk.END)  
-
-        self.order_details_text.insert(tk.END, f"Order ID: {order.order_id}\n")
-        self.order_details_text.insert(tk.END, f"Date: {order.get_date()}\n")
-        self.order_details_text.insert(tk.END, f"Time: {order.get_time()}\n")
-        self.order_details_text.insert(tk.END, f"Employee ID: {order.employeeID}\n")
-        self.order_details_text.insert(tk.END, f"Total Items: {order.total_items}\n")
-        self.order_details_text.insert(tk.END, f"Total Price: £{order.totalprice:.2f}\n")
-
-        self.order_details_text.config(state="disabled")  # Disable editing again
+        self._show_order_details(
+            f"Order ID: {order.order_id}\n"
+            f"Date: {order.get_date()}\n"
+            f"Time: {order.get_time()}\n"
+            f"Employee ID: {order.employeeID}\n"
+            f"Total Items: {order.total_items}\n"
+            f"Total Price: £{order.totalprice:.2f}\n"
+        )
 
     def update_order_items_listbox(self) -> None:
         """Display the items of the selected order."""
@@ -230,26 +310,49 @@ class PastOrdersGUI:
                     self.items_listbox.insert(tk.END, f"    - {mod}")
 
     def on_order_select(self, event) -> None:
-        """Display the details and items of the selected order."""
+        """Display the selected order, loading its items in the background the first time."""
         selected_idx = self.orders_listbox.curselection()
         if not selected_idx:
             return
 
-        selected_order_text = self.orders_listbox.get(selected_idx[0])
-        order_id = int(selected_order_text.split("ID:")[1].split(",")[0].strip())
-        self.current_selected_order = next(
-            (order for order in self.past_orders if order.order_id == order_id), 
-            None
+        order_id = self.listed_order_ids[selected_idx[0]]
+        order = self.loaded_orders.get(order_id)
+        if order:
+            self._show_order(order)
+            return
+
+        if self.items_task:
+            self.items_task.cancel()
+        self.items_listbox.delete(0, tk.END)
+        self.items_listbox.insert(tk.END, "Loading...")
+        self.items_task = self.db_executor.submit(
+            get_past_order_with_items, self.order_headers[order_id],
+            on_success=self._order_loaded,
+            on_error=self._order_failed,
+            owner=self.root
         )
+
+    def _order_loaded(self, order: CustomerOrder) -> None:
+        """Keep and display an order once its items are loaded."""
+        self.items_task = None
+        self.loaded_orders[order.order_id] = order
+        self._show_order(order)
+
+    def _order_failed(self, error: Exception) -> None:
+        """Report an error that happened while loading the items of an order."""
+        self.items_task = None
+        self.items_listbox.delete(0, tk.END)
+        messagebox.showerror("Error", f"Could not load the order: {error}")
+
+    def _show_order(self, order: CustomerOrder) -> None:
+        """Display the details and items of an order."""
+        self.current_selected_order = order
         self.update_order_items_listbox()
         self.update_order_details_listbox()
 
-    def get_day_total(self) -> float:
-        """Calculate the total earnings for the day."""
-        total: float = 0.00
-        for order in self.past_orders:
-            total += order.totalprice   
-        return total
+    def get_day_total(self) -> Money:
+        """Get the total earnings for the day from the daily sales rollup."""
+        return get_sales_totals(self.current_date)["revenue"]
     
     def go_back(self) -> None:
         """Return to the owner GUI screen."""
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+def _encode(value):
+    """json.dump default for the values of database rows JSON can't hold."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    raise TypeError(f"Can't cache a {type(value).__name__}")
+
+def _decode(obj: dict):
+    """json.load object_hook turning the values written by _encode back into their types."""
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+        if "__decimal__" in obj:
+            return Decimal(obj["__decimal__"])
+    return obj
+
+# Key of a day's results holding the version they were fetched at
+VERSION_KEY = "__version__"
+
+
+class DayCache:
+    """
+    Cache of query results that belong to a single business day.
+
+    Once a day is over its orders no longer change, so results of closed days
+    are kept until they are evicted, without any expiry. Results of today, or of
+    a day in the future, are always fetched again. The most recently used days
+    are held in memory and the least recently used day is dropped once there
+    are more than capacity days. When a directory is given every closed day is
+    also written there as a JSON file, so results survive a restart and days
+    evicted from memory are read back from disk instead of the database.
+
+    Results must be made of what database rows hold: lists, dicts, strings,
+    numbers, None, dates, datetimes and Decimals. Tuples come back from disk as lists.
+
+    A closed day can still change when an order queued offline is replayed late,
+    the data layer calls invalidate() for the day of every order it saves. That
+    only covers orders saved by this process, so when a version function is given
+    the results of a day are also checked against a cheap summary of the day,
+    at most every check_interval seconds, and dropped if it has changed. Results
+    read back from disk are always checked before they are first used.
+    """
+
+    def __init__(self, capacity: int = 64, directory: str = None, today=date.today,
+                 version=None, check_interval: float = 30.0, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            capacity (int): Number of days held in memory
+            directory (str, optional): Folder of the on-disk tier, memory only if not given
+            today (callable): Returns the current business day
+            version (callable, optional): Takes a day and returns a JSON value that changes
+                                          whenever its results do, results are never checked if not given
+            check_interval (float): Seconds a day's results are used before being checked again
+            clock (callable): Returns the current time in seconds
+        """
+        self.capacity = capacity
+        self.directory = directory
+        self.check_interval = check_interval
+        self._today = today
+        self._version = version
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._days = OrderedDict()  # date -> {key: result}, least recently used first
+        self._checked = {}  # date -> time its results were last checked against the version
+        self._invalidations = 0  # Bumped by invalidate() so results fetched meanwhile aren't stored
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "uncached": 0, "evictions": 0, "stale": 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, day: date, key: str, fetch):
+        """
+        Get a result of a day, fetching it on a miss.
+
+        Args:
+            day (date): The day the result belongs to
+            key (str): Identifies the result among the day's results
+            fetch (callable): Called without arguments to get the result on a miss
+
+        Returns:
+            The cached or fetched result
+
+        Raises:
+            Exception: Whatever fetch raises, nothing is cached
+        """
+        if day >= self._today():
+            with self._lock:
+                self._stats["uncached"] += 1
+            return fetch()
+
+        with self._lock:
+            in_memory = day in self._days
+        if self._version is not None:
+            self._check(day)
+
+        with self._lock:
+            results = self._results(day)
+            if key in results:
+                self._stats["hits" if in_memory else "disk_hits"] += 1
+                return results[key]
+            self._stats["misses"] += 1
+            invalidations = self._invalidations
+
+        # Fetched without the lock so other days aren't held up by the database
+        result = fetch()
+        with self._lock:
+            if invalidations != self._invalidations:
+                return result  # May have been read before an order of the day was saved
+            results = self._results(day)
+            results[key] = result
+            self._write(day, results)
+        return result
+
+    def invalidate(self, day: date) -> None:
+        """Forget every result of a day, in memory and on disk."""
+        with self._lock:
+            self._forget(day)
+
+    def clear(self) -> None:
+        """Forget every result held in memory, the on-disk tier is kept."""
+        with self._lock:
+            self._days.clear()
+            self._checked.clear()
+
+    def _check(self, day: date) -> None:
+        """Drop the results of a day if its version changed since they were fetched."""
+        with self._lock:
+            checked = self._checked.get(day)
+            if checked is not None and self._clock() - checked < self.check_interval:
+                return
+
+        # Read without the lock so other days aren't held up by the database
+        try:
+            version = self._version(day)
+        except Exception as e:
+            print(f"Could not check the cached results of {day}, using them unchecked: {e}")
+            return
+        with self._lock:
+            results = self._results(day)
+            # Results without a version were written before versions were checked
+            if results and results.get(VERSION_KEY) != version:
+                self._forget(day)
+                self._stats["stale"] += 1
+                results = self._results(day)
+            if VERSION_KEY not in results:
+                # Results fetched from here on belong to this version
+                results[VERSION_KEY] = version
+            self._checked[day] = self._clock()
+
+    def stats(self) -> dict:
+        """
+        Get a snapshot of the cache counters.
+
+        Returns:
+            dict: hits from memory, disk_hits, misses fetched from the database, uncached
+                  results of open days, evictions from memory, stale days dropped when their
+                  version changed and the number of days in memory
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["days"] = len(self._days)
+        return snapshot
+
+    def _forget(self, day: date) -> None:
+        """Drop a day in memory and on disk. Caller holds the lock."""
+        self._invalidations += 1
+        self._days.pop(day, None)
+        self._checked.pop(day, None)
+        if self.directory:
+            try:
+                os.remove(self._path(day))
+            except FileNotFoundError:
+                pass
+
+    def _results(self, day: date) -> dict:
+        """Get the results of a day, reading them from disk if needed. Caller holds the lock."""
+        results = self._days.get(day)
+        if results is not None:
+            self._days.move_to_end(day)
+            return results
+
+        results = self._read(day)
+        self._days[day] = results
+        if len(self._days) > self.capacity:
+            evicted, _ = self._days.popitem(last=False)
+            self._checked.pop(evicted, None)  # Read back from disk unchecked otherwise
+            self._stats["evictions"] += 1
+        return results
+
+    def _path(self, day: date) -> str:
+        return os.path.join(self.directory, f"{day.isoformat()}.json")
+
+    def _read(self, day: date) -> dict:
+        """Read a day from the on-disk tier, an empty dict if it isn't there or is unreadable."""
+        if not self.directory:
+            return {}
+        try:
+            with open(self._path(day), "r", encoding="utf-8") as file:
+                return json.load(file, object_hook=_decode)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cache file for {day}: {e}")
+            return {}
+
+    def _write(self, day: date, results: dict) -> None:
+        """Replace the on-disk file of a day. A failed write only loses the disk copy."""
+        if not self.directory:
+            return
+        path = self._path(day)
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(results, file, default=_encode)
+            os.replace(temp_path, path)
+        except (OSError, TypeError) as e:
+            print(f"Could not write cache file for {day}: {e}")
@@ -1,20 +1,316 @@
 import pymysql
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+class PoolTimeoutError(pymysql.MySQLError):
+    """Raised when no pooled connection becomes free within the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Wrapper around a pymysql connection that has been checked out of a ConnectionPool.
+
+    Behaves like the underlying connection (cursor, commit, rollback, ...) except that
+    close() hands the connection back to the pool instead of closing the socket, so the
+    existing `db = create_connection() ... finally: db.close()` pattern keeps working.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise pymysql.err.InterfaceError("Connection has already been returned to the pool.")
+        return getattr(self._raw, name)
+
+    def close(self) -> None:
+        """Return the connection to the pool. Safe to call more than once."""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections.
+
+    Attributes:
+        min_size (int): Connections kept open even when idle
+        max_size (int): Upper bound on open connections, callers wait once it is reached
+        idle_timeout (float): Seconds an idle connection above min_size is kept before being closed
+        checkout_timeout (float): Seconds to wait for a free connection before raising PoolTimeoutError
+    """
+
+    def __init__(self, connect, min_size: int = 1, max_size: int = 10,
+                 idle_timeout: float = 300.0, checkout_timeout: float = 10.0):
+        """
+        Initialize the pool.
+
+        Args:
+            connect (callable): Function returning a new raw connection
+            min_size (int): Minimum number of connections to keep open
+            max_size (int): Maximum number of connections open at once
+            idle_timeout (float): Seconds before a surplus idle connection is closed
+            checkout_timeout (float): Seconds to wait for a connection to become free
+
+        Raises:
+            ValueError: If the sizes are not 0 <= min_size <= max_size with max_size >= 1
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, time it was returned)
+        self._size = 0  # Open connections, idle or checked out
+        self._closed = False
+        self._stats = {"checkouts": 0, "waits": 0, "wait_time": 0.0,
+                       "created": 0, "discarded": 0, "failed_health_checks": 0}
+
+        # Best effort pre-fill, the pool still works if the database is down at start up
+        for _ in range(min_size):
+            try:
+                raw = self._connect()
+            except pymysql.MySQLError:
+                break
+            with self._lock:
+                self._size += 1
+                self._stats["created"] += 1
+                self._idle.append((raw, time.monotonic()))
+
+    def acquire(self) -> PooledConnection:
+        """
+        Check a connection out of the pool, opening a new one if allowed.
+
+        Idle connections are pinged before being handed out and replaced if dead.
+
+        Returns:
+            PooledConnection: Connection to be returned with close()
+
+        Raises:
+            PoolTimeoutError: If no connection became free within checkout_timeout
+            pymysql.MySQLError: If a new connection could not be opened
+        """
+        deadline = None
+        waited = False
+        start = time.monotonic()
+        while True:
+            raw = None
+            create = False
+            with self._lock:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("Connection pool is closed.")
+                stale = self._take_expired()
+                if self._idle:
+                    raw, _ = self._idle.pop()  # Most recently used first, keeps the rest expiring
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    if deadline is None:
+                        deadline = start + self.checkout_timeout
+                        waited = True
+                        self._stats["waits"] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["wait_time"] += time.monotonic() - start
+                        raise PoolTimeoutError(f"No database connection free after {self.checkout_timeout}s")
+                    self._lock.wait(remaining)
+            self._close_all(stale)
+
+            if create:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._stats["created"] += 1
+            elif raw is not None and not self._is_healthy(raw):
+                self._discard(raw)
+                with self._lock:
+                    self._stats["failed_health_checks"] += 1
+                continue
+            elif raw is None:
+                continue
+
+            with self._lock:
+                self._stats["checkouts"] += 1
+                if waited:
+                    self._stats["wait_time"] += time.monotonic() - start
+            return PooledConnection(self, raw)
+
+    def release(self, raw) -> None:
+        """
+        Return a raw connection to the pool, rolling back anything left uncommitted.
+
+        Args:
+            raw: The connection originally handed out by acquire()
+        """
+        try:
+            raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+        with self._lock:
+            if self._closed:
+                keep = False
+            else:
+                keep = True
+                self._idle.append((raw, time.monotonic()))
+                self._lock.notify()
+        if not keep:
+            self._discard(raw)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that checks a connection out and always returns it.
+
+        Yields:
+            PooledConnection: A healthy connection
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        """
+        Get a snapshot of the pool counters.
+
+        Returns:
+            dict: checkouts, waits, wait_time (seconds), created, discarded,
+                  failed_health_checks plus the current size, idle and in_use counts
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self._size
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = self._size - len(self._idle)
+        return snapshot
+
+    def close(self) -> None:
+        """Close every idle connection and stop handing out new ones."""
+        with self._lock:
+            self._closed = True
+            idle = [raw for raw, _ in self._idle]
+            self._idle.clear()
+            self._lock.notify_all()
+        self._close_all(idle)
+
+    def _take_expired(self) -> list:
+        """Remove idle connections past idle_timeout while above min_size. Caller holds the lock."""
+        expired = []
+        now = time.monotonic()
+        # Oldest connections sit at the left of the deque
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            raw, _ = self._idle.popleft()
+            expired.append(raw)
+            self._size -= 1
+            self._stats["discarded"] += 1
+        return expired
+
+    def _is_healthy(self, raw) -> bool:
+        """Ping the server without reconnecting to check the connection is still usable."""
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, raw) -> None:
+        """Close a connection and free its slot in the pool."""
+        self._close_all([raw])
+        with self._lock:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._lock.notify()
+
+    @staticmethod
+    def _close_all(connections: list) -> None:
+        for raw in connections:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _open_raw_connection():
+    # Update with your MySQL server details
+    return pymysql.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_NAME")
+    )
+
+def get_pool() -> ConnectionPool:
+    """
+    Get the shared connection pool, creating it on first use.
+
+    Pool limits are read from the optional DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE,
+    DB_POOL_IDLE_TIMEOUT and DB_POOL_TIMEOUT environment variables.
+
+    Returns:
+        ConnectionPool: The process wide pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                _open_raw_connection,
+                min_size=int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+                max_size=int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300)),
+                checkout_timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            )
+        return _pool
+
+def get_pool_stats() -> dict:
+    """
+    Get the counters of the shared connection pool.
+
+    Returns:
+        dict: See ConnectionPool.stats()
+    """
+    return get_pool().stats()
+
 def create_connection():
+    """
+    Check a connection out of the shared pool.
+
+    Calling close() on the result returns it to the pool.
+
+    Returns:
+        PooledConnection: A pooled connection, or None if one could not be obtained
+    """
     try:
-        # Update with your MySQL server details
-        connection = pymysql.connect(
-            host=os.getenv("DB_HOST"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            database=os.getenv("DB_NAME")
-        )
-        return connection
+        return get_pool().acquire()
     except pymysql.MySQLError as e:
         print(f"Error connecting to the database: {e}")
-        return None
\ No newline at end of file
+        return None
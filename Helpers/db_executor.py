@@ -0,0 +1,140 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class DBTask:
+    """
+    Handle for work submitted to a DBExecutor.
+
+    Attributes:
+        cancelled (bool): True once cancel() was called, its callbacks will never run
+        done (bool): True once the callbacks have run or the task was cancelled
+    """
+
+    def __init__(self, future, on_success, on_error, owner):
+        self._future = future
+        self._on_success = on_success
+        self._on_error = on_error
+        self._owner = owner
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task. Work that has not started is skipped, work already running
+        finishes in the background but its result is thrown away.
+
+        Returns:
+            bool: False if the task had already finished
+        """
+        if self.done:
+            return False
+        self.cancelled = True
+        self._future.cancel()
+        return True
+
+
+class DBExecutor:
+    """
+    Runs blocking data layer calls on worker threads and hands their results back
+    to the Tk main loop.
+
+    Work is submitted from the main thread together with callbacks. The callbacks
+    always run on the main thread, called from root.after, so they may freely update
+    widgets while the worker threads never touch Tk.
+    """
+
+    def __init__(self, root, workers: int = 2, poll_interval: int = 30, on_busy=None):
+        """
+        Initialize the executor.
+
+        Args:
+            root: The Tk root whose main loop delivers the results
+            workers (int): Number of worker threads
+            poll_interval (int): Milliseconds between checks for finished work while any is pending
+            on_busy (callable, optional): Called on the main thread with True when work starts
+                                          and False once nothing is pending, e.g. to show a busy cursor
+        """
+        self._root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._poll_interval = poll_interval
+        self._pending = set()
+        self._polling = False
+        self.on_busy = on_busy
+
+    def submit(self, fn, *args, on_success=None, on_error=None, owner=None, **kwargs) -> DBTask:
+        """
+        Run fn(*args, **kwargs) on a worker thread.
+
+        Args:
+            fn (callable): The blocking call, it must not touch any widget
+            on_success (callable, optional): Called with the return value on the main thread
+            on_error (callable, optional): Called with the raised exception on the main thread,
+                                           the exception is printed if not given
+            owner (optional): Widget the callbacks belong to, they are skipped if it was destroyed
+
+        Returns:
+            DBTask: Handle that can cancel the task
+
+        Raises:
+            RuntimeError: If called from any thread but the main thread
+        """
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("DBExecutor.submit must be called from the Tk main thread")
+
+        future = self._pool.submit(fn, *args, **kwargs)
+        task = DBTask(future, on_success, on_error, owner)
+        # Runs on the worker thread, or straight away when cancelled before starting
+        future.add_done_callback(lambda f: self._results.put(task))
+
+        self._pending.add(task)
+        if len(self._pending) == 1 and self.on_busy:
+            self.on_busy(True)
+        if not self._polling:
+            self._polling = True
+            self._root.after(self._poll_interval, self._deliver)
+        return task
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, work not yet started is dropped."""
+        for task in list(self._pending):
+            task.cancel()
+        self._pool.shutdown(wait=False)
+
+    def _deliver(self) -> None:
+        """Run the callbacks of finished tasks. Always runs on the main thread."""
+        while True:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            task.done = True
+            if task.cancelled or (task._owner is not None and not self._exists(task._owner)):
+                continue
+            error = task._future.exception()
+            try:
+                if error is None:
+                    if task._on_success:
+                        task._on_success(task._future.result())
+                elif task._on_error:
+                    task._on_error(error)
+                else:
+                    print(f"Error in background database call: {error}")
+            except Exception as e:
+                print(f"Error in database callback: {e}")
+
+        if self._pending:
+            self._root.after(self._poll_interval, self._deliver)
+        else:
+            self._polling = False
+            if self.on_busy:
+                self.on_busy(False)
+
+    @staticmethod
+    def _exists(widget) -> bool:
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
@@ -0,0 +1,171 @@
+import heapq
+import threading
+from datetime import date, datetime
+from Classes.Money import Money
+
+HOURS = 24
+
+
+class LiveSales:
+    """
+    Running sales figures of the current service, kept in memory.
+
+    Every accepted order is added with record() in time independent of how many
+    orders came before it: the totals are counters, takings are kept as Money so
+    they add up exactly however many orders there are, the hours are a ring buffer
+    of 24 buckets reused as the clock goes round, and the best sellers are a
+    min-heap of the top k items by quantity. Quantities only ever grow, so an
+    item can only enter the top k by beating its smallest entry, which is the
+    root of the heap. The figures start again when the first order of a new day
+    is recorded.
+
+    Reading a snapshot() never touches the database, so a screen can poll it as
+    often as it likes.
+
+    Attributes:
+        top_k (int): Number of best selling items kept
+    """
+
+    def __init__(self, top_k: int = 10):
+        """
+        Initialize empty figures.
+
+        Args:
+            top_k (int): Number of best selling items kept
+        """
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self.version = 0  # Number of orders recorded, see seed()
+        self._reset(None)
+
+    def _reset(self, day) -> None:
+        """Start the figures of a new day. Caller holds the lock."""
+        self._day = day
+        self._orders = 0
+        self._items = 0
+        self._revenue = Money()
+        # Bucket of each hour of the day as [(day, hour), orders, items, revenue],
+        # a bucket with another stamp is cleared when it is reused
+        self._hours = [[None, 0, 0, Money()] for _ in range(HOURS)]
+        self._item_sales = {}  # menuNumber -> [quantity, revenue, name]
+        self._top = []  # Min-heap of [quantity, menuNumber], at most top_k entries
+        self._in_top = {}  # menuNumber -> its entry in _top
+
+    def record(self, order) -> None:
+        """
+        Add an accepted order to the figures.
+
+        Args:
+            order (CustomerOrder): The order
+        """
+        when = order.datetime
+        with self._lock:
+            if self._day != when.date():
+                if self._day is not None and when.date() < self._day:
+                    return  # An order of a previous service, replayed late
+                self._reset(when.date())
+            items = sum(item.quantity for item in order.menu_items)
+            revenue = order.totalprice
+            self._orders += 1
+            self._items += items
+            self._revenue += revenue
+            self._add_to_hour(when, 1, items, revenue)
+            for item in order.menu_items:
+                self._add_item(item.menuNumber, item.menuName, item.quantity, item.total_price)
+            self.version += 1
+
+    def seed(self, day: date, totals: dict, hours: list, items: list, names: dict = None, version: int = None) -> bool:
+        """
+        Replace the figures with those of a day read from the sales rollups,
+        so a restarted app carries on with the orders already taken.
+
+        Args:
+            day (date): The day of the figures
+            totals (dict): 'orders', 'items' and 'revenue' of the day
+            hours (list): (hour, orders, items, revenue) tuples
+            items (list): (menuNumber, quantity, revenue) tuples
+            names (dict, optional): Maps menu numbers to names
+            version (int, optional): The version read before the rollups were, the figures
+                                     are left alone if an order was recorded since
+
+        Returns:
+            bool: True if the figures were replaced
+        """
+        names = names or {}
+        with self._lock:
+            if version is not None and version != self.version:
+                return False  # The rollups may or may not include that order
+            self._reset(day)
+            self._orders = int(totals["orders"])
+            self._items = int(totals["items"])
+            self._revenue = Money.of(totals["revenue"])
+            for hour, orders, item_count, revenue in hours:
+                when = datetime(day.year, day.month, day.day, int(hour))
+                self._add_to_hour(when, int(orders), int(item_count), Money.of(revenue))
+            for menu_number, quantity, revenue in items:
+                self._add_item(menu_number, names.get(menu_number, menu_number), int(quantity), Money.of(revenue))
+            return True
+
+    def _add_to_hour(self, when: datetime, orders: int, items: int, revenue: Money) -> None:
+        """Add to the bucket of an hour. Caller holds the lock."""
+        stamp = (when.date(), when.hour)
+        bucket = self._hours[when.hour % HOURS]
+        if bucket[0] != stamp:
+            bucket[:] = [stamp, 0, 0, Money()]
+        bucket[1] += orders
+        bucket[2] += items
+        bucket[3] += revenue
+
+    def _add_item(self, menu_number: str, name: str, quantity: int, revenue: Money) -> None:
+        """Add to the sales of an item and keep the top k heap in order. Caller holds the lock."""
+        sales = self._item_sales.setdefault(menu_number, [0, Money(), name])
+        sales[0] += quantity
+        sales[1] += revenue
+
+        entry = self._in_top.get(menu_number)
+        if entry is not None:
+            entry[0] = sales[0]
+            heapq.heapify(self._top)  # At most top_k entries
+        elif len(self._top) < self.top_k:
+            entry = [sales[0], menu_number]
+            self._in_top[menu_number] = entry
+            heapq.heappush(self._top, entry)
+        elif sales[0] > self._top[0][0]:
+            entry = [sales[0], menu_number]
+            self._in_top[menu_number] = entry
+            removed = heapq.heapreplace(self._top, entry)
+            del self._in_top[removed[1]]
+
+    def snapshot(self, hours: int = 12) -> dict:
+        """
+        Get the current figures.
+
+        Args:
+            hours (int): Number of hours, up to the current one, to include
+
+        Returns:
+            dict: 'day', 'orders', 'items', 'revenue', 'average_order', 'hours' as
+                  (hour, orders, items, revenue) tuples oldest first and 'top' as
+                  (menuNumber, name, quantity, revenue) tuples best selling first,
+                  amounts are Money
+        """
+        now = datetime.now()
+        with self._lock:
+            recent = []
+            for hour in range(max(now.hour - hours + 1, 0), now.hour + 1):
+                bucket = self._hours[hour]
+                if bucket[0] == (self._day, hour):
+                    recent.append((hour, bucket[1], bucket[2], bucket[3]))
+                else:
+                    recent.append((hour, 0, 0, Money()))
+            top = sorted(self._top, key=lambda entry: (-entry[0], entry[1]))
+            return {
+                "day": self._day,
+                "orders": self._orders,
+                "items": self._items,
+                "revenue": self._revenue,
+                "average_order": Money(round(self._revenue.pence / self._orders)) if self._orders else Money(),
+                "hours": recent,
+                "top": [(menu_number, self._item_sales[menu_number][2], quantity,
+                         self._item_sales[menu_number][1]) for quantity, menu_number in top],
+            }
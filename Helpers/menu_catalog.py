@@ -0,0 +1,203 @@
+import re
+import threading
+import time
+from Classes.MenuItems import MenuItems
+from Helpers.menu_search import MenuSearchIndex
+
+def menu_sort_key(menu_number: str) -> tuple:
+    """
+    Sort key matching the database ordering of CAST(menuNo AS UNSIGNED), menuNo.
+
+    Args:
+        menu_number (str): The menu number, digits followed by an optional letter
+
+    Returns:
+        tuple: (numeric part, full menu number)
+    """
+    digits = re.match(r"\d*", menu_number).group()
+    return (int(digits) if digits else 0, menu_number)
+
+
+class MenuCatalog:
+    """
+    In-process cache of the menu with lookups by menu number and by tag.
+
+    The whole menu is loaded once through the loader and then kept up to date by
+    the data layer calling upsert(), remove_tags() and rename_tags() after successful writes.
+    A search index over the menu numbers and names follows every change. It is
+    reloaded on refresh() or, when a ttl is set, on the first access after
+    the ttl has passed. Items handed out are shared and must be treated as read only.
+
+    Attributes:
+        ttl (float): Seconds before the cache reloads itself, None or 0 to never expire
+    """
+
+    def __init__(self, loader, ttl: float = None):
+        """
+        Initialize the catalog without loading it.
+
+        Args:
+            loader (callable): Function returning a list of every MenuItems on the menu
+            ttl (float, optional): Seconds before the cache is reloaded. Defaults to never.
+        """
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._items = {}  # menuNumber -> MenuItems
+        self._by_tag = {}  # tag -> set of menuNumbers
+        self._ordered = None  # Sorted list of all items, rebuilt lazily after writes
+        self._search_index = MenuSearchIndex(sort_key=menu_sort_key)
+        self._loaded_at = None
+
+    def refresh(self) -> None:
+        """
+        Reload the whole menu from the loader.
+
+        Raises:
+            Exception: Whatever the loader raises, the previous contents are kept
+        """
+        items = self._loader()
+        with self._lock:
+            self._items = {}
+            self._by_tag = {}
+            self._search_index.clear()
+            for item in items:
+                self._store(item)
+            self._ordered = None
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the cached menu so the next access reloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def get(self, menu_number: str):
+        """
+        Look up a menu item by its menu number.
+
+        Args:
+            menu_number (str): The menu number to find
+
+        Returns:
+            MenuItems: The menu item, or None if it isn't on the menu
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return self._items.get(menu_number)
+
+    def all_items(self) -> list:
+        """
+        Get every menu item in menu number order.
+
+        Returns:
+            list: List of MenuItems
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._ordered is None:
+                self._ordered = sorted(self._items.values(), key=lambda item: menu_sort_key(item.menuNumber))
+            return list(self._ordered)
+
+    def items_with_tag(self, tag: str) -> list:
+        """
+        Get the menu items that have a tag, in menu number order.
+
+        Args:
+            tag (str): The tag to look up
+
+        Returns:
+            list: List of MenuItems
+        """
+        with self._lock:
+            self._ensure_loaded()
+            numbers = sorted(self._by_tag.get(tag, ()), key=menu_sort_key)
+            return [self._items[number] for number in numbers]
+
+    def search(self, text: str, limit: int = None) -> list:
+        """
+        Search the menu by menu number and name, tolerating typos.
+
+        Args:
+            text (str): The search text, every word of it has to match
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: List of MenuItems, best matches first then in menu number order
+        """
+        with self._lock:
+            self._ensure_loaded()
+            results = self._search_index.search(text, limit)
+            return [self._items[key] for _, key in results]
+
+    def upsert(self, item: MenuItems) -> None:
+        """
+        Add a menu item or replace the cached copy after it was written to the database.
+
+        Args:
+            item (MenuItems): The menu item as it now is in the database
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return  # Nothing cached yet, the next load will include it
+            self._discard(item.menuNumber)
+            self._store(item)
+            self._ordered = None
+
+    def remove_tags(self, tags: set) -> None:
+        """
+        Remove tags from every cached menu item after they were removed from the database.
+
+        Args:
+            tags (set[str]): The tags that were removed
+        """
+        self.rename_tags({tag: None for tag in tags})
+
+    def rename_tags(self, renamed: dict) -> None:
+        """
+        Rename or merge tags of every cached menu item after the database was changed.
+
+        Args:
+            renamed (dict): Maps each old tag to its new tag, or to None to remove it
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            affected = set()
+            for tag in renamed:
+                affected |= self._by_tag.get(tag, set())
+            for number in affected:
+                item = self._items[number]
+                tags = []
+                for tag in item.menuTags:
+                    new_tag = renamed.get(tag, tag)
+                    if new_tag is not None and new_tag not in tags:
+                        tags.append(new_tag)
+                self._discard(number)
+                # An item left without tags becomes ["None"], the same as when loaded from the database
+                self._store(MenuItems(item.menuNumber, item.menuName, item.menuPrice, tags))
+            self._ordered = None
+
+    def _ensure_loaded(self) -> None:
+        """Load the menu on first use or once the ttl has expired. Caller holds the lock."""
+        if self._loaded_at is None:
+            self.refresh()
+        elif self.ttl and time.monotonic() - self._loaded_at > self.ttl:
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous menu rather than failing every lookup
+                print(f"Error refreshing menu cache: {e}")
+                self._loaded_at = time.monotonic()
+
+    def _store(self, item: MenuItems) -> None:
+        self._items[item.menuNumber] = item
+        self._search_index.add(item.menuNumber, item.menuNumber, item.menuName)
+        for tag in item.menuTags:
+            self._by_tag.setdefault(tag, set()).add(item.menuNumber)
+
+    def _discard(self, menu_number: str) -> None:
+        item = self._items.pop(menu_number, None)
+        self._search_index.remove(menu_number)
+        if item is not None:
+            for tag in item.menuTags:
+                self._by_tag.get(tag, set()).discard(menu_number)
@@ -0,0 +1,227 @@
+import re
+
+# Match quality, lower ranks first
+EXACT_NUMBER, NUMBER_PREFIX, NAME_PREFIX, WORD_PREFIX, SUBSTRING, TYPO = range(6)
+
+def _words(text: str) -> list:
+    return re.findall(r"\w+", text.lower())
+
+def _trigrams(term: str) -> set:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+def max_typos(length: int) -> int:
+    """Number of typos tolerated in a search word of the given length."""
+    if length >= 8:
+        return 2
+    if length >= 4:
+        return 1
+    return 0
+
+def prefix_distance(query: str, term: str, limit: int) -> int:
+    """
+    Smallest edit distance between query and any prefix of term.
+
+    Insertions, deletions, substitutions and swapping two neighbouring letters
+    each count as one edit.
+
+    Args:
+        query (str): The search word
+        term (str): The indexed word
+        limit (int): Distances above limit are not needed exactly
+
+    Returns:
+        int: The distance, or limit + 1 if it is more than limit
+    """
+    term = term[:len(query) + limit]  # Longer prefixes are always too far away
+    before = None
+    previous = list(range(len(term) + 1))  # Distance of "" to each prefix of term
+    for i, q in enumerate(query, 1):
+        current = [i]
+        for j, t in enumerate(term, 1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (q != t))
+            if before is not None and j > 1 and q == term[j - 2] and query[i - 2] == t:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous)
+
+
+class _TrieNode:
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children = {}
+        self.keys = set()  # Items with a word starting with the prefix ending here
+
+
+class MenuSearchIndex:
+    """
+    In-memory search index over menu numbers and names.
+
+    Every lowercased word of a name and the menu number are added to a prefix
+    trie and a trigram index. A search word is looked up as a prefix in the trie,
+    as a substring through the trigrams, and, when long enough, with typos among
+    the items sharing enough trigrams with it. Results are ranked by the weakest
+    match of any search word: exact menu number, menu number prefix, name prefix,
+    word prefix, substring and finally typo matches.
+
+    Items are added and removed one at a time so the index follows menu edits
+    without being rebuilt.
+    """
+
+    def __init__(self, sort_key=None):
+        """
+        Initialize an empty index.
+
+        Args:
+            sort_key (callable, optional): Orders items of the same rank by their key,
+                                           worked out once per item when it is added
+        """
+        self._sort_key = sort_key or (lambda key: key)
+        self._root = _TrieNode()
+        self._term_keys = {}  # indexed word or menu number -> set of keys
+        self._grams = {}  # trigram -> set of indexed words and menu numbers
+        self._name_words = set()  # Indexed words that aren't menu numbers, the only ones matched with typos
+        self._terms = {}  # key -> (menu number, name, words)
+        self._sort_keys = {}  # key -> sort key
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.__init__(self._sort_key)
+
+    def add(self, key: str, menu_number: str, name: str) -> None:
+        """
+        Add an item, replacing any item already indexed under the key.
+
+        Args:
+            key (str): The key returned by search(), normally the menu number
+            menu_number (str): The menu number
+            name (str): The name of the menu item
+        """
+        self.remove(key)
+        number = menu_number.lower()
+        words = _words(name)
+        self._terms[key] = (number, name.lower(), words)
+        self._sort_keys[key] = self._sort_key(key)
+        for term in {number, *words}:
+            node = self._root
+            for char in term:
+                node = node.children.setdefault(char, _TrieNode())
+                node.keys.add(key)
+            if term not in self._term_keys:
+                self._term_keys[term] = set()
+                for gram in _trigrams(term):
+                    self._grams.setdefault(gram, set()).add(term)
+                if not term[0].isdigit():
+                    self._name_words.add(term)
+            self._term_keys[term].add(key)
+
+    def remove(self, key: str) -> None:
+        """Remove an item, nothing happens if it isn't indexed."""
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        del self._sort_keys[key]
+        number, _, words = terms
+        for term in {number, *words}:
+            node = self._root
+            for char in term:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.keys.discard(key)
+                if not child.keys:
+                    del node.children[char]  # Nothing else goes through this branch
+                    break
+                node = child
+            keys = self._term_keys.get(term)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    # Last item using the word
+                    del self._term_keys[term]
+                    self._name_words.discard(term)
+                    for gram in _trigrams(term):
+                        self._grams[gram].discard(term)
+                        if not self._grams[gram]:
+                            del self._grams[gram]
+
+    def search(self, text: str, limit: int = None) -> list:
+        """
+        Find the items matching every word of the search text.
+
+        Args:
+            text (str): The search text
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: (rank, key) tuples, best matches first
+        """
+        query_words = _words(text)
+        if not query_words:
+            return []
+        ranks = None
+        for word in query_words:
+            word_ranks = self._match_word(word)
+            if ranks is None:
+                ranks = word_ranks
+            else:
+                ranks = {key: max(rank, word_ranks[key]) for key, rank in ranks.items() if key in word_ranks}
+            if not ranks:
+                return []
+        sort_keys = self._sort_keys
+        results = sorted(((rank, key) for key, rank in ranks.items()), key=lambda result: (result[0], sort_keys[result[1]]))
+        return results[:limit] if limit else results
+
+    def _match_word(self, word: str) -> dict:
+        """Rank every item matching one search word."""
+        ranks = {}
+        node = self._root
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                break
+        else:
+            for key in node.keys:
+                number, name, _ = self._terms[key]
+                if number == word:
+                    ranks[key] = EXACT_NUMBER
+                elif number.startswith(word):
+                    ranks[key] = NUMBER_PREFIX
+                elif name.startswith(word):
+                    ranks[key] = NAME_PREFIX
+                else:
+                    ranks[key] = WORD_PREFIX
+
+        grams = _trigrams(word)
+        if not grams:
+            return ranks
+        # Typos and substrings are looked for among the distinct words, far fewer than the items
+        counts = {}
+        for gram in grams:
+            for term in self._grams.get(gram, ()):
+                counts[term] = counts.get(term, 0) + 1
+
+        typos = 0 if word[0].isdigit() else max_typos(len(word))
+        # Each typo changes at most 4 trigrams, swapped letters being the worst case
+        needed = len(grams) - 4 * typos
+        if needed < 1:
+            candidates = self._name_words | counts.keys()  # Too short for trigrams to narrow it down, check every word
+        else:
+            candidates = [term for term, count in counts.items() if count >= needed]
+        for term in candidates:
+            if counts.get(term) == len(grams) and word in term:
+                rank = SUBSTRING
+            elif typos and term in self._name_words and prefix_distance(word, term, typos) <= typos:
+                rank = TYPO
+            else:
+                continue
+            for key in self._term_keys[term]:
+                if ranks.get(key, TYPO + 1) > rank:
+                    ranks[key] = rank
+        return ranks
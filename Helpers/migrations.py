@@ -0,0 +1,206 @@
+import json
+from Helpers.storage import get_storage
+import Helpers.sales_rollups as sales_rollups
+
+# Records which migrations have been applied to the database
+SCHEMA_VERSION_TABLE = """CREATE TABLE IF NOT EXISTS schema_version(
+        version INT NOT NULL PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );"""
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    """Check whether a column exists in a table of the current database."""
+    return get_storage().column_exists(cursor, table, column)
+
+def create_index_if_missing(cursor, table: str, index: str, columns: str, unique: bool = False) -> None:
+    """
+    Create an index unless one with the same name already exists.
+
+    Args:
+        cursor: Cursor of the database connection
+        table (str): Table to index
+        index (str): Name of the index
+        columns (str): Comma separated column list
+        unique (bool): Create a unique index
+    """
+    if not get_storage().index_exists(cursor, table, index):
+        cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index} ON {table} ({columns})")
+
+def _move_tags_to_menu_tags(cursor) -> None:
+    """Move tags out of the JSON menu.tags column into the menu_tags table."""
+    if not column_exists(cursor, "menu", "tags"):
+        return
+    cursor.execute("""CREATE TABLE IF NOT EXISTS menu_tags(
+        menuNo VARCHAR(10) NOT NULL,
+        tag VARCHAR(255) NOT NULL,
+        PRIMARY KEY (menuNo, tag),
+        INDEX idx_menu_tags_tag (tag, menuNo),
+        FOREIGN KEY (menuNo) REFERENCES menu(menuNo) ON DELETE CASCADE
+    ) COMMENT 'Tags of each menu item, one row per tag';""")
+    cursor.execute("SELECT menuNo, tags FROM menu")
+    rows = []
+    for menuNo, tags_json in cursor.fetchall():
+        tags = json.loads(tags_json) if tags_json else []
+        rows.extend((menuNo, tag) for tag in set(tags) if tag != "None")
+    if rows:
+        cursor.executemany(f"{get_storage().insert_ignore} INTO menu_tags (menuNo, tag) VALUES (%s, %s)", rows)
+    cursor.execute("ALTER TABLE menu DROP COLUMN tags")
+
+def _add_lookup_indexes(cursor) -> None:
+    """Index the columns past orders and modifications are looked up by."""
+    create_index_if_missing(cursor, "Customer_Orders", "idx_customer_orders_time", "time_of_order")
+    create_index_if_missing(cursor, "Customer_Orders", "idx_customer_orders_employee", "employee_username, time_of_order")
+    create_index_if_missing(cursor, "Menu_Item_order", "idx_menu_item_order_order", "order_id")
+    create_index_if_missing(cursor, "modifications", "idx_modifications_tag", "tag_name")
+
+def _add_sales_rollups(cursor) -> None:
+    """Create the sales rollup tables and fill them from the existing orders."""
+    for query in get_storage().rollup_tables:
+        cursor.execute(query.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)
+                            .replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+    sales_rollups.rebuild_all(cursor)
+
+def _add_order_idempotency_keys(cursor) -> None:
+    """Give orders a unique idempotency key so replayed offline orders are never saved twice."""
+    if not column_exists(cursor, "Customer_Orders", "idempotency_key"):
+        cursor.execute("ALTER TABLE Customer_Orders ADD COLUMN idempotency_key CHAR(36) NULL")
+    create_index_if_missing(cursor, "Customer_Orders", "idx_customer_orders_idempotency_key", "idempotency_key",
+                            unique=True)
+
+def _snapshot_order_item_prices(cursor) -> None:
+    """
+    Store the name and unit price of each ordered item on its order line.
+
+    Lines saved before this migration get the menu item's current name. Their
+    unit price is worked out from what was charged, the line total divided by
+    the quantity less the cost of its modifications, rather than today's menu price.
+    """
+    if not column_exists(cursor, "Menu_Item_order", "name"):
+        cursor.execute("ALTER TABLE Menu_Item_order ADD COLUMN name VARCHAR(255) NULL")
+    if not column_exists(cursor, "Menu_Item_order", "unit_price"):
+        cursor.execute("ALTER TABLE Menu_Item_order ADD COLUMN unit_price DECIMAL(10,2) NULL")
+
+    cursor.execute("""UPDATE Menu_Item_order
+                      SET name = (SELECT m.name FROM menu AS m WHERE m.menuNo = Menu_Item_order.menuNo)
+                      WHERE name IS NULL""")
+    cursor.execute("""SELECT mio.order_item_id, mio.quantity, mio.total_price, mio.modifications, m.price
+                      FROM Menu_Item_order AS mio
+                      LEFT JOIN menu AS m ON m.menuNo = mio.menuNo
+                      WHERE mio.unit_price IS NULL""")
+    prices = []
+    for order_item_id, quantity, total_price, modifications, menu_price in cursor.fetchall():
+        if quantity and total_price is not None:
+            modification_cost = sum(json.loads(modifications).values()) if modifications else 0
+            unit_price = max(round(float(total_price) / quantity - modification_cost, 2), 0)
+        else:
+            unit_price = menu_price
+        prices.append((unit_price, order_item_id))
+    cursor.executemany("UPDATE Menu_Item_order SET unit_price = %s WHERE order_item_id = %s", prices)
+
+def _add_order_archive(cursor) -> None:
+    """Create the tables old orders are archived into."""
+    for query in get_storage().archive_tables:
+        cursor.execute(query.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)
+                            .replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+
+# (version, description, function applying it) in the order they must run.
+# Never change a released migration, add a new one instead.
+MIGRATIONS = [
+    (1, "Move menu tags into the menu_tags table", _move_tags_to_menu_tags),
+    (2, "Index order times, employees, order items and modification tags", _add_lookup_indexes),
+    (3, "Add daily, hourly, item and employee sales rollups", _add_sales_rollups),
+    (4, "Add idempotency keys to customer orders", _add_order_idempotency_keys),
+    (5, "Store the name and unit price of ordered items on their order lines", _snapshot_order_item_prices),
+    (6, "Add the order archive tables", _add_order_archive),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def applied_versions(cursor) -> set:
+    """
+    Get the migration versions recorded as applied.
+
+    Returns:
+        set: Applied version numbers, empty for a database older than schema_version
+    """
+    cursor.execute(SCHEMA_VERSION_TABLE)
+    cursor.execute("SELECT version FROM schema_version")
+    return {row[0] for row in cursor.fetchall()}
+
+def mark_all_applied(cursor) -> None:
+    """Record every migration as applied, used after creating a database from the current schema."""
+    cursor.execute(SCHEMA_VERSION_TABLE)
+    cursor.executemany(f"{get_storage().insert_ignore} INTO schema_version (version, description) VALUES (%s, %s)",
+                       [(version, description) for version, description, _ in MIGRATIONS])
+
+def migrate() -> list:
+    """
+    Apply every migration that has not been applied yet, in version order.
+
+    Each migration is recorded as soon as it succeeds, so a failed run can
+    simply be repeated once the problem is fixed.
+
+    Returns:
+        list: Versions applied by this run
+
+    Raises:
+        ConnectionError: If database connection fails
+        Exception: If a migration fails, earlier migrations stay applied
+    """
+    connection = get_storage().connect()
+    if not connection:
+        raise ConnectionError("Failed to establish database connection.")
+    applied = []
+    try:
+        with connection.cursor() as cursor:
+            done = applied_versions(cursor)
+            for version, description, apply in MIGRATIONS:
+                if version in done:
+                    continue
+                apply(cursor)
+                cursor.execute("INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                               (version, description))
+                connection.commit()
+                applied.append(version)
+                print(f"Applied migration {version}: {description}")
+        return applied
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+def check_query_plans(queries: list) -> bool:
+    """
+    Check with EXPLAIN that every table read by each query is accessed through an index.
+
+    A table read without an index (a full scan) fails the check. On nearly
+    empty tables the database may prefer a scan even when a usable index exists,
+    so run this against a database holding realistic data.
+
+    Args:
+        queries (list): (name, query, params) tuples
+
+    Returns:
+        bool: True if no query does a full table scan
+
+    Raises:
+        ConnectionError: If database connection fails
+    """
+    storage = get_storage()
+    connection = storage.connect()
+    if not connection:
+        raise ConnectionError("Failed to establish database connection.")
+    all_indexed = True
+    try:
+        with connection.cursor() as cursor:
+            for name, query, params in queries:
+                for step in storage.explain(cursor, query, params):
+                    indexed = not step["full_scan"]
+                    all_indexed = all_indexed and indexed
+                    status = "OK  " if indexed else "SCAN"
+                    print(f"{status} {name}: table {step['table']} type {step['type']} key {step['key']}")
+    finally:
+        connection.close()
+    return all_indexed
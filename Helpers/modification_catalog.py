@@ -0,0 +1,78 @@
+import threading
+
+class ModificationCatalog:
+    """
+    In-process cache of every menu item modification grouped by tag.
+
+    The modifications table and the list of modification tags are loaded once on
+    first use and kept until invalidate() is called, which the data layer does
+    whenever a modification is added or removed.
+    """
+
+    def __init__(self, loader, tags_loader):
+        """
+        Initialize the catalog without loading it.
+
+        Args:
+            loader (callable): Function returning (modification_name, additional_cost, tag_name) rows
+            tags_loader (callable): Function returning the list of modification tags
+        """
+        self._loader = loader
+        self._tags_loader = tags_loader
+        self._lock = threading.RLock()
+        self._rows = None
+        self._by_tag = {}
+        self._tags = None
+
+    def invalidate(self) -> None:
+        """Drop the cached modifications so the next access reloads them."""
+        with self._lock:
+            self._rows = None
+            self._by_tag = {}
+
+    def all_modifications(self) -> list:
+        """
+        Get every modification.
+
+        Returns:
+            list: (modification_name, additional_cost, tag_name) tuples
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._rows)
+
+    def modifications_for_tag(self, tag: str) -> list:
+        """
+        Get the modifications belonging to a tag.
+
+        Args:
+            tag (str): The group of ingredients
+
+        Returns:
+            list: (modification_name, additional_cost) tuples
+        """
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._by_tag.get(tag, ()))
+
+    def tags(self) -> list:
+        """
+        Get the modification tags, loaded from file once.
+
+        Returns:
+            list: The tags in display order
+        """
+        with self._lock:
+            if self._tags is None:
+                self._tags = list(self._tags_loader())
+            return list(self._tags)
+
+    def _ensure_loaded(self) -> None:
+        """Load the modifications on first use. Caller holds the lock."""
+        if self._rows is None:
+            rows = [tuple(row) for row in self._loader()]
+            by_tag = {}
+            for name, cost, tag in rows:
+                by_tag.setdefault(tag, []).append((name, cost))
+            self._rows = rows
+            self._by_tag = by_tag
@@ -0,0 +1,158 @@
+import time
+from datetime import date, datetime
+from Helpers.storage import get_storage
+
+# Orders older than the retention period are moved, a batch at a time, from the live
+# order tables into archive tables with the same columns. The live tables only hold
+# recent orders, which keeps them and their indexes small. Queries over order history
+# are written once against {orders} and {items} and run over both pairs of tables
+# through union_all(). The sales rollups are never archived, reports read them as before.
+
+# (orders table, order lines table) pairs, live tables first
+ORDER_TABLES = [
+    ("Customer_Orders", "Menu_Item_order"),
+    ("customer_orders_archive", "menu_item_order_archive"),
+]
+ORDER_COLUMNS = "order_id, employee_username, time_of_order, total_price, total_no_of_items, idempotency_key"
+ORDER_ITEM_COLUMNS = "order_item_id, order_id, menuNo, name, unit_price, quantity, total_price, modifications"
+
+def union_all(branch: str, order_by: str = None, limit: int = None, tables: list = ORDER_TABLES) -> str:
+    """
+    Build a query reading the live and archived orders as if they were one pair of tables.
+
+    The branch is repeated for each pair of tables, so each copy keeps its own
+    WHERE clause and uses the indexes of its tables. With a limit every branch is
+    ordered and limited as well, so a page never reads more than limit rows from each.
+    Pass the parameters of one branch through union_params().
+
+    Args:
+        branch (str): A SELECT naming the tables {orders} and {items}
+        order_by (str, optional): ORDER BY of the result. Columns of a join must be given
+                                  an alias in the branch and named by it, which SQLite needs
+        limit (int, optional): Maximum number of rows, needs order_by
+        tables (list, optional): The (orders, items) pairs to read, every pair of ORDER_TABLES by default
+
+    Returns:
+        str: The query
+    """
+    branches = []
+    for orders, items in tables:
+        query = branch.strip().rstrip(";").format(orders=orders, items=items)
+        if limit is not None:
+            query = f"SELECT * FROM ({query}\n    ORDER BY {order_by}\n    LIMIT {int(limit)}) AS {orders}_page"
+        branches.append(query)
+    query = "\nUNION ALL\n".join(branches)
+    if order_by:
+        query += f"\nORDER BY {order_by}"
+    if limit is not None:
+        query += f"\nLIMIT {int(limit)}"
+    return query
+
+def union_params(params, tables: list = ORDER_TABLES) -> tuple:
+    """Repeat the parameters of one branch for every branch of a union_all() query over tables."""
+    return tuple(params) * len(tables)
+
+def existing_order_tables(cursor) -> list:
+    """
+    Get the pairs of ORDER_TABLES that exist, for code that can run before the archive tables are created.
+
+    Args:
+        cursor: Cursor of the database connection
+
+    Returns:
+        list: The live pair, followed by the archive pair once it has been created
+    """
+    storage = get_storage()
+    return ORDER_TABLES[:1] + [(orders, items) for orders, items in ORDER_TABLES[1:]
+                               if storage.column_exists(cursor, orders, "order_id")]
+
+def archive_cutoff(keep_months: int, today: date = None) -> datetime:
+    """
+    Get the start of the oldest month kept in the live tables.
+
+    Args:
+        keep_months (int): Number of months kept, the current month counts as one
+        today (date, optional): Defaults to today
+
+    Returns:
+        datetime: Midnight on the first day of that month
+    """
+    today = today or date.today()
+    months = today.year * 12 + today.month - 1 - (max(keep_months, 1) - 1)
+    return datetime(months // 12, months % 12 + 1, 1)
+
+def archive_orders(before: datetime, batch_size: int = 500, pause: float = 0.05, report=None) -> dict:
+    """
+    Move every order placed before a time, and its lines, into the archive tables.
+
+    Orders are moved oldest first in batches, each batch in its own short
+    transaction, with a pause between batches so orders being taken meanwhile
+    aren't held up. It can be stopped at any point and run again.
+
+    The order with the highest order_id and the order of the line with the
+    highest order_item_id always stay in the live tables, however old. MySQL
+    before 8.0 sets AUTO_INCREMENT back to the highest id left in a table when it
+    restarts, so emptying the live tables would let new orders and lines reuse
+    ids that are already archived.
+
+    Args:
+        before (datetime): Orders placed before this are archived, normally a month start from archive_cutoff()
+        batch_size (int): Orders moved per transaction
+        pause (float): Seconds to wait between batches
+        report (callable, optional): Called with the stats after every batch
+
+    Returns:
+        dict: Number of "orders" and "lines" moved, "months" mapping YYYY-MM to the
+              orders moved from it, and the "seconds" taken
+
+    Raises:
+        ConnectionError: If database connection fails
+        Exception: If a batch fails, it is rolled back and the batches before it stay archived
+    """
+    (live_orders, live_items), (archive_orders_table, archive_items) = ORDER_TABLES
+    stats = {"orders": 0, "lines": 0, "months": {}, "seconds": 0.0}
+    started = time.perf_counter()
+    with get_storage().connection() as db:
+        cursor = db.cursor()
+        while True:
+            cursor.execute(f"""SELECT order_id, time_of_order FROM {live_orders}
+                               WHERE time_of_order < %s
+                               AND order_id < (SELECT MAX(order_id) FROM {live_orders})
+                               AND order_id <> COALESCE((SELECT order_id FROM {live_items}
+                                                         ORDER BY order_item_id DESC LIMIT 1), 0)
+                               ORDER BY time_of_order, order_id
+                               LIMIT {int(batch_size)}""", (before,))
+            batch = cursor.fetchall()
+            if not batch:
+                break
+            order_ids = [order_id for order_id, _ in batch]
+            placeholders = ", ".join(["%s"] * len(order_ids))
+            try:
+                cursor.execute(f"""INSERT INTO {archive_orders_table} ({ORDER_COLUMNS})
+                                   SELECT {ORDER_COLUMNS} FROM {live_orders} WHERE order_id IN ({placeholders})""",
+                               order_ids)
+                cursor.execute(f"""INSERT INTO {archive_items} ({ORDER_ITEM_COLUMNS})
+                                   SELECT {ORDER_ITEM_COLUMNS} FROM {live_items} WHERE order_id IN ({placeholders})""",
+                               order_ids)
+                lines = cursor.rowcount
+                # Lines first, they reference the orders
+                cursor.execute(f"DELETE FROM {live_items} WHERE order_id IN ({placeholders})", order_ids)
+                cursor.execute(f"DELETE FROM {live_orders} WHERE order_id IN ({placeholders})", order_ids)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            stats["orders"] += len(batch)
+            stats["lines"] += lines
+            for _, time_of_order in batch:
+                month = time_of_order.strftime("%Y-%m")
+                stats["months"][month] = stats["months"].get(month, 0) + 1
+            stats["seconds"] = time.perf_counter() - started
+            if report:
+                report(stats)
+            if len(batch) < batch_size:
+                break
+            time.sleep(pause)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+import time
+from Helpers.storage import get_storage
+from Helpers.order_archive import ORDER_TABLES
+
+# One row per order line, orders without lines get a single row with empty line columns.
+# Run on one pair of tables at a time in primary key order, so the server can send rows
+# as it reads them instead of sorting the whole range first
+EXPORT_QUERY = """SELECT co.order_id, co.time_of_order, co.employee_username, co.total_price,
+                         co.total_no_of_items, mio.order_item_id, mio.menuNo, mio.name,
+                         mio.unit_price, mio.quantity, mio.total_price, mio.modifications
+                  FROM {orders} AS co
+                  LEFT JOIN {items} AS mio ON mio.order_id = co.order_id
+                  WHERE co.time_of_order >= %s AND co.time_of_order < %s AND co.order_id > %s
+                  ORDER BY co.order_id, mio.order_item_id"""
+
+# Archived orders first, they are the older ones
+EXPORT_TABLES = ORDER_TABLES[::-1]
+
+EXPORT_COLUMNS = ["order_id", "time_of_order", "employee_username", "order_total_price", "order_total_items",
+                  "order_item_id", "menuNo", "name", "unit_price", "quantity", "total_price", "modifications"]
+
+def _csv_writer(file):
+    writer = csv.writer(file)
+    def write(row):
+        writer.writerow(["" if value is None else value for value in row])
+    return write
+
+def _jsonl_writer(file):
+    def write(row):
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record["time_of_order"] = record["time_of_order"].isoformat() if record["time_of_order"] else None
+        for column in ("order_total_price", "unit_price", "total_price"):
+            if record[column] is not None:
+                record[column] = float(record[column])
+        if record["modifications"]:
+            record["modifications"] = json.loads(record["modifications"])
+        file.write(json.dumps(record) + "\n")
+    return write
+
+WRITERS = {"csv": _csv_writer, "jsonl": _jsonl_writer}
+
+def _write_order(write, order_rows: list, stats: dict) -> None:
+    for row in order_rows:
+        write(row)
+    stats["rows"] += len(order_rows)
+    stats["orders"] += 1
+    stats["last_order_id"] = order_rows[0][0]
+
+def progress_path(path: str) -> str:
+    """Location of the checkpoint of an export, removed once the export completes."""
+    return path + ".progress"
+
+def _save_progress(path: str, offset: int, table: int, last_order_id: int) -> None:
+    """Atomically record how far the output is complete."""
+    temp_path = progress_path(path) + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"offset": offset, "table": table, "last_order_id": last_order_id}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, progress_path(path))
+
+def export_orders(range_start, range_end, path: str, fmt: str = None, resume: bool = False,
+                  batch_size: int = 1000, report=None) -> dict:
+    """
+    Stream the orders and order lines of a date range into a CSV or JSON Lines file.
+
+    The archive tables and then the live tables are read in turn, each in order_id
+    order, through an unbuffered server-side cursor in batches and written as the
+    rows arrive, so memory use doesn't grow with the size of the range. After every
+    batch, the file offset, the table being read and the order_id of the last
+    complete order are checkpointed next to the output. An interrupted export
+    resumed with resume=True truncates any partly written order and carries on
+    after the last complete one.
+
+    Args:
+        range_start (datetime): Start of the range, inclusive
+        range_end (datetime): End of the range, exclusive
+        path (str): Output file
+        fmt (str, optional): "csv" or "jsonl". Defaults to the output file extension
+        resume (bool): Continue an interrupted export of the same range into the same file
+        batch_size (int): Rows fetched per round trip
+        report (callable, optional): Called with the running stats after every batch
+
+    Returns:
+        dict: "rows" and "orders" written by this run, "seconds", "rows_per_second"
+              and "last_order_id" of the table last read
+
+    Raises:
+        ValueError: If the format is unknown
+        ConnectionError: If database connection fails
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(WRITERS)}")
+
+    first_table, last_order_id = 0, 0
+    offset = None
+    if resume and os.path.exists(progress_path(path)):
+        with open(progress_path(path), "r", encoding="utf-8") as file:
+            progress = json.load(file)
+        offset, first_table, last_order_id = progress["offset"], progress.get("table", 0), progress["last_order_id"]
+
+    storage = get_storage()
+    stats = {"rows": 0, "orders": 0, "seconds": 0.0, "rows_per_second": 0.0, "last_order_id": last_order_id}
+    started = time.perf_counter()
+    with storage.connection() as db, open(path, "r+" if offset is not None else "w",
+                                          newline="", encoding="utf-8") as file:
+        if offset is not None:
+            file.seek(offset)
+            file.truncate()
+        write = WRITERS[fmt](file)
+        if fmt == "csv" and file.tell() == 0:
+            csv.writer(file).writerow(EXPORT_COLUMNS)
+
+        for table in range(first_table, len(EXPORT_TABLES)):
+            if table != first_table:
+                last_order_id = stats["last_order_id"] = 0
+            orders, items = EXPORT_TABLES[table]
+            cursor = storage.streaming_cursor(db)
+            try:
+                cursor.execute(EXPORT_QUERY.format(orders=orders, items=items), (range_start, range_end, last_order_id))
+                order_rows = []  # Lines of the order being read, written once it is complete
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        if order_rows and row[0] != order_rows[0][0]:
+                            _write_order(write, order_rows, stats)
+                            order_rows = []
+                        order_rows.append(row)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    _save_progress(path, file.tell(), table, stats["last_order_id"])
+                    stats["seconds"] = time.perf_counter() - started
+                    stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+                    if report:
+                        report(stats)
+                if order_rows:
+                    _write_order(write, order_rows, stats)
+            finally:
+                cursor.close()
+
+    if os.path.exists(progress_path(path)):
+        os.remove(progress_path(path))
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
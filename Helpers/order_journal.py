@@ -0,0 +1,332 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from Classes.MenuItems import MenuItems
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.CustomerOrder import CustomerOrder
+
+def new_idempotency_key() -> str:
+    """Create the key that identifies one accepted order across every attempt to save it."""
+    return str(uuid.uuid4())
+
+def order_to_dict(order: CustomerOrder) -> dict:
+    """
+    Convert an order into plain JSON serializable data.
+
+    Args:
+        order (CustomerOrder): The order to convert
+
+    Returns:
+        dict: The employee, time of order and line items of the order
+    """
+    return {
+        "employee": order.employeeID,
+        "time": order.datetime.isoformat(),
+        "items": [{"menuNo": item.menuNumber,
+                   "name": item.menuName,
+                   "price": str(item.menuPrice),
+                   "tags": item.menuTags,
+                   "quantity": item.quantity,
+                   "modifications": item.modifications}
+                  for item in order.menu_items],
+    }
+
+def order_from_dict(data: dict) -> CustomerOrder:
+    """
+    Rebuild an order converted by order_to_dict().
+
+    Args:
+        data (dict): The converted order
+
+    Returns:
+        CustomerOrder: The order with its original time of order
+    """
+    items = [MenuItemOrder(MenuItems(item["menuNo"], item["name"], item["price"], item["tags"]),
+                           item["quantity"], item["modifications"])
+             for item in data["items"]]
+    return CustomerOrder(data["employee"], menu_items=items, date_time=datetime.fromisoformat(data["time"]))
+
+
+class OrderJournal:
+    """
+    Append-only file of orders that could not be saved to the database.
+
+    Each entry is one JSON line holding the order, its idempotency key and the
+    time it was queued. Every append is flushed and fsync'd before returning, so
+    an accepted order survives the application or the machine crashing. Entries
+    are removed by rewriting the file to a temporary copy which atomically
+    replaces the journal, a crash part way through leaves either the old or the
+    new file. A line torn by a crash during an append is skipped when read.
+
+    Orders the database keeps rejecting are moved to a dead letter file next to
+    the journal, with the error, so they no longer hold up the orders behind them.
+    """
+
+    def __init__(self, path: str, dead_letter_path: str = None):
+        """
+        Initialize the journal, the files are created on the first append.
+
+        Args:
+            path (str): Location of the journal file
+            dead_letter_path (str, optional): Location of the file of orders that could not
+                                              be saved, defaults to the journal's name ending .failed.jsonl
+        """
+        self.path = path
+        self.dead_letter_path = dead_letter_path or os.path.splitext(path)[0] + ".failed.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, order: CustomerOrder, key: str) -> None:
+        """
+        Durably add an order to the journal.
+
+        Args:
+            order (CustomerOrder): The order to queue
+            key (str): The idempotency key of the order
+
+        Raises:
+            OSError: If the journal could not be written
+        """
+        line = json.dumps({"key": key, "queued_at": time.time(), "order": order_to_dict(order)})
+        with self._lock:
+            self._append_lines(self.path, [line])
+
+    def pending(self, limit: int = None) -> list:
+        """
+        Get the queued entries, oldest first.
+
+        Args:
+            limit (int, optional): Maximum number of entries to return
+
+        Returns:
+            list: Dicts with the keys "key", "queued_at" and "order"
+        """
+        with self._lock:
+            entries = self._read()
+        return entries[:limit] if limit else entries
+
+    def remove(self, keys: set) -> None:
+        """
+        Remove entries once they are saved to the database.
+
+        Args:
+            keys (set[str]): Idempotency keys of the entries to remove
+        """
+        with self._lock:
+            self._rewrite([entry for entry in self._read() if entry["key"] not in keys])
+
+    def dead_letter(self, failures: list) -> None:
+        """
+        Move entries the database rejected to the dead letter file.
+
+        They are written there before being removed from the journal, a crash in
+        between leaves them in both and they are moved again on the next replay.
+
+        Args:
+            failures (list): (entry, error message) pairs of entries returned by pending()
+        """
+        failed_at = time.time()
+        keys = {entry["key"] for entry, _ in failures}
+        with self._lock:
+            self._append_lines(self.dead_letter_path,
+                               [json.dumps(dict(entry, error=error, failed_at=failed_at)) for entry, error in failures])
+            self._rewrite([entry for entry in self._read() if entry["key"] not in keys])
+
+    def failed(self) -> list:
+        """
+        Get the entries moved to the dead letter file, oldest first.
+
+        Returns:
+            list: Dicts with the keys of pending() entries and "error" and "failed_at"
+        """
+        with self._lock:
+            return self._read(self.dead_letter_path)
+
+    def stats(self) -> dict:
+        """
+        Get the state of the queue.
+
+        Returns:
+            dict: "depth" the number of queued orders, "oldest_age" the seconds
+                  the oldest one has been waiting, None if the queue is empty, and
+                  "failed" the number of orders in the dead letter file
+        """
+        entries = self.pending()
+        oldest = min((entry["queued_at"] for entry in entries), default=None)
+        return {"depth": len(entries), "oldest_age": None if oldest is None else time.time() - oldest,
+                "failed": len(self.failed())}
+
+    def _read(self, path: str = None) -> list:
+        """Read every complete entry of the journal or another file. Caller holds the lock."""
+        path = path or self.path
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Skipping damaged entry in order journal {path}")
+        return entries
+
+    def _append_lines(self, path: str, lines: list) -> None:
+        """Durably append JSON lines to a file. Caller holds the lock."""
+        created = not os.path.exists(path)
+        with open(path, "a+b") as file:
+            # Start on a new line if the last append was torn by a crash
+            if file.tell() > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+            file.write("".join(line + "\n" for line in lines).encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+        if created:
+            self._sync_directory(path)
+
+    def _rewrite(self, entries: list) -> None:
+        """Atomically replace the journal with the given entries. Caller holds the lock."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for entry in entries:
+                file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self._sync_directory(self.path)
+
+    def _sync_directory(self, path: str) -> None:
+        """Make the creation or replacement of a file itself durable."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return  # Not supported on Windows, where os.replace is already durable enough
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class OrderReplayer:
+    """
+    Background thread draining an OrderJournal into the database.
+
+    Every interval the oldest queued orders are handed in batches to the save
+    function and removed from the journal once it returns. A batch failing because
+    the database can't be reached stays queued for the next attempt. A batch
+    failing for any other reason is saved again one order at a time, and the
+    orders that still fail are moved to the journal's dead letter file so the
+    rest of the queue isn't blocked behind them. Because every entry carries its
+    idempotency key, an order saved just before a crash is skipped on replay
+    rather than inserted twice.
+    """
+
+    def __init__(self, journal: OrderJournal, save_batch, interval: float = 15.0, batch_size: int = 50,
+                 is_connection_error=None):
+        """
+        Initialize the replayer without starting it.
+
+        Args:
+            journal (OrderJournal): The journal to drain
+            save_batch (callable): Saves a list of (key, CustomerOrder) pairs in one transaction
+            interval (float): Seconds between attempts
+            batch_size (int): Maximum orders saved per transaction
+            is_connection_error (callable, optional): Tells whether an error raised by save_batch
+                                                      means the database couldn't be reached,
+                                                      defaults to it being a ConnectionError
+        """
+        self.journal = journal
+        self._save_batch = save_batch
+        self._is_connection_error = is_connection_error or (lambda error: isinstance(error, ConnectionError))
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start replaying in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="order-replayer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the thread to stop after the current batch."""
+        self._stop.set()
+
+    def replay(self) -> int:
+        """
+        Save every queued order now.
+
+        Returns:
+            int: Number of orders saved and removed from the journal
+
+        Raises:
+            Exception: A connection error raised by the save function, the orders not yet saved stay queued
+        """
+        replayed = 0
+        while not self._stop.is_set():
+            entries = self.journal.pending(self.batch_size)
+            if not entries:
+                break
+            try:
+                self._save_batch([(entry["key"], order_from_dict(entry["order"])) for entry in entries])
+            except Exception as e:
+                if self._is_connection_error(e):
+                    raise
+                replayed += self._save_one_at_a_time(entries)
+            else:
+                self.journal.remove({entry["key"] for entry in entries})
+                replayed += len(entries)
+        return replayed
+
+    def _save_one_at_a_time(self, entries: list) -> int:
+        """
+        Save the orders of a failed batch separately, moving those that fail to the dead letter file.
+
+        Args:
+            entries (list): The entries of the batch
+
+        Returns:
+            int: Number of orders saved
+
+        Raises:
+            Exception: A connection error raised by the save function, once the orders
+                       saved or rejected so far are out of the journal
+        """
+        saved, failures = set(), []
+        try:
+            for entry in entries:
+                try:
+                    self._save_batch([(entry["key"], order_from_dict(entry["order"]))])
+                except Exception as e:
+                    if self._is_connection_error(e):
+                        raise
+                    failures.append((entry, f"{type(e).__name__}: {e}"))
+                else:
+                    saved.add(entry["key"])
+        finally:
+            if saved:
+                self.journal.remove(saved)
+            if failures:
+                self.journal.dead_letter(failures)
+                print(f"Moved {len(failures)} order(s) that could not be saved to {self.journal.dead_letter_path}: "
+                      + "; ".join(error for _, error in failures))
+        return len(saved)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                replayed = self.replay()
+            except Exception as e:
+                stats = self.journal.stats()
+                print(f"Order replay failed, {stats['depth']} order(s) queued, "
+                      f"oldest {stats['oldest_age']:.0f}s old: {e}")
+            else:
+                if replayed:
+                    print(f"Replayed {replayed} queued order(s) to the database")
@@ -0,0 +1,207 @@
+import numpy as np
+from Helpers.storage import get_storage
+from Helpers.order_archive import union_all, union_params
+
+ORDER_LINES_QUERY = union_all("""SELECT co.time_of_order, co.employee_username, mio.menuNo, mio.quantity, mio.total_price
+                       FROM {items} AS mio
+                       JOIN {orders} AS co ON co.order_id = mio.order_id
+                       WHERE co.time_of_order >= %s AND co.time_of_order < %s""")
+
+DIMENSIONS = ("hour", "weekday", "item", "employee")
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class SalesCube:
+    """
+    Revenue and quantity sold by hour of day x weekday x menu item x employee.
+
+    The order lines of a range are grouped once into two dense NumPy arrays with
+    a single vectorized bincount. Every report is then a sum over some of the
+    axes of those arrays, so it costs the size of the cube rather than the number
+    of order lines. Tags are an extra dimension worked out from the items, an item
+    with several tags counts towards each of them.
+
+    Attributes:
+        items (np.ndarray): Menu numbers along the item axis
+        employees (np.ndarray): Usernames along the employee axis
+        tags (list): Tags along the tag dimension
+        revenue (np.ndarray): Revenue, shape (24, 7, items, employees)
+        quantity (np.ndarray): Quantity sold, same shape as revenue
+    """
+
+    def __init__(self, times, employees, menu_numbers, quantities, revenues, item_tags: dict = None):
+        """
+        Group order lines into the cube.
+
+        Args:
+            times (array-like): Time of order of each line, datetimes or datetime64
+            employees (array-like): Employee username of each line
+            menu_numbers (array-like): Menu number of each line
+            quantities (array-like): Quantity of each line
+            revenues (array-like): Total price of each line
+            item_tags (dict, optional): Maps menu numbers to their list of tags
+        """
+        times = np.asarray(times, dtype="datetime64[s]")
+        days = times.astype("datetime64[D]")
+        hours = ((times - days) // np.timedelta64(1, "h")).astype(np.int64)
+        weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday, Monday is 0
+
+        self.items, item_codes = np.unique(np.asarray(menu_numbers, dtype=str), return_inverse=True)
+        self.employees, employee_codes = np.unique(np.asarray(employees, dtype=str), return_inverse=True)
+
+        shape = (24, 7, len(self.items), len(self.employees))
+        cell = np.ravel_multi_index((hours, weekdays, item_codes, employee_codes), shape)
+        size = int(np.prod(shape))
+        self.revenue = np.bincount(cell, weights=np.asarray(revenues, dtype=np.float64), minlength=size).reshape(shape)
+        self.quantity = np.bincount(cell, weights=np.asarray(quantities, dtype=np.float64), minlength=size).reshape(shape)
+
+        # Tag x item incidence matrix, multiplying by it turns item totals into tag totals
+        item_tags = item_tags or {}
+        self.tags = sorted({tag for item in self.items for tag in item_tags.get(item, ())})
+        tag_index = {tag: i for i, tag in enumerate(self.tags)}
+        self._tag_matrix = np.zeros((len(self.tags), len(self.items)))
+        for i, item in enumerate(self.items):
+            for tag in item_tags.get(item, ()):
+                self._tag_matrix[tag_index[tag], i] = 1.0
+
+    def labels(self, dimension: str) -> list:
+        """
+        Get the labels along a dimension.
+
+        Args:
+            dimension (str): "hour", "weekday", "item", "employee" or "tag"
+
+        Returns:
+            list: Hours 0-23, weekday names, menu numbers, usernames or tags
+        """
+        if dimension == "hour":
+            return list(range(24))
+        if dimension == "weekday":
+            return list(WEEKDAYS)
+        if dimension == "item":
+            return self.items.tolist()
+        if dimension == "employee":
+            return self.employees.tolist()
+        if dimension == "tag":
+            return list(self.tags)
+        raise ValueError(f"Unknown dimension '{dimension}'")
+
+    def by(self, *dimensions: str, measure: str = "revenue") -> np.ndarray:
+        """
+        Total a measure by one or more dimensions, summing over all the others.
+
+        Args:
+            dimensions (str): Any of "hour", "weekday", "item", "employee" and "tag", in the
+                              order the axes of the result should have. "tag" can't be combined with "item"
+            measure (str): "revenue" or "quantity"
+
+        Returns:
+            np.ndarray: One axis per dimension, a 0-d array of the grand total when none are given
+
+        Raises:
+            ValueError: If a dimension or the measure is unknown
+        """
+        cube = self._measure(measure)
+        with_tag = "tag" in dimensions
+        if with_tag and "item" in dimensions:
+            raise ValueError("Items and tags can't be combined, every tag already is a group of items")
+        for dimension in dimensions:
+            if dimension != "tag" and dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension '{dimension}'")
+
+        kept = [d for d in DIMENSIONS if d in dimensions or (with_tag and d == "item")]
+        totals = cube.sum(axis=tuple(i for i, d in enumerate(DIMENSIONS) if d not in kept))
+        if with_tag:
+            # Replace the item axis by the tag axis
+            item_axis = kept.index("item")
+            totals = np.moveaxis(np.tensordot(self._tag_matrix, totals, axes=([1], [item_axis])), 0, item_axis)
+            kept[item_axis] = "tag"
+        return np.transpose(totals, [kept.index(d) for d in dimensions])
+
+    def top(self, dimension: str, n: int = 10, measure: str = "revenue") -> list:
+        """
+        Get the best performing labels of a dimension.
+
+        Args:
+            dimension (str): The dimension to rank
+            n (int): Number of results
+            measure (str): "revenue" or "quantity"
+
+        Returns:
+            list: (label, total, percent of the grand total) tuples, highest first
+        """
+        totals = self.by(dimension, measure=measure)
+        grand_total = self._measure(measure).sum()
+        order = np.argsort(-totals, kind="stable")[:n]
+        labels = self.labels(dimension)
+        percents = self._percent(totals[order], grand_total)
+        return [(labels[i], float(totals[i]), float(p)) for i, p in zip(order, percents)]
+
+    def percent_of_total(self, *dimensions: str, measure: str = "revenue") -> np.ndarray:
+        """
+        Share of the grand total of each cell of by(*dimensions), as a percentage.
+
+        Tag shares can add up to more than 100 when items have several tags.
+        """
+        return self._percent(self.by(*dimensions, measure=measure), self._measure(measure).sum())
+
+    def _measure(self, measure: str) -> np.ndarray:
+        if measure == "revenue":
+            return self.revenue
+        if measure == "quantity":
+            return self.quantity
+        raise ValueError(f"Unknown measure '{measure}', expected 'revenue' or 'quantity'")
+
+    @staticmethod
+    def _percent(values: np.ndarray, total: float) -> np.ndarray:
+        return values * (100.0 / total) if total else np.zeros_like(values)
+
+
+def load_sales_cube(range_start, range_end, batch_size: int = 10000) -> SalesCube:
+    """
+    Load the order lines of a range into a SalesCube.
+
+    Lines are streamed from the database and copied into NumPy arrays batch by
+    batch, the row tuples of only one batch are held at a time.
+
+    Args:
+        range_start (datetime): Start of the range, inclusive
+        range_end (datetime): End of the range, exclusive
+        batch_size (int): Rows fetched per round trip
+
+    Returns:
+        SalesCube: The cube of the range
+
+    Raises:
+        ConnectionError: If database connection fails
+    """
+    storage = get_storage()
+    times, employees, menu_numbers, quantities, revenues = [], [], [], [], []
+    with storage.connection() as db:
+        cursor = db.cursor()
+        cursor.execute("SELECT menuNo, tag FROM menu_tags")
+        item_tags = {}
+        for menuNo, tag in cursor.fetchall():
+            item_tags.setdefault(menuNo, []).append(tag)
+        cursor.close()
+
+        cursor = storage.streaming_cursor(db)
+        try:
+            cursor.execute(ORDER_LINES_QUERY, union_params((range_start, range_end)))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                times.append(np.array(columns[0], dtype="datetime64[s]"))
+                employees.append(np.array([employee or "" for employee in columns[1]], dtype=str))
+                menu_numbers.append(np.array(columns[2], dtype=str))
+                quantities.append(np.array(columns[3], dtype=np.float64))
+                revenues.append(np.array(columns[4], dtype=np.float64))
+        finally:
+            cursor.close()
+
+    if not times:
+        return SalesCube([], [], [], [], [], item_tags)
+    return SalesCube(np.concatenate(times), np.concatenate(employees), np.concatenate(menu_numbers),
+                     np.concatenate(quantities), np.concatenate(revenues), item_tags)
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from Helpers.storage import get_storage
+from Helpers.order_archive import union_all, union_params, existing_order_tables
+from Classes.Money import Money
+
+# The pre-aggregated sales tables of Helpers.schema are added to in the same transaction
+# as each order is inserted. Reports read these instead of summing order lines, so a
+# range costs one row per day.
+
+# Orders of the rebuilt range together with their number of items, a union_all() branch
+_ORDERS_WITH_ITEMS = """
+        SELECT co.order_id, co.time_of_order, co.total_price,
+               COALESCE(co.employee_username, '') AS employee_username,
+               (SELECT COALESCE(SUM(mio.quantity), 0) FROM {items} AS mio
+                WHERE mio.order_id = co.order_id) AS items
+        FROM {orders} AS co
+        WHERE co.time_of_order >= %s AND co.time_of_order < %s"""
+
+# Order lines of the rebuilt range with the time of their order, a union_all() branch
+_LINES_WITH_TIMES = """
+        SELECT co.time_of_order, mio.menuNo, mio.quantity, mio.total_price
+        FROM {items} AS mio
+        JOIN {orders} AS co ON co.order_id = mio.order_id
+        WHERE co.time_of_order >= %s AND co.time_of_order < %s"""
+
+# Every query takes the range once per branch, see union_params(). The order tables
+# read are filled in by _rebuild_queries(), as the archive may not exist yet.
+_REBUILD_QUERIES = [
+    ("sales_daily", """INSERT INTO sales_daily (day, orders, items, revenue)
+        SELECT DATE(o.time_of_order), COUNT(*), SUM(o.items), SUM(o.total_price)
+        FROM {orders_with_items}
+        GROUP BY DATE(o.time_of_order)"""),
+    ("sales_hourly", """INSERT INTO sales_hourly (day, hour, orders, items, revenue)
+        SELECT DATE(o.time_of_order), HOUR(o.time_of_order), COUNT(*), SUM(o.items), SUM(o.total_price)
+        FROM {orders_with_items}
+        GROUP BY DATE(o.time_of_order), HOUR(o.time_of_order)"""),
+    ("sales_employee_daily", """INSERT INTO sales_employee_daily (day, employee_username, orders, items, revenue)
+        SELECT DATE(o.time_of_order), o.employee_username, COUNT(*), SUM(o.items), SUM(o.total_price)
+        FROM {orders_with_items}
+        GROUP BY DATE(o.time_of_order), o.employee_username"""),
+    ("sales_item_daily", """INSERT INTO sales_item_daily (day, menuNo, quantity, revenue)
+        SELECT DATE(l.time_of_order), l.menuNo, SUM(l.quantity), SUM(l.total_price)
+        FROM {lines_with_times}
+        GROUP BY DATE(l.time_of_order), l.menuNo"""),
+]
+
+def record_order(cursor, order) -> None:
+    """
+    Add an order to every rollup table using an open cursor without committing.
+
+    Args:
+        cursor: Cursor of the transaction that inserted the order
+        order (CustomerOrder): The order that was inserted
+    """
+    day = order.datetime.date()
+    hour = order.datetime.hour
+    revenue = order.totalprice
+    items = sum(item.quantity for item in order.menu_items)
+
+    storage = get_storage()
+    cursor.execute(storage.add_upsert("sales_daily", ["day"], ["orders", "items", "revenue"]),
+                   (day, 1, items, revenue))
+    cursor.execute(storage.add_upsert("sales_hourly", ["day", "hour"], ["orders", "items", "revenue"]),
+                   (day, hour, 1, items, revenue))
+    cursor.execute(storage.add_upsert("sales_employee_daily", ["day", "employee_username"], ["orders", "items", "revenue"]),
+                   (day, order.employeeID, 1, items, revenue))
+
+    per_item = {}
+    for item in order.menu_items:
+        quantity, total = per_item.get(item.menuNumber, (0, Money()))
+        per_item[item.menuNumber] = (quantity + item.quantity, total + item.total_price)
+    if per_item:
+        cursor.executemany(storage.add_upsert("sales_item_daily", ["day", "menuNo"], ["quantity", "revenue"]),
+                           [(day, menuNo, quantity, total) for menuNo, (quantity, total) in per_item.items()])
+
+def _rebuild_queries(tables: list) -> list:
+    """Get the (rollup table, query) pairs rebuilding the rollups from the given order tables."""
+    orders_with_items = "(" + union_all(_ORDERS_WITH_ITEMS, tables=tables) + "\n    ) AS o"
+    lines_with_times = "(" + union_all(_LINES_WITH_TIMES, tables=tables) + "\n    ) AS l"
+    return [(table, query.format(orders_with_items=orders_with_items, lines_with_times=lines_with_times))
+            for table, query in _REBUILD_QUERIES]
+
+def rebuild(cursor, range_start, range_end) -> None:
+    """
+    Recalculate the rollup rows of a range of days from the order tables without committing.
+
+    Args:
+        cursor: Cursor of the database connection
+        range_start (datetime): Midnight of the first day to rebuild
+        range_end (datetime): Midnight after the last day to rebuild
+    """
+    tables = existing_order_tables(cursor)
+    for table, query in _rebuild_queries(tables):
+        cursor.execute(f"DELETE FROM {table} WHERE day >= %s AND day < %s", (range_start.date(), range_end.date()))
+        cursor.execute(query, union_params((range_start, range_end), tables))
+
+def rebuild_all(cursor) -> None:
+    """Recalculate the rollup rows of every day that has orders without committing."""
+    # Read as plain columns so every backend returns them as datetimes
+    query = "SELECT time_of_order FROM {orders} WHERE time_of_order IS NOT NULL"
+    tables = existing_order_tables(cursor)
+    cursor.execute(union_all(query, order_by="time_of_order ASC", limit=1, tables=tables))
+    first = cursor.fetchone()
+    if first is None:
+        return
+    cursor.execute(union_all(query, order_by="time_of_order DESC", limit=1, tables=tables))
+    first, last = first[0], cursor.fetchone()[0]
+    range_start = datetime.combine(first.date(), datetime.min.time())
+    range_end = datetime.combine(last.date() + timedelta(days=1), datetime.min.time())
+    rebuild(cursor, range_start, range_end)
+
+def totals(cursor, first_day, last_day) -> tuple:
+    """
+    Sum the daily rollup over an inclusive range of days.
+
+    Returns:
+        tuple: (orders, items, revenue)
+    """
+    cursor.execute("""SELECT COALESCE(SUM(orders), 0), COALESCE(SUM(items), 0), COALESCE(SUM(revenue), 0)
+                      FROM sales_daily WHERE day >= %s AND day <= %s""", (first_day, last_day))
+    return cursor.fetchone()
+
+def hourly(cursor, first_day, last_day) -> list:
+    """
+    Get the sales of each hour of the day over an inclusive range of days.
+
+    Returns:
+        list: (hour, orders, items, revenue) tuples in hour order
+    """
+    cursor.execute("""SELECT hour, SUM(orders), SUM(items), SUM(revenue) FROM sales_hourly
+                      WHERE day >= %s AND day <= %s GROUP BY hour ORDER BY hour""", (first_day, last_day))
+    return cursor.fetchall()
+
+def by_item(cursor, first_day, last_day) -> list:
+    """
+    Get the sales of each menu item over an inclusive range of days, best selling first.
+
+    Returns:
+        list: (menuNo, quantity, revenue) tuples
+    """
+    cursor.execute("""SELECT menuNo, SUM(quantity), SUM(revenue) FROM sales_item_daily
+                      WHERE day >= %s AND day <= %s GROUP BY menuNo ORDER BY SUM(revenue) DESC""", (first_day, last_day))
+    return cursor.fetchall()
+
+def by_employee(cursor, first_day, last_day) -> list:
+    """
+    Get the sales taken by each employee over an inclusive range of days.
+
+    Returns:
+        list: (employee_username, orders, items, revenue) tuples, highest revenue first
+    """
+    cursor.execute("""SELECT employee_username, SUM(orders), SUM(items), SUM(revenue) FROM sales_employee_daily
+                      WHERE day >= %s AND day <= %s GROUP BY employee_username ORDER BY SUM(revenue) DESC""",
+                   (first_day, last_day))
+    return cursor.fetchall()
@@ -0,0 +1,245 @@
+# Tables of a MySQL database in the latest schema
+MYSQL_TABLES = [
+    """CREATE TABLE menu(  
+        menuNo VARCHAR(10) NOT NULL PRIMARY KEY COMMENT 'Primary Key',
+        name VARCHAR(255) NOT NULL,
+        price DECIMAL(4,2) NOT NULL CHECK (price >= 0)
+    ) COMMENT 'Table for storing menu items';""",
+
+    """CREATE TABLE menu_tags(
+        menuNo VARCHAR(10) NOT NULL,
+        tag VARCHAR(255) NOT NULL,
+        PRIMARY KEY (menuNo, tag),
+        INDEX idx_menu_tags_tag (tag, menuNo),
+        FOREIGN KEY (menuNo) REFERENCES menu(menuNo) ON DELETE CASCADE
+    ) COMMENT 'Tags of each menu item, one row per tag';""",
+    
+    """CREATE TABLE users(
+        name VARCHAR(255),
+        username VARCHAR(255) NOT NULL PRIMARY KEY,
+        password VARCHAR(128) NOT NULL,
+        permission_level INT NOT NULL
+    );""",
+    
+    """CREATE table Customer_Orders(
+        order_id INT AUTO_INCREMENT PRIMARY KEY,
+        employee_username VARCHAR(255),
+        time_of_order DATETIME,
+        total_price DECIMAL(10,2) CHECK (total_price >= 0),
+        total_no_of_items INT,
+        idempotency_key CHAR(36) NULL,
+        UNIQUE INDEX idx_customer_orders_idempotency_key (idempotency_key),
+        INDEX idx_customer_orders_time (time_of_order),
+        INDEX idx_customer_orders_employee (employee_username, time_of_order),
+        FOREIGN KEY (employee_username) REFERENCES users(username)
+    );""",
+    
+    """Create table Menu_Item_order(
+        order_item_id INT AUTO_INCREMENT PRIMARY KEY,
+        order_id INT NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        name VARCHAR(255),
+        unit_price DECIMAL(10,2),
+        quantity INT CHECK (quantity > 0),
+        total_price DECIMAL(10,2) CHECK (total_price >= 0),
+        modifications JSON CHECK (JSON_VALID(modifications)),
+        INDEX idx_menu_item_order_order (order_id),
+        FOREIGN KEY (order_id) REFERENCES Customer_Orders(order_id),
+        FOREIGN KEY (menuNo) REFERENCES menu(menuNo)
+    );""",
+    
+    """CREATE TABLE modifications (
+        modification_id INT PRIMARY KEY AUTO_INCREMENT,
+        modification_name VARCHAR(255) NOT NULL,
+        additional_cost DECIMAL(10, 2) DEFAULT 0.00,
+        tag_name VARCHAR(255) NOT NULL,
+        INDEX idx_modifications_tag (tag_name)
+    );"""
+]
+
+# Pre-aggregated sales, added to in the same transaction as each order is inserted.
+# Reports read these instead of summing order lines, so a range costs one row per day.
+MYSQL_ROLLUP_TABLES = [
+    """CREATE TABLE sales_daily(
+        day DATE NOT NULL PRIMARY KEY,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00
+    ) COMMENT 'Sales totals per day';""",
+
+    """CREATE TABLE sales_hourly(
+        day DATE NOT NULL,
+        hour TINYINT NOT NULL,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, hour)
+    ) COMMENT 'Sales totals per hour of each day';""",
+
+    """CREATE TABLE sales_item_daily(
+        day DATE NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        quantity INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, menuNo),
+        INDEX idx_sales_item_daily_item (menuNo, day)
+    ) COMMENT 'Sales of each menu item per day';""",
+
+    """CREATE TABLE sales_employee_daily(
+        day DATE NOT NULL,
+        employee_username VARCHAR(255) NOT NULL,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, employee_username)
+    ) COMMENT 'Sales taken by each employee per day';""",
+]
+
+# Orders moved out of Customer_Orders and Menu_Item_order by Helpers.order_archive.
+# Same columns as the live tables, without foreign keys or generated IDs.
+MYSQL_ARCHIVE_TABLES = [
+    """CREATE TABLE customer_orders_archive(
+        order_id INT NOT NULL PRIMARY KEY,
+        employee_username VARCHAR(255),
+        time_of_order DATETIME,
+        total_price DECIMAL(10,2),
+        total_no_of_items INT,
+        idempotency_key CHAR(36) NULL,
+        INDEX idx_customer_orders_archive_time (time_of_order),
+        INDEX idx_customer_orders_archive_idempotency_key (idempotency_key)
+    ) COMMENT 'Archived customer orders';""",
+
+    """CREATE TABLE menu_item_order_archive(
+        order_item_id INT NOT NULL PRIMARY KEY,
+        order_id INT NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        name VARCHAR(255),
+        unit_price DECIMAL(10,2),
+        quantity INT,
+        total_price DECIMAL(10,2),
+        modifications JSON,
+        INDEX idx_menu_item_order_archive_order (order_id)
+    ) COMMENT 'Order lines of archived customer orders';""",
+]
+
+# The same tables for an SQLite database. SQLite has no table comments or inline
+# indexes, so those are separate statements. Dates are stored as ISO 8601 text and
+# DECIMAL columns are read back as Decimal, like pymysql does, by Helpers.storage.
+SQLITE_TABLES = [
+    """CREATE TABLE menu(
+        menuNo VARCHAR(10) NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        price DECIMAL(4,2) NOT NULL CHECK (price >= 0)
+    );""",
+
+    """CREATE TABLE menu_tags(
+        menuNo VARCHAR(10) NOT NULL,
+        tag VARCHAR(255) NOT NULL,
+        PRIMARY KEY (menuNo, tag),
+        FOREIGN KEY (menuNo) REFERENCES menu(menuNo) ON DELETE CASCADE
+    );""",
+    "CREATE INDEX idx_menu_tags_tag ON menu_tags (tag, menuNo);",
+
+    """CREATE TABLE users(
+        name VARCHAR(255),
+        username VARCHAR(255) NOT NULL PRIMARY KEY,
+        password VARCHAR(128) NOT NULL,
+        permission_level INT NOT NULL
+    );""",
+
+    """CREATE TABLE Customer_Orders(
+        order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_username VARCHAR(255),
+        time_of_order DATETIME,
+        total_price DECIMAL(10,2) CHECK (total_price >= 0),
+        total_no_of_items INT,
+        idempotency_key CHAR(36) NULL,
+        FOREIGN KEY (employee_username) REFERENCES users(username)
+    );""",
+    "CREATE UNIQUE INDEX idx_customer_orders_idempotency_key ON Customer_Orders (idempotency_key);",
+    "CREATE INDEX idx_customer_orders_time ON Customer_Orders (time_of_order);",
+    "CREATE INDEX idx_customer_orders_employee ON Customer_Orders (employee_username, time_of_order);",
+
+    """CREATE TABLE Menu_Item_order(
+        order_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id INT NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        name VARCHAR(255),
+        unit_price DECIMAL(10,2),
+        quantity INT CHECK (quantity > 0),
+        total_price DECIMAL(10,2) CHECK (total_price >= 0),
+        modifications TEXT CHECK (json_valid(modifications)),
+        FOREIGN KEY (order_id) REFERENCES Customer_Orders(order_id),
+        FOREIGN KEY (menuNo) REFERENCES menu(menuNo)
+    );""",
+    "CREATE INDEX idx_menu_item_order_order ON Menu_Item_order (order_id);",
+
+    """CREATE TABLE modifications (
+        modification_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        modification_name VARCHAR(255) NOT NULL,
+        additional_cost DECIMAL(10, 2) DEFAULT 0.00,
+        tag_name VARCHAR(255) NOT NULL
+    );""",
+    "CREATE INDEX idx_modifications_tag ON modifications (tag_name);",
+]
+
+SQLITE_ROLLUP_TABLES = [
+    """CREATE TABLE sales_daily(
+        day DATE NOT NULL PRIMARY KEY,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00
+    );""",
+
+    """CREATE TABLE sales_hourly(
+        day DATE NOT NULL,
+        hour TINYINT NOT NULL,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, hour)
+    );""",
+
+    """CREATE TABLE sales_item_daily(
+        day DATE NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        quantity INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, menuNo)
+    );""",
+    "CREATE INDEX idx_sales_item_daily_item ON sales_item_daily (menuNo, day);",
+
+    """CREATE TABLE sales_employee_daily(
+        day DATE NOT NULL,
+        employee_username VARCHAR(255) NOT NULL,
+        orders INT NOT NULL DEFAULT 0,
+        items INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (day, employee_username)
+    );""",
+]
+
+SQLITE_ARCHIVE_TABLES = [
+    """CREATE TABLE customer_orders_archive(
+        order_id INTEGER NOT NULL PRIMARY KEY,
+        employee_username VARCHAR(255),
+        time_of_order DATETIME,
+        total_price DECIMAL(10,2),
+        total_no_of_items INT,
+        idempotency_key CHAR(36) NULL
+    );""",
+    "CREATE INDEX idx_customer_orders_archive_time ON customer_orders_archive (time_of_order);",
+    "CREATE INDEX idx_customer_orders_archive_idempotency_key ON customer_orders_archive (idempotency_key);",
+
+    """CREATE TABLE menu_item_order_archive(
+        order_item_id INTEGER NOT NULL PRIMARY KEY,
+        order_id INT NOT NULL,
+        menuNo VARCHAR(10) NOT NULL,
+        name VARCHAR(255),
+        unit_price DECIMAL(10,2),
+        quantity INT,
+        total_price DECIMAL(10,2),
+        modifications TEXT
+    );""",
+    "CREATE INDEX idx_menu_item_order_archive_order ON menu_item_order_archive (order_id);",
+]
@@ -0,0 +1,418 @@
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from dotenv import load_dotenv
+import Helpers.schema as schema
+from Classes.Money import Money
+
+# Load environment variables from .env file
+load_dotenv()
+
+class Storage:
+    """
+    A database the data layer can run on.
+
+    The data layer writes its SQL once with %s placeholders and standard SQL.
+    A backend supplies connections that accept it and the few statements that
+    differ between databases, such as upserts and ignoring duplicate keys.
+
+    Attributes:
+        name (str): Name of the backend, the value of DB_BACKEND selecting it
+        tables (list): CREATE statements of the tables in the latest schema
+        rollup_tables (list): CREATE statements of the sales rollup tables
+        archive_tables (list): CREATE statements of the order archive tables
+        insert_ignore (str): INSERT that skips rows with a duplicate key
+        update_ignore (str): UPDATE that skips rows that would get a duplicate key
+        connection_errors (tuple): Exceptions raised when the database becomes unreachable mid-call,
+                                   see is_connection_error()
+    """
+    name = None
+    tables = []
+    rollup_tables = []
+    archive_tables = []
+    insert_ignore = "INSERT IGNORE"
+    update_ignore = "UPDATE IGNORE"
+    connection_errors = ()
+
+    def connect(self):
+        """
+        Open a connection, close() must be called on it when done.
+
+        Returns:
+            Connection supporting cursor(), commit(), rollback() and close(), or None if
+            the database can't be reached
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager around connect() that always closes the connection.
+
+        Raises:
+            ConnectionError: If the database can't be reached
+        """
+        db = self.connect()
+        if not db:
+            raise ConnectionError("Failed to establish database connection.")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def streaming_cursor(self, connection):
+        """
+        Get a cursor that fetches rows from the database as they are read instead of all at once.
+
+        The cursor must be closed before the connection is used for anything else.
+        """
+        return connection.cursor()
+
+    def is_connection_error(self, error: Exception) -> bool:
+        """
+        Tell whether an error means the database couldn't be reached, rather than the statement failing.
+
+        Args:
+            error (Exception): The error raised by a call on a connection
+
+        Returns:
+            bool: True if the call may succeed later against the same database
+        """
+        return isinstance(error, self.connection_errors)
+
+    def add_upsert(self, table: str, key_columns: list, add_columns: list) -> str:
+        """
+        Build an INSERT that adds its values to an existing row with the same key.
+
+        Args:
+            table (str): Table to insert into
+            key_columns (list[str]): Columns of the primary key
+            add_columns (list[str]): Columns added to when the row exists
+
+        Returns:
+            str: Query taking the key values followed by the added values
+        """
+        raise NotImplementedError
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        """Check whether a column exists in a table."""
+        raise NotImplementedError
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        """Check whether an index with the given name exists on a table."""
+        raise NotImplementedError
+
+    def explain(self, cursor, query: str, params=None) -> list:
+        """
+        Get how the database would run a query.
+
+        Returns:
+            list: One dict per table read, with the keys "table", "type", "key"
+                  and "full_scan", True if the table is read without an index
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """
+        Get statistics of the backend's connections.
+
+        Returns:
+            dict: Backend specific counters
+        """
+        return {}
+
+    def close(self) -> None:
+        """Close every connection held by the backend."""
+
+
+class MySQLStorage(Storage):
+    """MySQL through the pooled pymysql connections of Helpers.db_connection."""
+    name = "mysql"
+    tables = schema.MYSQL_TABLES
+    rollup_tables = schema.MYSQL_ROLLUP_TABLES
+    archive_tables = schema.MYSQL_ARCHIVE_TABLES
+
+    def __init__(self):
+        # Imported here so the SQLite backend works without pymysql installed
+        import pymysql
+        from pymysql.constants import CR
+        import Helpers.db_connection as db_connection
+        # Write Money as the DECIMAL literal of its amount in pounds
+        pymysql.converters.conversions[Money] = lambda value, mapping=None: str(value)
+        self._db_connection = db_connection
+        self._unbuffered_cursor = pymysql.cursors.SSCursor
+        self.connection_errors = (pymysql.OperationalError, pymysql.InterfaceError)
+        # OperationalError is also raised for SQL, schema, lock and access errors of a server
+        # that was reached, only these client codes mean it couldn't be reached or went away
+        self._connection_lost_codes = (CR.CR_CONNECTION_ERROR, CR.CR_CONN_HOST_ERROR, CR.CR_SERVER_GONE_ERROR,
+                                       CR.CR_SERVER_LOST, CR.CR_SERVER_LOST_EXTENDED)
+        self._interface_error = pymysql.InterfaceError
+
+    def connect(self):
+        return self._db_connection.create_connection()
+
+    def is_connection_error(self, error: Exception) -> bool:
+        if isinstance(error, self._interface_error):
+            return True  # Raised by pymysql for a connection that is already closed
+        if not isinstance(error, self.connection_errors):
+            return False
+        return bool(error.args) and error.args[0] in self._connection_lost_codes
+
+    def streaming_cursor(self, connection):
+        # Unbuffered, rows stay on the server until fetched
+        return connection.cursor(self._unbuffered_cursor)
+
+    def add_upsert(self, table: str, key_columns: list, add_columns: list) -> str:
+        columns = list(key_columns) + list(add_columns)
+        updates = ", ".join(f"{column} = {column} + VALUES({column})" for column in add_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON DUPLICATE KEY UPDATE {updates}")
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        cursor.execute("""SELECT COUNT(*) FROM information_schema.columns
+                          WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s""", (table, column))
+        return cursor.fetchone()[0] > 0
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        cursor.execute("""SELECT COUNT(*) FROM information_schema.statistics
+                          WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s""", (table, index))
+        return cursor.fetchone()[0] > 0
+
+    def explain(self, cursor, query: str, params=None) -> list:
+        cursor.execute("EXPLAIN " + query.strip().rstrip(";"), params)
+        columns = [column[0].lower() for column in cursor.description]
+        plan = []
+        for row in cursor.fetchall():
+            step = dict(zip(columns, row))
+            table = step.get("table") or ""
+            # <derivedN> and <unionM,N> are the results of subqueries, not tables
+            plan.append({"table": step.get("table"), "type": step.get("type"), "key": step.get("key"),
+                         "full_scan": step.get("type") == "ALL" and not table.startswith("<")})
+        return plan
+
+    def stats(self) -> dict:
+        return self._db_connection.get_pool_stats()
+
+    def close(self) -> None:
+        self._db_connection.get_pool().close()
+
+
+@lru_cache(maxsize=256)
+def _to_qmark(query: str) -> str:
+    """Convert the %s placeholders pymysql uses into the ? placeholders of sqlite3."""
+    return re.sub(r"%%|%s", lambda match: "%" if match.group() == "%%" else "?", query)
+
+def _hour(value):
+    """HOUR() of MySQL for the ISO 8601 text SQLite stores datetimes as."""
+    return None if value is None else datetime.fromisoformat(value).hour
+
+# Store dates as ISO 8601 text and read DATETIME, DATE and DECIMAL columns back as
+# the same types pymysql returns, Money is stored as its amount in pounds. Datetimes keep whole seconds like MySQL's DATETIME.
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" ", "seconds"))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(Money, str)
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()))
+
+
+class SQLiteCursor:
+    """sqlite3 cursor accepting the %s placeholders and with-statement use of a pymysql cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+    def execute(self, query: str, params=None) -> int:
+        self._cursor.execute(_to_qmark(query), params or ())
+        return self._cursor.rowcount
+
+    def executemany(self, query: str, rows) -> int:
+        self._cursor.executemany(_to_qmark(query), rows)
+        return self._cursor.rowcount
+
+
+class SQLiteConnection:
+    """
+    A thread's connection to the SQLite database.
+
+    close() only rolls back anything left uncommitted, the connection stays open
+    for the next call on the same thread like a pooled MySQL connection.
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self._raw.cursor())
+
+    def commit(self) -> None:
+        self._raw.commit()
+
+    def rollback(self) -> None:
+        self._raw.rollback()
+
+    def close(self) -> None:
+        self._raw.rollback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SQLiteStorage(Storage):
+    """
+    An embedded SQLite database file, needing no server.
+
+    Each thread gets its own connection, opened on first use. The database runs
+    in WAL mode so the background replayer and the database workers can read
+    while another thread writes.
+    """
+    name = "sqlite"
+    tables = schema.SQLITE_TABLES
+    rollup_tables = schema.SQLITE_ROLLUP_TABLES
+    archive_tables = schema.SQLITE_ARCHIVE_TABLES
+    insert_ignore = "INSERT OR IGNORE"
+    update_ignore = "UPDATE OR IGNORE"
+    connection_errors = (sqlite3.OperationalError,)
+    # OperationalError is also raised for SQL and schema errors, only these mean the file is busy
+    _BUSY_CODES = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+    def __init__(self, path: str, timeout: float = 10.0):
+        """
+        Initialize the backend without opening the database.
+
+        Args:
+            path (str): Location of the database file, created if missing
+            timeout (float): Seconds to wait for another thread's write to finish
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened = []
+
+    def connect(self):
+        raw = getattr(self._local, "raw", None)
+        if raw is None:
+            try:
+                raw = sqlite3.connect(self.path, timeout=self.timeout, detect_types=sqlite3.PARSE_DECLTYPES)
+                raw.execute("PRAGMA foreign_keys = ON")
+                raw.execute("PRAGMA journal_mode = WAL")
+                raw.create_function("HOUR", 1, _hour, deterministic=True)
+            except sqlite3.Error as e:
+                print(f"Error opening the database: {e}")
+                return None
+            self._local.raw = raw
+            with self._lock:
+                self._opened.append(raw)
+        return SQLiteConnection(raw)
+
+    def is_connection_error(self, error: Exception) -> bool:
+        if not isinstance(error, self.connection_errors):
+            return False
+        code = getattr(error, "sqlite_errorcode", None)
+        if code is not None:
+            return code & 0xFF in self._BUSY_CODES  # Extended codes keep the primary code in the low byte
+        message = str(error).lower()
+        return "locked" in message or "busy" in message
+
+    def add_upsert(self, table: str, key_columns: list, add_columns: list) -> str:
+        columns = list(key_columns) + list(add_columns)
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in add_columns)
+        return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+                f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates}")
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1].lower() == column.lower() for row in cursor.fetchall())
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+                       (table, index))
+        return cursor.fetchone()[0] > 0
+
+    def explain(self, cursor, query: str, params=None) -> list:
+        cursor.execute("EXPLAIN QUERY PLAN " + query.strip().rstrip(";"), params)
+        plan = []
+        subqueries = set()
+        for row in cursor.fetchall():
+            # e.g. "SEARCH co USING INDEX idx_customer_orders_time (time_of_order>? AND time_of_order<?)"
+            words = row[3].split()
+            if words[0] in ("CO-ROUTINE", "MATERIALIZE"):
+                subqueries.add(words[1])  # Scanning the result of a subquery isn't a table scan
+            if words[0] not in ("SCAN", "SEARCH") or words[1] in subqueries:
+                continue  # Temporary b-trees and subquery markers
+            key = words[words.index("INDEX") + 1] if "INDEX" in words else None
+            plan.append({"table": words[1], "type": words[0], "key": key,
+                         "full_scan": words[0] == "SCAN" and key is None})
+        return plan
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"connections": len(self._opened)}
+
+    def close(self) -> None:
+        with self._lock:
+            for raw in self._opened:
+                try:
+                    raw.close()
+                except sqlite3.ProgrammingError:
+                    pass  # Opened by another thread, closed when that thread's connection is collected
+            self._opened = []
+        self._local = threading.local()
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def create_storage(backend: str = None) -> Storage:
+    """
+    Create the backend named by DB_BACKEND in the .env file.
+
+    Args:
+        backend (str, optional): "mysql" or "sqlite", overrides DB_BACKEND
+
+    Returns:
+        Storage: MySQLStorage by default, SQLiteStorage on the SQLITE_PATH file for "sqlite"
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = (backend or os.getenv("DB_BACKEND", "mysql")).lower()
+    if backend == "mysql":
+        return MySQLStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(os.getenv("SQLITE_PATH", "restaurant.db"),
+                             timeout=float(os.getenv("DB_POOL_TIMEOUT", 10)))
+    raise ValueError(f"Unknown DB_BACKEND '{backend}', expected 'mysql' or 'sqlite'")
+
+def get_storage() -> Storage:
+    """Get the storage backend shared by the whole application, created on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = create_storage()
+        return _storage
+
+def use_storage(storage: Storage) -> None:
+    """Replace the shared storage backend, e.g. to run a benchmark against another database."""
+    global _storage
+    with _storage_lock:
+        _storage = storage
@@ -0,0 +1,221 @@
+import sys
+import os
+import unittest
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Classes.Money import Money
+
+class TestCustomerOrder(unittest.TestCase):
+    """The running totals and the line index after each change to an order."""
+
+    def setUp(self):
+        self.egg_rice = MenuItems("1", "Egg Rice", 3.0, ["Rice"])
+        self.chow_mein = MenuItems("2", "Chicken Chow Mein", 5.5, ["Chicken", "Noodles"])
+        self.order = CustomerOrder("admin")
+
+    def assertTotals(self, pence: int, items: int):
+        self.assertEqual(self.order.totalprice, Money(pence))
+        self.assertEqual(self.order.total_items, items)
+        self.assertEqual(self.order.calculate_total(), Money(pence))
+        self.order.verify_totals()
+
+    def test_add_item(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.assertTotals(300, 1)
+        self.order.add_item(MenuItemOrder(self.chow_mein, 2))
+        self.assertTotals(1400, 3)
+        self.assertEqual(len(self.order.menu_items), 2)
+        self.assertIs(self.order.find_item("2"), self.order.menu_items[1])
+
+    def test_add_same_item_merges(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.assertTotals(600, 2)
+        self.assertEqual(len(self.order.menu_items), 1)
+        self.assertEqual(self.order.find_item("1").quantity, 2)
+
+    def test_add_item_with_other_modifications(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.order.add_item(MenuItemOrder(self.egg_rice, modifications={"Extra egg": 0.5}))
+        self.assertTotals(650, 2)
+        self.assertEqual(len(self.order.menu_items), 2)
+        self.assertEqual(self.order.find_item("1", {"Extra egg": 0.5}).total_price, Money(350))
+
+    def test_add_item_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            self.order.add_item(self.egg_rice)
+        self.assertTotals(0, 0)
+
+    def test_delete_item(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice, 2))
+        self.order.add_item(MenuItemOrder(self.chow_mein))
+        # Any line with the same item and modifications finds the one in the order
+        self.order.delete_item(MenuItemOrder(self.egg_rice))
+        self.assertTotals(850, 2)
+        self.assertEqual(self.order.find_item("1").quantity, 1)
+        self.order.delete_item(MenuItemOrder(self.egg_rice))
+        self.assertTotals(550, 1)
+        self.assertIsNone(self.order.find_item("1"))
+        with self.assertRaises(ValueError):
+            self.order.delete_item(MenuItemOrder(self.egg_rice))
+        self.assertTotals(550, 1)
+
+    def test_increment_and_decrement(self):
+        self.order.add_item(MenuItemOrder(self.chow_mein))
+        line = self.order.find_item("2")
+        line.increment_quantity()
+        self.assertTotals(1100, 2)
+        self.assertTrue(line.decrement_quantity())
+        self.assertTotals(550, 1)
+        self.assertFalse(line.decrement_quantity())
+        self.assertTotals(550, 1)
+        self.assertIs(self.order.find_item("2"), line)
+
+    def test_set_quantity_to_one(self):
+        self.order.add_item(MenuItemOrder(self.chow_mein, 3))
+        self.assertTotals(1650, 3)
+        self.order.find_item("2").set_quantity_to_one()
+        self.assertTotals(550, 1)
+
+    def test_add_and_remove_modification(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice, 2))
+        line = self.order.find_item("1")
+        line.add_modification("egg", 0.5, "Extra")
+        self.assertTotals(700, 2)
+        self.assertIsNone(self.order.find_item("1"))
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), line)
+
+        # Replaces the modification of the same thing
+        line.add_modification("egg", 0.0, "No")
+        self.assertTotals(600, 2)
+        self.assertIs(self.order.find_item("1", {"No egg": 0.0}), line)
+
+        line.remove_modification("No egg")
+        self.assertTotals(600, 2)
+        self.assertIs(self.order.find_item("1"), line)
+        with self.assertRaises(KeyError):
+            line.remove_modification("No egg")
+
+    def test_clear_order(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.order.add_item(MenuItemOrder(self.chow_mein, 2))
+        line = self.order.find_item("2")
+        self.order.clear_order()
+        self.assertTotals(0, 0)
+        self.assertEqual(self.order.menu_items, [])
+        self.assertIsNone(self.order.find_item("2"))
+
+        # A line taken out of the order no longer changes its totals
+        line.increment_quantity()
+        self.assertTotals(0, 0)
+
+    def test_constructed_with_items(self):
+        items = [MenuItemOrder(self.egg_rice, 2), MenuItemOrder(self.chow_mein)]
+        order = CustomerOrder("admin", menu_items=items)
+        self.assertEqual(order.totalprice, Money(1150))
+        self.assertEqual(order.total_items, 3)
+        items[1].increment_quantity()
+        self.assertEqual(order.totalprice, Money(1700))
+        order.verify_totals()
+
+    def test_get_items_by_tag(self):
+        self.order.add_item(MenuItemOrder(self.egg_rice))
+        self.order.add_item(MenuItemOrder(self.chow_mein))
+        self.assertEqual(self.order.get_items_by_tag("Noodles"), [self.order.find_item("2")])
+        self.assertEqual(self.order.get_items_by_tag("Beef"), [])
+
+class TestLineIndex(unittest.TestCase):
+    """Lines whose modifications are changed until they share a key with another line."""
+
+    def setUp(self):
+        self.menu_item = MenuItems("1", "Egg Rice", 3.0)
+        self.order = CustomerOrder("admin")
+        self.plain = MenuItemOrder(self.menu_item)
+        self.extra = MenuItemOrder(self.menu_item, modifications={"Extra egg": 0.5})
+        self.order.add_item(self.plain)
+        self.order.add_item(self.extra)
+        # The plain line now has the same key as the other one
+        self.plain.add_modification("egg", 0.5, "Extra")
+
+    def test_both_lines_stay_in_order(self):
+        self.assertEqual(len(self.order.menu_items), 2)
+        self.assertEqual(self.order.totalprice, Money(700))
+        self.assertEqual(self.order.total_items, 2)
+        self.order.verify_totals()
+
+    def test_delete_each_line(self):
+        self.order.delete_item(self.extra)
+        self.assertEqual(self.order.menu_items, [self.plain])
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), self.plain)
+
+        self.order.delete_item(self.plain)
+        self.assertEqual(self.order.menu_items, [])
+        self.assertIsNone(self.order.find_item("1", {"Extra egg": 0.5}))
+        self.assertEqual(self.order.totalprice, Money())
+        self.assertEqual(self.order.total_items, 0)
+
+    def test_delete_removes_the_given_line(self):
+        self.order.delete_item(self.plain)
+        self.assertEqual(self.order.menu_items, [self.extra])
+        self.assertIsNone(self.plain._order)
+        self.order.verify_totals()
+
+    def test_readding_merges_into_remaining_line(self):
+        self.order.delete_item(self.extra)
+        self.order.add_item(MenuItemOrder(self.menu_item, modifications={"Extra egg": 0.5}))
+        self.assertEqual(self.order.menu_items, [self.plain])
+        self.assertEqual(self.plain.quantity, 2)
+        self.assertEqual(self.order.total_items, 2)
+        self.order.verify_totals()
+
+    def test_changing_back_reindexes_line(self):
+        self.plain.remove_modification("Extra egg")
+        self.assertIs(self.order.find_item("1"), self.plain)
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), self.extra)
+        self.order.verify_totals()
+
+    def test_three_lines_sharing_key(self):
+        third = MenuItemOrder(self.menu_item, modifications={"No egg": 0.0})
+        self.order.add_item(third)
+        third.add_modification("egg", 0.5, "Extra")
+        # The line that had the key first
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), self.extra)
+
+        self.order.delete_item(self.extra)
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), self.plain)
+        self.order.delete_item(MenuItemOrder(self.menu_item, modifications={"Extra egg": 0.5}))
+        self.assertIs(self.order.find_item("1", {"Extra egg": 0.5}), third)
+        self.order.delete_item(third)
+        self.assertIsNone(self.order.find_item("1", {"Extra egg": 0.5}))
+        self.assertEqual(self.order.menu_items, [])
+        self.order.verify_totals()
+
+class TestLineOrder(unittest.TestCase):
+    """The lines keep the order they were added in through deletes."""
+
+    def test_delete_keeps_order(self):
+        order = CustomerOrder("admin")
+        lines = [MenuItemOrder(MenuItems(str(number), f"Dish {number}", 1.0)) for number in range(1, 1001)]
+        for line in lines:
+            order.add_item(line)
+        for line in lines[::2]:
+            order.delete_item(line)
+        self.assertEqual(order.menu_items, lines[1::2])
+        self.assertEqual(order.total_items, 500)
+        order.add_item(lines[0])
+        self.assertIs(order.menu_items[-1], lines[0])
+        order.verify_totals()
+
+    def test_menu_items_is_a_copy(self):
+        order = CustomerOrder("admin")
+        order.add_item(MenuItemOrder(MenuItems("1", "Egg Rice", 3.0)))
+        order.menu_items.clear()
+        self.assertEqual(len(order.menu_items), 1)
+
+if __name__ == "__main__":
+    unittest.main()
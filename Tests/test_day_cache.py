@@ -0,0 +1,111 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Helpers.day_cache import DayCache
+
+TODAY = date(2024, 6, 10)
+CLOSED_DAY = date(2024, 6, 9)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestDayCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.versions = {CLOSED_DAY: [3, 5, 1250]}
+        self.version_reads = 0
+        self.fetches = 0
+        self.unreachable = False
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def version(self, day):
+        self.version_reads += 1
+        if self.unreachable:
+            raise ConnectionError("Failed to establish database connection.")
+        return self.versions.get(day)
+
+    def cache(self, **kwargs):
+        return DayCache(capacity=2, today=lambda: TODAY, version=self.version, check_interval=30,
+                        clock=self.clock, **kwargs)
+
+    def fetch(self):
+        self.fetches += 1
+        return [["order", self.fetches]]
+
+    def test_closed_day_cached(self):
+        cache = self.cache()
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(self.version_reads, 1)
+
+    def test_today_never_cached(self):
+        cache = self.cache()
+        cache.get(TODAY, "orders", self.fetch)
+        cache.get(TODAY, "orders", self.fetch)
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(self.version_reads, 0)
+
+    def test_changed_version_refetched(self):
+        cache = self.cache()
+        cache.get(CLOSED_DAY, "orders", self.fetch)
+        # Another process saves an order of the day
+        self.versions[CLOSED_DAY] = [4, 6, 1600]
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+
+        self.clock.now = 30
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 2]])
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 2]])
+        self.assertEqual(cache.stats()["stale"], 1)
+
+    def test_unchanged_version_kept(self):
+        cache = self.cache()
+        cache.get(CLOSED_DAY, "orders", self.fetch)
+        self.clock.now = 60
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+        self.assertEqual(self.version_reads, 2)
+        self.assertEqual(cache.stats()["stale"], 0)
+
+    def test_disk_results_checked_after_restart(self):
+        self.cache(directory=self.directory).get(CLOSED_DAY, "orders", self.fetch)
+
+        restarted = self.cache(directory=self.directory)
+        self.assertEqual(restarted.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+        self.assertEqual(restarted.stats()["disk_hits"], 1)
+
+        self.versions[CLOSED_DAY] = [4, 6, 1600]
+        restarted = self.cache(directory=self.directory)
+        self.assertEqual(restarted.get(CLOSED_DAY, "orders", self.fetch), [["order", 2]])
+        self.assertEqual(restarted.stats()["stale"], 1)
+
+    def test_unreadable_version_uses_cached_results(self):
+        cache = self.cache()
+        cache.get(CLOSED_DAY, "orders", self.fetch)
+        self.clock.now = 30
+        self.unreachable = True
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 1]])
+        self.assertEqual(self.fetches, 1)
+
+    def test_invalidate(self):
+        cache = self.cache(directory=self.directory)
+        cache.get(CLOSED_DAY, "orders", self.fetch)
+        cache.invalidate(CLOSED_DAY)
+        self.assertEqual(cache.get(CLOSED_DAY, "orders", self.fetch), [["order", 2]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+import pymysql
+from Helpers.db_connection import ConnectionPool, PoolTimeoutError
+
+class FakeConnection:
+    """Stands in for a pymysql connection, no server needed."""
+
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=True):
+        if not self.alive:
+            raise pymysql.err.OperationalError(2006, "MySQL server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.opened.append(connection)
+        return connection
+
+    def test_prefills_min_size(self):
+        pool = ConnectionPool(self.connect, min_size=2, max_size=4)
+        self.assertEqual(len(self.opened), 2)
+        self.assertEqual((pool.stats()["size"], pool.stats()["idle"]), (2, 2))
+
+    def test_released_connection_reused(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=2)
+        first = pool.acquire()
+        raw = first._raw
+        first.close()
+        self.assertEqual(raw.rollbacks, 1)
+        with pool.connection() as second:
+            self.assertIs(second._raw, raw)
+            self.assertEqual(pool.stats()["in_use"], 1)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.stats()["checkouts"], 2)
+
+    def test_closed_connection_unusable(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1)
+        connection = pool.acquire()
+        connection.close()
+        connection.close()  # Returning it twice must not hand it out twice
+        self.assertEqual(pool.stats()["idle"], 1)
+        with self.assertRaises(pymysql.err.InterfaceError):
+            connection.cursor()
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=2, checkout_timeout=0.05)
+        held = [pool.acquire(), pool.acquire()]
+        started = time.monotonic()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(len(self.opened), 2)
+        self.assertEqual(pool.stats()["waits"], 1)
+        for connection in held:
+            connection.close()
+
+    def test_waiting_checkout_gets_released_connection(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1, checkout_timeout=5)
+        held = pool.acquire()
+        releaser = threading.Timer(0.05, held.close)
+        releaser.start()
+        with pool.connection() as connection:
+            self.assertIs(connection._raw, self.opened[0])
+        releaser.join()
+        self.assertEqual(pool.stats()["waits"], 1)
+
+    def test_dead_idle_connection_replaced(self):
+        pool = ConnectionPool(self.connect, min_size=1, max_size=1)
+        self.opened[0].alive = False
+        with pool.connection() as connection:
+            self.assertIs(connection._raw, self.opened[1])
+        self.assertTrue(self.opened[0].closed)
+        self.assertEqual(pool.stats()["failed_health_checks"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_failed_connect_frees_slot(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=1, checkout_timeout=0.05)
+        def refuse():
+            raise pymysql.err.OperationalError(2003, "Can't connect to MySQL server")
+        pool._connect = refuse
+        with self.assertRaises(pymysql.err.OperationalError):
+            pool.acquire()
+        pool._connect = self.connect
+        with pool.connection() as connection:
+            self.assertIs(connection._raw, self.opened[0])
+
+    def test_idle_connections_above_min_size_expire(self):
+        pool = ConnectionPool(self.connect, min_size=1, max_size=3, idle_timeout=0)
+        held = [pool.acquire(), pool.acquire(), pool.acquire()]
+        for connection in held:
+            connection.close()
+        time.sleep(0.01)
+        pool.acquire().close()
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual(sum(connection.closed for connection in self.opened), 2)
+
+    def test_invalid_sizes(self):
+        for min_size, max_size in ((0, 0), (-1, 2), (3, 2)):
+            with self.subTest(min_size=min_size, max_size=max_size):
+                with self.assertRaises(ValueError):
+                    ConnectionPool(self.connect, min_size=min_size, max_size=max_size)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Helpers.db_executor import DBExecutor
+
+class FakeRoot:
+    """Collects root.after calls so the test plays the part of the Tk main loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def run_until_idle(self, timeout: float = 5) -> None:
+        deadline = time.monotonic() + timeout
+        while self.scheduled:
+            if time.monotonic() > deadline:
+                raise AssertionError("Executor still polling")
+            self.scheduled.pop(0)()
+            time.sleep(0.001)
+
+
+class FakeWidget:
+    def __init__(self):
+        self.exists = True
+
+    def winfo_exists(self):
+        return self.exists
+
+
+class TestDBExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.busy = []
+        self.executor = DBExecutor(self.root, poll_interval=1, on_busy=self.busy.append)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_result_delivered_on_main_thread(self):
+        results = []
+        def work(a, b=0):
+            results.append(threading.current_thread())
+            return a + b
+        self.executor.submit(work, 1, b=2, on_success=lambda value: results.append((value, threading.current_thread())))
+        self.root.run_until_idle()
+        self.assertIsNot(results[0], threading.main_thread())
+        self.assertEqual(results[1], (3, threading.main_thread()))
+        self.assertEqual(self.busy, [True, False])
+
+    def test_error_delivered(self):
+        errors = []
+        def fail():
+            raise ConnectionError("Failed to establish database connection.")
+        task = self.executor.submit(fail, on_success=self.fail, on_error=errors.append)
+        self.root.run_until_idle()
+        self.assertIsInstance(errors[0], ConnectionError)
+        self.assertTrue(task.done)
+
+    def test_error_without_handler_printed(self):
+        def fail():
+            raise ValueError("boom")
+        with redirect_stdout(None):
+            self.executor.submit(fail)
+            self.root.run_until_idle()
+        self.assertEqual(self.busy, [True, False])
+
+    def test_cancelled_task_not_delivered(self):
+        started = threading.Event()
+        release = threading.Event()
+        def slow():
+            started.set()
+            release.wait(5)
+            return "late"
+        task = self.executor.submit(slow, on_success=self.fail)
+        started.wait(5)
+        self.assertTrue(task.cancel())
+        release.set()
+        self.root.run_until_idle()
+        self.assertTrue(task.done)
+        self.assertFalse(task.cancel())
+
+    def test_destroyed_owner_skipped(self):
+        owner = FakeWidget()
+        self.executor.submit(lambda: 1, on_success=self.fail, owner=owner)
+        owner.exists = False
+        self.root.run_until_idle()
+
+    def test_failing_callback_does_not_stop_delivery(self):
+        results = []
+        def broken(value):
+            raise RuntimeError("callback")
+        with redirect_stdout(None):
+            self.executor.submit(lambda: 1, on_success=broken)
+            self.executor.submit(lambda: 2, on_success=results.append)
+            self.root.run_until_idle()
+        self.assertEqual(results, [2])
+        self.assertEqual(self.busy, [True, False])
+
+    def test_submit_from_worker_thread_rejected(self):
+        errors = []
+        thread = threading.Thread(target=lambda: errors.append(self.raises(self.executor.submit, lambda: 1)))
+        thread.start()
+        thread.join()
+        self.assertIsInstance(errors[0], RuntimeError)
+
+    @staticmethod
+    def raises(fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            return e
+        return None
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import os
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Classes.Money import Money
+from Helpers import live_sales
+from Helpers.live_sales import LiveSales
+
+TODAY = datetime(2024, 5, 3)
+
+def order(hour: int, *lines, day: datetime = TODAY) -> CustomerOrder:
+    """An order of (menuNumber, price, quantity) lines."""
+    return CustomerOrder("admin", menu_items=[MenuItemOrder(MenuItems(number, f"Item {number}", price), quantity)
+                                              for number, price, quantity in lines],
+                         date_time=day.replace(hour=hour))
+
+class TestLiveSales(unittest.TestCase):
+
+    def setUp(self):
+        self.sales = LiveSales(top_k=2)
+        patcher = mock.patch.object(live_sales, "datetime", wraps=datetime)
+        self.clock = patcher.start()
+        self.clock.now.return_value = TODAY.replace(hour=13, minute=30)
+        self.addCleanup(patcher.stop)
+
+    def test_totals(self):
+        self.sales.record(order(12, ("1", 3.0, 2), ("2", 1.5, 1)))
+        self.sales.record(order(13, ("1", 3.0, 1)))
+        snapshot = self.sales.snapshot(hours=3)
+        self.assertEqual(snapshot["day"], TODAY.date())
+        self.assertEqual((snapshot["orders"], snapshot["items"]), (2, 4))
+        self.assertEqual(snapshot["revenue"], Money.of(10.5))
+        self.assertEqual(snapshot["average_order"], Money.of(5.25))
+        self.assertEqual(snapshot["hours"], [(11, 0, 0, Money()), (12, 1, 3, Money.of(7.5)), (13, 1, 1, Money.of(3.0))])
+        self.assertEqual(self.sales.version, 2)
+
+    def test_top_items(self):
+        self.sales.record(order(12, ("1", 3.0, 1), ("2", 1.5, 2), ("3", 2.0, 3)))
+        self.assertEqual([entry[0] for entry in self.sales.snapshot()["top"]], ["3", "2"])
+        self.sales.record(order(12, ("1", 3.0, 3)))
+        self.assertEqual([(entry[0], entry[2]) for entry in self.sales.snapshot()["top"]], [("1", 4), ("3", 3)])
+        self.assertEqual(self.sales.snapshot()["top"][0][3], Money.of(12.0))
+
+    def test_new_day_starts_again(self):
+        self.sales.record(order(12, ("1", 3.0, 1), day=datetime(2024, 5, 2)))
+        self.sales.record(order(13, ("2", 1.5, 1)))
+        snapshot = self.sales.snapshot()
+        self.assertEqual((snapshot["day"], snapshot["orders"], snapshot["revenue"]), (TODAY.date(), 1, Money.of(1.5)))
+        self.assertEqual([entry[0] for entry in snapshot["top"]], ["2"])
+        # An order of yesterday replayed late is left out
+        self.sales.record(order(12, ("1", 3.0, 1), day=datetime(2024, 5, 2)))
+        self.assertEqual(self.sales.snapshot()["orders"], 1)
+
+    def test_hour_of_previous_day_not_shown(self):
+        self.sales.record(order(13, ("1", 3.0, 1), day=datetime(2024, 5, 2)))
+        self.sales.record(order(9, ("1", 3.0, 1)))
+        self.assertEqual(self.sales.snapshot(hours=1)["hours"], [(13, 0, 0, Money())])
+
+    def test_seed(self):
+        version = self.sales.version
+        self.assertTrue(self.sales.seed(TODAY.date(), {"orders": 2, "items": 3, "revenue": 7.5},
+                                        [(12, 2, 3, 7.5)], [("1", 2, 6.0), ("2", 1, 1.5)], {"1": "Egg Rice"}, version))
+        self.sales.record(order(13, ("2", 1.5, 2)))
+        snapshot = self.sales.snapshot(hours=2)
+        self.assertEqual((snapshot["orders"], snapshot["items"], snapshot["revenue"]), (3, 5, Money.of(10.5)))
+        self.assertEqual(snapshot["hours"][0], (12, 2, 3, Money.of(7.5)))
+        self.assertEqual([(entry[0], entry[1], entry[2]) for entry in snapshot["top"]],
+                         [("2", "2", 3), ("1", "Egg Rice", 2)])  # Seeded without a name
+
+    def test_seed_skipped_after_order_recorded(self):
+        version = self.sales.version
+        self.sales.record(order(13, ("1", 3.0, 1)))
+        self.assertFalse(self.sales.seed(date(2024, 5, 3), {"orders": 0, "items": 0, "revenue": 0}, [], [],
+                                         version=version))
+        self.assertEqual(self.sales.snapshot()["orders"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import os
+import unittest
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.MenuItems import MenuItems
+from Helpers.menu_catalog import MenuCatalog, menu_sort_key
+from Helpers.menu_search import (MenuSearchIndex, prefix_distance, EXACT_NUMBER, NUMBER_PREFIX, NAME_PREFIX,
+                                 WORD_PREFIX, SUBSTRING, TYPO)
+
+MENU = [("1", "Egg Fried Rice"), ("2", "Chicken Chow Mein"), ("12", "Salt and Pepper Chicken"),
+        ("12a", "Chicken Curry"), ("3", "Spring Rolls")]
+
+class TestPrefixDistance(unittest.TestCase):
+
+    def test_distances(self):
+        self.assertEqual(prefix_distance("chick", "chicken", 2), 0)
+        self.assertEqual(prefix_distance("chikcen", "chicken", 2), 1)  # Swapped letters
+        self.assertEqual(prefix_distance("chiken", "chicken", 2), 1)
+        self.assertEqual(prefix_distance("pepper", "chicken", 2), 3)
+
+
+class TestMenuSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = MenuSearchIndex(sort_key=menu_sort_key)
+        for number, name in MENU:
+            self.index.add(number, number, name)
+
+    def test_ranks(self):
+        self.assertEqual(self.index.search("12"), [(EXACT_NUMBER, "12"), (NUMBER_PREFIX, "12a")])
+        self.assertEqual(self.index.search("chicken"), [(NAME_PREFIX, "2"), (NAME_PREFIX, "12a"), (WORD_PREFIX, "12")])
+        self.assertEqual(self.index.search("ick"), [(SUBSTRING, "2"), (SUBSTRING, "12"), (SUBSTRING, "12a")])
+        self.assertEqual(self.index.search("chiken"), [(TYPO, "2"), (TYPO, "12"), (TYPO, "12a")])
+
+    def test_every_word_has_to_match(self):
+        self.assertEqual(self.index.search("chicken curry"), [(WORD_PREFIX, "12a")])  # Ranked by the weakest word
+        self.assertEqual(self.index.search("rice rolls"), [])
+        self.assertEqual(self.index.search("  "), [])
+
+    def test_limit(self):
+        self.assertEqual(self.index.search("chicken", limit=1), [(NAME_PREFIX, "2")])
+
+    def test_replace_and_remove(self):
+        self.index.add("3", "3", "Crispy Seaweed")
+        self.assertEqual(self.index.search("spring"), [])
+        self.assertEqual(self.index.search("seaweed"), [(WORD_PREFIX, "3")])
+        self.index.remove("3")
+        self.index.remove("3")
+        self.assertEqual(self.index.search("seaweed"), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_removing_last_item_drops_its_words(self):
+        for number, _ in MENU:
+            self.index.remove(number)
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual((self.index._root.children, self.index._term_keys, self.index._grams), ({}, {}, {}))
+
+
+class TestMenuCatalogSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.menu = [MenuItems(number, name, 5.0, ["Chicken"] if "Chicken" in name else None) for number, name in MENU]
+        self.loads = 0
+        self.catalog = MenuCatalog(self.load)
+
+    def load(self):
+        self.loads += 1
+        return list(self.menu)
+
+    def numbers(self, text: str) -> list:
+        return [item.menuNumber for item in self.catalog.search(text)]
+
+    def test_upsert_updates_search(self):
+        self.assertEqual(self.numbers("curry"), ["12a"])
+        self.catalog.upsert(MenuItems("12a", "Chicken Korma", 5.5, ["Chicken"]))
+        self.assertEqual(self.numbers("curry"), [])
+        self.assertEqual(self.numbers("korma"), ["12a"])
+        self.catalog.upsert(MenuItems("4", "Beef Curry", 6.0))
+        self.assertEqual(self.numbers("curry"), ["4"])
+        self.assertEqual(self.loads, 1)
+
+    def test_upsert_before_load_is_left_to_load(self):
+        self.menu.append(MenuItems("4", "Beef Curry", 6.0))
+        self.catalog.upsert(self.menu[-1])
+        self.assertEqual(self.numbers("beef"), ["4"])
+        self.assertEqual(self.loads, 1)
+
+    def test_tag_changes_keep_search(self):
+        self.assertEqual(self.numbers("chow"), ["2"])
+        self.catalog.rename_tags({"Chicken": "Poultry"})
+        self.assertEqual(self.numbers("chow"), ["2"])
+        self.assertEqual([item.menuNumber for item in self.catalog.items_with_tag("Poultry")], ["2", "12", "12a"])
+
+    def test_invalidate_reloads_search(self):
+        self.assertEqual(self.numbers("seaweed"), [])
+        self.menu.append(MenuItems("5", "Crispy Seaweed", 3.0))
+        self.assertEqual(self.numbers("seaweed"), [])
+        self.catalog.invalidate()
+        self.assertEqual(self.numbers("seaweed"), ["5"])
+        self.assertEqual(self.loads, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import os
+import unittest
+from decimal import Decimal
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.Money import Money
+
+class TestMoneyOf(unittest.TestCase):
+
+    def test_rounds_half_pennies_up(self):
+        self.assertEqual(Money.of("2.675").pence, 268)
+        self.assertEqual(Money.of("2.665").pence, 267)
+        self.assertEqual(Money.of("-2.675").pence, -268)
+
+    def test_float_read_as_written(self):
+        # 2.675 is 2.67499999... as a binary float
+        self.assertEqual(Money.of(2.675).pence, 268)
+        self.assertEqual(Money.of(0.1).pence + Money.of(0.2).pence, 30)
+
+    def test_other_types(self):
+        self.assertEqual(Money.of(3).pence, 300)
+        self.assertEqual(Money.of(Decimal("4.50")).pence, 450)
+        self.assertEqual(Money.of(" 1.5 ").pence, 150)
+        money = Money(125)
+        self.assertIs(Money.of(money), money)
+
+    def test_rejects_non_amounts(self):
+        for value in (None, True, "abc", "", "NaN", float("inf")):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    Money.of(value)
+
+    def test_constructor_takes_pence(self):
+        self.assertEqual(Money().pence, 0)
+        for value in (1.5, "150", Decimal(1), True):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    Money(value)
+
+class TestMoneyArithmetic(unittest.TestCase):
+
+    def test_add_and_subtract(self):
+        self.assertEqual(Money(150) + Money(275), Money(425))
+        self.assertEqual(Money(150) - Money(275), Money(-125))
+        self.assertEqual(-Money(150), Money(-150))
+
+    def test_sum(self):
+        self.assertEqual(sum([Money(10), Money(20), Money(30)]), Money(60))
+        self.assertEqual(sum([], Money()), Money())
+
+    def test_multiply_by_quantity(self):
+        self.assertEqual(Money(350) * 3, Money(1050))
+        self.assertEqual(3 * Money(350), Money(1050))
+
+    def test_rejects_other_operands(self):
+        for operation in (lambda: Money(100) + 1.5, lambda: Money(100) + 1, lambda: Money(100) - 0,
+                          lambda: Money(100) * 1.5, lambda: Money(100) * True, lambda: Money(100) * Money(2)):
+            with self.assertRaises(TypeError):
+                operation()
+
+class TestMoneyConversions(unittest.TestCase):
+
+    def test_format(self):
+        self.assertEqual(f"£{Money(1250):.2f}", "£12.50")
+        self.assertEqual(f"{Money(5):>8.2f}", "    0.05")
+        self.assertEqual(f"{Money(-125):.1f}", "-1.2")
+        self.assertEqual(f"{Money(123456):,.2f}", "1,234.56")
+
+    def test_str_and_repr(self):
+        self.assertEqual(str(Money(705)), "7.05")
+        self.assertEqual(str(Money(-5)), "-0.05")
+        self.assertEqual(repr(Money(705)), "Money('7.05')")
+
+    def test_decimal_and_float(self):
+        self.assertEqual(Money(705).to_decimal(), Decimal("7.05"))
+        self.assertEqual(str(Money(700).to_decimal()), "7.00")
+        self.assertEqual(float(Money(705)), 7.05)
+
+    def test_bool(self):
+        self.assertFalse(Money())
+        self.assertTrue(Money(1))
+
+class TestMoneyComparison(unittest.TestCase):
+
+    def test_compares_with_money(self):
+        self.assertEqual(Money.of("1.10"), Money(110))
+        self.assertLess(Money(100), Money(101))
+        self.assertGreaterEqual(Money(101), Money(101))
+        self.assertEqual(max(Money(5), Money(500), Money(50)), Money(500))
+
+    def test_not_equal_to_other_types(self):
+        for value in (110, 1.1, Decimal("1.10"), "1.10", None):
+            with self.subTest(value=value):
+                self.assertNotEqual(Money(110), value)
+                self.assertFalse(Money(110) == value)
+
+    def test_ordering_other_types_raises(self):
+        for value in (100, 1.0, Decimal("1.00"), None):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    Money(100) < value
+                with self.assertRaises(TypeError):
+                    Money(100) >= value
+
+    def test_hash(self):
+        self.assertEqual(hash(Money.of("2.50")), hash(Money(250)))
+        self.assertEqual(len({Money(250), Money.of(2.5), Money(100)}), 2)
+
+if __name__ == "__main__":
+    unittest.main()
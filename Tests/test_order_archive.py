@@ -0,0 +1,115 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+import gui_functions
+from admin_setup import setup_database
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Helpers.order_archive import archive_orders, union_all, union_params
+from Helpers.storage import SQLiteStorage, use_storage
+
+class TestArchiveOrders(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.directory, "restaurant.db"))
+        use_storage(self.storage)
+        with redirect_stdout(None):
+            setup_database()
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            cursor.execute("INSERT INTO users (name, username, password, permission_level) VALUES ('Owner', 'admin', 'x', 1)")
+            cursor.execute("INSERT INTO menu (menuNo, name, price) VALUES ('1', 'Egg Rice', 3.0)")
+            db.commit()
+        finally:
+            db.close()
+
+    def tearDown(self):
+        use_storage(None)
+        self.storage.close()
+        shutil.rmtree(self.directory)
+
+    def save_orders(self, *times) -> list:
+        """Save an order at each time in one transaction, returning their order_ids."""
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            order_ids = [gui_functions.insert_order(cursor, CustomerOrder(
+                "admin", menu_items=[MenuItemOrder(MenuItems("1", "Egg Rice", 3.0))], date_time=time))
+                for time in times]
+            db.commit()
+            return order_ids
+        finally:
+            db.close()
+
+    def query(self, query: str, params=()) -> list:
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            db.commit()
+            return rows
+        finally:
+            db.close()
+
+    def live_order_ids(self) -> list:
+        return [row[0] for row in self.query("SELECT order_id FROM Customer_Orders ORDER BY order_id")]
+
+    def test_archives_orders_before_cutoff(self):
+        old_ids = self.save_orders(datetime(2023, 1, 5), datetime(2023, 2, 5))
+        new_ids = self.save_orders(datetime(2024, 6, 1))
+        stats = archive_orders(datetime(2024, 1, 1), pause=0)
+        self.assertEqual((stats["orders"], stats["lines"]), (2, 2))
+        self.assertEqual(stats["months"], {"2023-01": 1, "2023-02": 1})
+        self.assertEqual(self.live_order_ids(), new_ids)
+        self.assertEqual([row[0] for row in self.query("SELECT order_id FROM customer_orders_archive ORDER BY order_id")],
+                         old_ids)
+
+    def test_newest_order_kept_live(self):
+        # An order queued offline last year and replayed now has the highest id
+        order_ids = self.save_orders(datetime(2023, 1, 5), datetime(2024, 6, 1), datetime(2023, 3, 1))
+        stats = archive_orders(datetime(2024, 1, 1), pause=0)
+        self.assertEqual(stats["orders"], 1)
+        self.assertEqual(self.live_order_ids(), order_ids[1:])
+
+        # Nothing to archive while it is the only old order left
+        self.assertEqual(archive_orders(datetime(2025, 1, 1), pause=0)["orders"], 1)
+        self.assertEqual(self.live_order_ids(), order_ids[2:])
+
+    def test_order_of_newest_line_kept_live(self):
+        first, second = self.save_orders(datetime(2023, 1, 5), datetime(2023, 1, 6))
+        # The first order's line is saved last, as when two orders are saved at once
+        self.query("""INSERT INTO Menu_Item_order (order_id, menuNo, name, unit_price, quantity, total_price, modifications)
+                      VALUES (%s, '1', 'Egg Rice', 3.0, 1, 3.0, '{}')""", (first,))
+        self.assertEqual(archive_orders(datetime(2024, 1, 1), pause=0)["orders"], 0)
+        self.assertEqual(self.live_order_ids(), [first, second])
+
+    def test_ids_not_reused_after_auto_increment_reset(self):
+        self.save_orders(datetime(2023, 1, 5), datetime(2023, 1, 6), datetime(2023, 1, 7))
+        archive_orders(datetime(2024, 1, 1), pause=0)
+        # What MySQL before 8.0 does on restart, the counters go back to the highest ids left
+        self.query("UPDATE sqlite_sequence SET seq = (SELECT MAX(order_id) FROM Customer_Orders) WHERE name = 'Customer_Orders'")
+        self.query("""UPDATE sqlite_sequence SET seq = (SELECT MAX(order_item_id) FROM Menu_Item_order)
+                      WHERE name = 'Menu_Item_order'""")
+
+        self.save_orders(datetime(2023, 1, 8), datetime(2024, 6, 1))
+        archive_orders(datetime(2024, 1, 1), pause=0)
+        order_ids = [row[0] for row in self.query(union_all("SELECT order_id FROM {orders}"))]
+        self.assertEqual(len(order_ids), 5)
+        self.assertEqual(len(set(order_ids)), 5)
+        line_ids = [row[0] for row in self.query(union_all("SELECT order_item_id FROM {items}"))]
+        self.assertEqual(len(set(line_ids)), 5)
+
+if __name__ == "__main__":
+    unittest.main()
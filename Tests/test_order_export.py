@@ -0,0 +1,143 @@
+import sys
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+import gui_functions
+from admin_setup import setup_database
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Helpers.order_archive import archive_orders
+from Helpers.order_export import export_orders, progress_path
+from Helpers.storage import SQLiteStorage, use_storage
+
+class Interrupted(Exception):
+    pass
+
+class TestExportOrders(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.directory, "restaurant.db"))
+        use_storage(self.storage)
+        with redirect_stdout(None):
+            setup_database()
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            cursor.execute("INSERT INTO users (name, username, password, permission_level) VALUES ('Owner', 'admin', 'x', 1)")
+            cursor.execute("INSERT INTO menu (menuNo, name, price) VALUES ('1', 'Egg Rice', 3.0)")
+            cursor.execute("INSERT INTO menu (menuNo, name, price) VALUES ('2', 'Spring Roll', 1.5)")
+            db.commit()
+        finally:
+            db.close()
+        self.egg_rice = MenuItems("1", "Egg Rice", 3.0)
+        self.spring_roll = MenuItems("2", "Spring Roll", 1.5)
+
+    def tearDown(self):
+        use_storage(None)
+        self.storage.close()
+        shutil.rmtree(self.directory)
+
+    def save_order(self, time, *items) -> int:
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            order_id = gui_functions.insert_order(cursor, CustomerOrder(
+                "admin", menu_items=[MenuItemOrder(item) for item in items], date_time=time))
+            db.commit()
+            return order_id
+        finally:
+            db.close()
+
+    def save_orders(self) -> list:
+        """Orders over two months with one and two lines, the January ones archived."""
+        order_ids = [self.save_order(datetime(2024, 1, day), self.egg_rice, self.spring_roll) for day in (3, 4, 5)]
+        order_ids += [self.save_order(datetime(2024, 2, day), self.egg_rice) for day in (3, 4, 5)]
+        archive_orders(datetime(2024, 2, 1), pause=0)
+        return order_ids
+
+    def read_csv(self, path: str) -> list:
+        with open(path, newline="", encoding="utf-8") as file:
+            return list(csv.reader(file))
+
+    def test_exports_archived_and_live_orders(self):
+        order_ids = self.save_orders()
+        path = os.path.join(self.directory, "orders.csv")
+        stats = export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), path)
+        rows = self.read_csv(path)
+        self.assertEqual(rows[0][0], "order_id")
+        self.assertEqual([int(row[0]) for row in rows[1:]], [order_ids[0]] * 2 + [order_ids[1]] * 2 +
+                         [order_ids[2]] * 2 + order_ids[3:])
+        self.assertEqual([row[7] for row in rows[1:3]], ["Egg Rice", "Spring Roll"])
+        self.assertEqual((stats["rows"], stats["orders"]), (9, 6))
+        self.assertFalse(os.path.exists(progress_path(path)))
+
+    def test_exports_range_only(self):
+        order_ids = self.save_orders()
+        path = os.path.join(self.directory, "orders.jsonl")
+        export_orders(datetime(2024, 1, 4), datetime(2024, 2, 4), path)
+        with open(path, encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(sorted({record["order_id"] for record in records}), order_ids[1:4])
+        self.assertEqual(records[0]["time_of_order"], "2024-01-04T00:00:00")
+        self.assertEqual(records[0]["unit_price"], 3.0)
+
+    def test_order_without_lines_exported_once(self):
+        order_id = self.save_order(datetime(2024, 1, 3))
+        path = os.path.join(self.directory, "orders.csv")
+        stats = export_orders(datetime(2024, 1, 1), datetime(2024, 2, 1), path)
+        rows = self.read_csv(path)[1:]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((int(rows[0][0]), rows[0][5]), (order_id, ""))
+        self.assertEqual(stats["orders"], 1)
+
+    def test_resume_after_interruption(self):
+        self.save_orders()
+        expected_path = os.path.join(self.directory, "expected.csv")
+        export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), expected_path)
+
+        for batches in range(1, 7):
+            with self.subTest(batches=batches):
+                path = os.path.join(self.directory, "orders.csv")
+                reports = []
+                def report(stats):
+                    reports.append(stats)
+                    if len(reports) == batches:
+                        raise Interrupted
+                with self.assertRaises(Interrupted):
+                    export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), path, batch_size=1, report=report)
+                self.assertTrue(os.path.exists(progress_path(path)))
+                # A partly written order is cut off when resuming
+                with open(path, "a", encoding="utf-8") as file:
+                    file.write("999,partial")
+                export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), path, resume=True)
+                self.assertEqual(self.read_csv(path), self.read_csv(expected_path))
+                self.assertFalse(os.path.exists(progress_path(path)))
+
+    def test_resume_between_tables(self):
+        order_ids = self.save_orders()
+        path = os.path.join(self.directory, "orders.csv")
+        expected_path = os.path.join(self.directory, "expected.csv")
+        export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), expected_path)
+        # Checkpoint written after the last archived order, before any live order
+        with open(expected_path, encoding="utf-8", newline="") as source, open(path, "w", encoding="utf-8", newline="") as target:
+            target.write("".join(source.readlines()[:7]))
+            offset = target.tell()
+        with open(progress_path(path), "w", encoding="utf-8") as file:
+            json.dump({"offset": offset, "table": 0, "last_order_id": order_ids[2]}, file)
+        stats = export_orders(datetime(2024, 1, 1), datetime(2024, 3, 1), path, resume=True)
+        self.assertEqual(self.read_csv(path), self.read_csv(expected_path))
+        self.assertEqual((stats["orders"], stats["last_order_id"]), (3, order_ids[5]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Helpers.order_journal import OrderJournal, OrderReplayer
+
+class FakeDatabase:
+    """Save function rejecting the orders of given employees and failing to connect while down."""
+
+    def __init__(self, rejected=(), down_after=None):
+        self.rejected = set(rejected)
+        self.down_after = down_after
+        self.saved = []
+
+    def save_batch(self, batch):
+        for _, order in batch:
+            if order.employeeID in self.rejected:
+                raise ValueError(f"Unknown employee {order.employeeID}")
+        if self.down_after is not None and len(self.saved) >= self.down_after:
+            raise ConnectionError("Failed to establish database connection.")
+        self.saved.extend(key for key, _ in batch)
+
+class TestOrderReplayer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.journal = OrderJournal(os.path.join(self.directory, "order_journal.jsonl"))
+        menu_item = MenuItems("1", "Egg Rice", 3.0)
+        for i, employee in enumerate(["admin", "gone", "admin", "admin"]):
+            self.journal.append(CustomerOrder(employee, menu_items=[MenuItemOrder(menu_item)]), f"key-{i}")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def replayer(self, database):
+        return OrderReplayer(self.journal, database.save_batch, batch_size=3)
+
+    def test_replays_every_order(self):
+        database = FakeDatabase()
+        self.assertEqual(self.replayer(database).replay(), 4)
+        self.assertEqual(database.saved, ["key-0", "key-1", "key-2", "key-3"])
+        self.assertEqual(self.journal.stats()["depth"], 0)
+
+    def test_rejected_order_moved_to_dead_letters(self):
+        database = FakeDatabase(rejected={"gone"})
+        self.assertEqual(self.replayer(database).replay(), 3)
+        self.assertEqual(database.saved, ["key-0", "key-2", "key-3"])
+        self.assertEqual(self.journal.pending(), [])
+
+        failed = self.journal.failed()
+        self.assertEqual([entry["key"] for entry in failed], ["key-1"])
+        self.assertEqual(failed[0]["error"], "ValueError: Unknown employee gone")
+        self.assertEqual(failed[0]["order"]["employee"], "gone")
+        self.assertEqual(self.journal.stats(), {"depth": 0, "oldest_age": None, "failed": 1})
+        self.assertEqual(os.path.basename(self.journal.dead_letter_path), "order_journal.failed.jsonl")
+
+    def test_damaged_order_moved_to_dead_letters(self):
+        entries = self.journal.pending()
+        del entries[2]["order"]["employee"]
+        self.journal._rewrite(entries)
+
+        database = FakeDatabase()
+        self.assertEqual(self.replayer(database).replay(), 3)
+        self.assertEqual([entry["key"] for entry in self.journal.failed()], ["key-2"])
+        self.assertTrue(self.journal.failed()[0]["error"].startswith("KeyError"))
+
+    def test_connection_error_keeps_orders_queued(self):
+        database = FakeDatabase(rejected={"gone"}, down_after=0)
+        with self.assertRaises(ConnectionError):
+            self.replayer(database).replay()
+        self.assertEqual(self.journal.stats()["depth"], 4)
+        self.assertEqual(self.journal.failed(), [])
+
+    def test_connection_lost_while_saving_one_at_a_time(self):
+        database = FakeDatabase(rejected={"gone"}, down_after=1)
+        with self.assertRaises(ConnectionError):
+            self.replayer(database).replay()
+        # Saved and rejected orders are out of the journal, the rest wait for the database
+        self.assertEqual([entry["key"] for entry in self.journal.pending()], ["key-2", "key-3"])
+        self.assertEqual([entry["key"] for entry in self.journal.failed()], ["key-1"])
+
+        database.down_after = None
+        self.assertEqual(self.replayer(database).replay(), 2)
+        self.assertEqual(database.saved, ["key-0", "key-2", "key-3"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+try:
+    import numpy
+except ImportError:  # Only needed for the sales report
+    numpy = None
+
+import gui_functions
+from admin_setup import setup_database
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Helpers.order_archive import archive_orders
+from Helpers.storage import SQLiteStorage, use_storage
+
+MONDAY = datetime(2024, 1, 1)
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestSalesCube(unittest.TestCase):
+
+    def setUp(self):
+        from Helpers.sales_analytics import SalesCube
+        times = [datetime(2024, 1, 1, 12), datetime(2024, 1, 1, 12), datetime(2024, 1, 2, 18), datetime(2024, 1, 7, 9)]
+        self.cube = SalesCube(times, ["amy", "bob", "amy", ""], ["1", "2", "1", "3"], [2, 1, 1, 4],
+                              [6.0, 1.5, 3.0, 10.0], {"1": ["Rice"], "2": ["Starter", "Vegetarian"]})
+
+    def test_totals_by_dimension(self):
+        self.assertEqual(float(self.cube.by()), 20.5)
+        self.assertEqual(self.cube.by("item").tolist(), [9.0, 1.5, 10.0])
+        self.assertEqual(self.cube.by("employee", measure="quantity").tolist(), [4.0, 3.0, 1.0])
+        self.assertEqual(self.cube.labels("employee"), ["", "amy", "bob"])
+        weekdays = self.cube.by("weekday")
+        self.assertEqual((weekdays[0], weekdays[1], weekdays[6]), (7.5, 3.0, 10.0))
+        self.assertEqual(self.cube.by("hour")[[9, 12, 18]].tolist(), [10.0, 7.5, 3.0])
+
+    def test_axes_follow_requested_order(self):
+        by_item_hour = self.cube.by("item", "hour")
+        self.assertEqual(by_item_hour.shape, (3, 24))
+        self.assertTrue(numpy.array_equal(self.cube.by("hour", "item"), by_item_hour.T))
+
+    def test_tags(self):
+        self.assertEqual(self.cube.labels("tag"), ["Rice", "Starter", "Vegetarian"])
+        self.assertEqual(self.cube.by("tag").tolist(), [9.0, 1.5, 1.5])
+        self.assertEqual(self.cube.by("employee", "tag").tolist(), [[0.0, 0.0, 0.0], [9.0, 0.0, 0.0], [0.0, 1.5, 1.5]])
+        with self.assertRaises(ValueError):
+            self.cube.by("item", "tag")
+
+    def test_top_and_percent(self):
+        top = self.cube.top("item", 2)
+        self.assertEqual([(label, total) for label, total, _ in top], [("3", 10.0), ("1", 9.0)])
+        self.assertAlmostEqual(top[0][2], 10.0 / 20.5 * 100)
+        self.assertAlmostEqual(float(self.cube.percent_of_total("employee").sum()), 100.0)
+
+    def test_unknown_dimension_and_measure(self):
+        with self.assertRaises(ValueError):
+            self.cube.by("month")
+        with self.assertRaises(ValueError):
+            self.cube.by("item", measure="profit")
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestLoadSalesCube(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.directory, "restaurant.db"))
+        use_storage(self.storage)
+        with redirect_stdout(None):
+            setup_database()
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            cursor.execute("INSERT INTO users (name, username, password, permission_level) VALUES ('Owner', 'admin', 'x', 1)")
+            cursor.execute("INSERT INTO menu (menuNo, name, price) VALUES ('1', 'Egg Rice', 3.0)")
+            cursor.execute("INSERT INTO menu_tags (menuNo, tag) VALUES ('1', 'Rice')")
+            db.commit()
+        finally:
+            db.close()
+
+    def tearDown(self):
+        use_storage(None)
+        self.storage.close()
+        shutil.rmtree(self.directory)
+
+    def save_order(self, time, quantity: int = 1) -> None:
+        line = MenuItemOrder(MenuItems("1", "Egg Rice", 3.0), quantity)
+        db = self.storage.connect()
+        try:
+            gui_functions.insert_order(db.cursor(), CustomerOrder("admin", menu_items=[line], date_time=time))
+            db.commit()
+        finally:
+            db.close()
+
+    def load(self):
+        from Helpers.sales_analytics import load_sales_cube
+        return load_sales_cube(datetime(2024, 1, 1), datetime(2024, 2, 1), batch_size=2)
+
+    def test_empty_range(self):
+        cube = self.load()
+        self.assertEqual(float(cube.by()), 0.0)
+        self.assertEqual(cube.top("item"), [])
+
+    def test_loads_live_and_archived_lines(self):
+        self.save_order(MONDAY.replace(hour=12), quantity=2)
+        self.save_order(MONDAY.replace(day=2, hour=18))
+        self.save_order(datetime(2024, 3, 1))  # Outside the range
+        archive_orders(datetime(2024, 1, 2), pause=0)
+        cube = self.load()
+        self.assertEqual(float(cube.by()), 9.0)
+        self.assertEqual(cube.by("weekday", measure="quantity")[:2].tolist(), [2.0, 1.0])
+        self.assertEqual(cube.labels("employee"), ["admin"])
+        self.assertEqual(cube.top("tag"), [("Rice", 9.0, 100.0)])
+
+    def test_reload_sees_new_orders(self):
+        self.save_order(MONDAY.replace(hour=12))
+        self.assertEqual(float(self.load().by()), 3.0)
+        self.save_order(MONDAY.replace(hour=13))
+        self.assertEqual(float(self.load().by()), 6.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,426 @@
+"""
+Integration tests of the data layer in gui_functions against each storage backend.
+
+The SQLite tests run on a temporary file. The MySQL tests drop and recreate every
+table of the database named by TEST_DB_NAME, on the server of DB_HOST, DB_USER and
+DB_PASSWORD from the environment or .env file, and are skipped if it isn't set.
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime
+from unittest import mock
+
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(parent_dir)
+
+import gui_functions
+from admin_setup import setup_database
+from Classes.CustomerOrder import CustomerOrder
+from Classes.MenuItemOrder import MenuItemOrder
+from Classes.MenuItems import MenuItems
+from Classes.Money import Money
+from Helpers.storage import SQLiteStorage, use_storage
+
+ORDER_DAY = date(2024, 1, 15)
+
+class StorageTests:
+    """Tests shared by every backend, mixed into a TestCase that provides the storage."""
+
+    def create_storage(self):
+        raise NotImplementedError
+
+    def reset_database(self, storage) -> None:
+        """Leave an empty database in the latest schema."""
+        with redirect_stdout(None):
+            setup_database()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.storage = self.create_storage()
+        use_storage(self.storage)
+        self.reset_database(self.storage)
+
+        # The shared caches outlive each test's database
+        gui_functions.menu_catalog.invalidate()
+        gui_functions.modification_catalog.invalidate()
+        gui_functions.past_order_cache.clear()
+
+        tags_file = os.path.join(self.directory, "tags.json")
+        with open(tags_file, "w") as file:
+            json.dump({"tags": ["Rice", "Chicken", "Spicy", "Vegetarian"]}, file)
+        for patcher in (mock.patch.object(gui_functions, "TAGS_FILE", tags_file),
+                        mock.patch.object(gui_functions.order_journal, "path",
+                                          os.path.join(self.directory, "order_journal.jsonl")),
+                        mock.patch.object(gui_functions, "messagebox")):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.messagebox = gui_functions.messagebox
+
+    def tearDown(self):
+        use_storage(None)
+        shutil.rmtree(self.directory)
+
+    def add_menu(self) -> None:
+        gui_functions.add_item_to_database("1", "Egg Rice", 3.0, ["Rice"])
+        gui_functions.add_item_to_database("2", "Chicken Curry", 5.5, ["Chicken", "Spicy"])
+        gui_functions.add_item_to_database("10", "Prawn Crackers", 1.25, [])
+
+    def place_order(self, hour: int = 12, employee: str = "admin") -> CustomerOrder:
+        egg_rice, chicken_curry = gui_functions.fetch_menu_items("1", 1)[0], gui_functions.fetch_menu_items("2", 1)[0]
+        order = CustomerOrder(employee, date_time=datetime(ORDER_DAY.year, ORDER_DAY.month, ORDER_DAY.day, hour))
+        order.add_item(MenuItemOrder(egg_rice, 2, {"Extra egg": 0.5}))
+        order.add_item(MenuItemOrder(chicken_curry))
+        return order
+
+    # Menu
+
+    def test_add_menu_items(self):
+        self.add_menu()
+        self.messagebox.showerror.assert_not_called()
+        for items in (gui_functions.fetch_menu_items("*", 0), gui_functions.load_menu_items()):
+            self.assertEqual([(item.menuNumber, item.menuName, item.menuPrice, sorted(item.menuTags)) for item in items],
+                             [("1", "Egg Rice", Money(300), ["Rice"]),
+                              ("2", "Chicken Curry", Money(550), ["Chicken", "Spicy"]),
+                              ("10", "Prawn Crackers", Money(125), ["None"])])
+
+    def test_add_duplicate_menu_number(self):
+        self.add_menu()
+        gui_functions.add_item_to_database("1", "Fried Rice", 4.0, [])
+        self.messagebox.showerror.assert_called_once()
+        self.assertEqual([item.menuName for item in gui_functions.load_menu_items()],
+                         ["Egg Rice", "Chicken Curry", "Prawn Crackers"])
+
+    def test_fetch_menu_items_by_number_and_tag(self):
+        self.add_menu()
+        self.assertEqual([item.menuName for item in gui_functions.fetch_menu_items("10", 1)], ["Prawn Crackers"])
+        self.assertEqual(gui_functions.fetch_menu_items("99", 1), [])
+        self.assertEqual([item.menuNumber for item in gui_functions.fetch_menu_items("Spicy", 2)], ["2"])
+
+    def test_update_menu_item(self):
+        self.add_menu()
+        gui_functions.update_item_in_database(MenuItems("1", "Egg Fried Rice", 3.5, ["Rice", "Vegetarian"]))
+        self.messagebox.showerror.assert_not_called()
+        gui_functions.menu_catalog.invalidate()
+        item = gui_functions.fetch_menu_items("1", 1)[0]
+        self.assertEqual((item.menuName, item.menuPrice, sorted(item.menuTags)),
+                         ("Egg Fried Rice", Money(350), ["Rice", "Vegetarian"]))
+        self.assertEqual([item.menuNumber for item in gui_functions.fetch_menu_items("Vegetarian", 2)], ["1"])
+
+    def test_fetched_menu_items_are_copies(self):
+        self.add_menu()
+        gui_functions.fetch_menu_items("1", 1)[0].menuTags.append("Spicy")
+        self.assertEqual(gui_functions.fetch_menu_items("1", 1)[0].menuTags, ["Rice"])
+
+    # Users
+
+    def test_add_and_authenticate_user(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.assertEqual(gui_functions.authenticate("admin", "password"), 1)
+        self.assertEqual(gui_functions.authenticate("admin", "wrong"), 0)
+        self.assertEqual(gui_functions.authenticate("nobody", "password"), 0)
+        name, username, _, permission_level = gui_functions.get_user("admin")
+        self.assertEqual((name, username, permission_level), ("Owner", "admin", 1))
+
+    def test_add_duplicate_user(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        with self.assertRaises(Exception):
+            gui_functions.add_user("Someone", "admin", "other", 2)
+        self.assertEqual(len(gui_functions.get_all_user()), 1)
+
+    def test_update_user(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        gui_functions.add_user("Server", "server", "password", 2)
+        gui_functions.update_User("Head Server", "server", "", 1)
+        self.assertEqual(gui_functions.authenticate("server", "password"), 1)
+        gui_functions.update_User("Head Server", "server", "secret", 1)
+        self.assertEqual(gui_functions.authenticate("server", "password"), 0)
+        self.assertEqual(gui_functions.authenticate("server", "secret"), 1)
+        self.assertEqual(sorted((row[0], row[1]) for row in gui_functions.get_all_user()),
+                         [("Head Server", "server"), ("Owner", "admin")])
+
+    # Orders
+
+    def test_add_customer_order(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        order = self.place_order()
+        order_id = gui_functions.add_customer_order(order)
+        self.assertIsInstance(order_id, int)
+        self.assertEqual(gui_functions.get_order_queue_stats()["depth"], 0)
+
+        self.assertEqual(gui_functions.get_past_order(ORDER_DAY.isoformat()),
+                         [("admin", order_id, order.datetime, 3)])
+        items = gui_functions.get_past_order_items(order_id)
+        self.assertEqual([(menuNo, name, quantity, Money.of(price), json.loads(modifications))
+                          for menuNo, name, quantity, price, modifications in items],
+                         [("1", "Egg Rice", 2, Money(300), {"Extra egg": 0.5}),
+                          ("2", "Chicken Curry", 1, Money(550), {})])
+
+    def test_past_orders_with_items(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        first, second = self.place_order(12), self.place_order(18)
+        second.find_item("2").increment_quantity()
+        for order in (second, first):
+            gui_functions.add_customer_order(order)
+
+        orders = gui_functions.get_past_orders_with_items(ORDER_DAY)
+        self.assertEqual([order.datetime.hour for order in orders], [12, 18])
+        self.assertEqual([(order.totalprice, order.total_items) for order in orders],
+                         [(Money(1250), 3), (Money(1800), 4)])
+        self.assertEqual(orders[1].find_item("1", {"Extra egg": 0.5}).total_price, Money(700))
+        self.assertEqual(gui_functions.get_past_orders_with_items("2024-01-16"), [])
+
+    def test_past_order_page(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        for hour in (9, 11, 13):
+            gui_functions.add_customer_order(self.place_order(hour))
+
+        first_page = gui_functions.get_past_order_page(ORDER_DAY, limit=2)
+        self.assertEqual([header["time_of_order"].hour for header in first_page], [9, 11])
+        self.assertEqual(first_page[0]["total_price"], Money(1250))
+        last = first_page[-1]
+        second_page = gui_functions.get_past_order_page(ORDER_DAY, after=(last["time_of_order"], last["order_id"]), limit=2)
+        self.assertEqual([header["time_of_order"].hour for header in second_page], [13])
+
+        order = gui_functions.get_past_order_with_items(second_page[0])
+        self.assertEqual(order.totalprice, Money(1250))
+        order.verify_totals()
+
+    def test_saved_order_clears_cached_day(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        gui_functions.add_customer_order(self.place_order(12))
+        self.assertEqual(len(gui_functions.get_past_order(ORDER_DAY.isoformat())), 1)
+        gui_functions.add_customer_order(self.place_order(13))
+        self.assertEqual(len(gui_functions.get_past_order(ORDER_DAY.isoformat())), 2)
+
+    def test_sales_rollups(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        gui_functions.add_customer_order(self.place_order(12))
+        gui_functions.add_customer_order(self.place_order(18))
+
+        self.assertEqual(gui_functions.get_sales_totals(ORDER_DAY), {"orders": 2, "items": 6, "revenue": Money(2500)})
+        self.assertEqual(gui_functions.get_hourly_sales(ORDER_DAY),
+                         [(12, 1, 3, Money(1250)), (18, 1, 3, Money(1250))])
+        self.assertEqual(sorted(gui_functions.get_item_sales(ORDER_DAY)),
+                         [("1", 4, Money(1400)), ("2", 2, Money(1100))])
+        self.assertEqual(gui_functions.get_employee_sales(ORDER_DAY), [("admin", 2, 6, Money(2500))])
+
+        gui_functions.rebuild_sales_rollups()
+        self.assertEqual(gui_functions.get_sales_totals(ORDER_DAY), {"orders": 2, "items": 6, "revenue": Money(2500)})
+
+    def test_insert_order_rejects_duplicate_key(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        db = self.storage.connect()
+        try:
+            cursor = db.cursor()
+            gui_functions.insert_order(cursor, self.place_order(), "key-1")
+            with self.assertRaises(Exception):
+                gui_functions.insert_order(cursor, self.place_order(), "key-1")
+            db.rollback()
+        finally:
+            db.close()
+        self.assertEqual(gui_functions.get_past_order(ORDER_DAY.isoformat()), [])
+
+    def test_order_of_unknown_employee_rejected(self):
+        self.add_menu()
+        with self.assertRaises(Exception):
+            gui_functions.add_customer_order(self.place_order(employee="nobody"))
+        self.assertEqual(gui_functions.get_order_queue_stats()["depth"], 0)
+        self.assertEqual(gui_functions.get_past_order(ORDER_DAY.isoformat()), [])
+
+    def test_save_queued_orders_skips_saved_keys(self):
+        gui_functions.add_user("Owner", "admin", "password", 1)
+        self.add_menu()
+        batch = [("key-1", self.place_order(12)), ("key-2", self.place_order(13))]
+        gui_functions.save_queued_orders(batch)
+        gui_functions.save_queued_orders(batch)
+        self.assertEqual(len(gui_functions.get_past_order(ORDER_DAY.isoformat())), 2)
+        self.assertEqual(gui_functions.get_sales_totals(ORDER_DAY)["orders"], 2)
+
+    # Modifications
+
+    def test_add_and_remove_modification(self):
+        self.assertTrue(gui_functions.add_mod_to_database("Extra egg", 0.5, "Extras"))
+        self.assertTrue(gui_functions.add_mod_to_database("No onions", 0, "Vegatables"))
+        self.assertEqual([(name, Money.of(cost), tag) for name, cost, tag in gui_functions.get_mod_from_tag("*")],
+                         [("Extra egg", Money(50), "Extras"), ("No onions", Money(0), "Vegatables")])
+        self.assertEqual([name for name, _ in gui_functions.get_mod_from_tag("Extras")], ["Extra egg"])
+
+        self.assertTrue(gui_functions.remove_mod("Extra egg"))
+        self.assertEqual([name for name, _, _ in gui_functions.get_mod_from_tag("*")], ["No onions"])
+        self.assertEqual(gui_functions.get_mod_from_tag("Extras"), [])
+
+    # Tags
+
+    def test_rename_tag(self):
+        self.add_menu()
+        self.assertEqual(gui_functions.rename_menu_item_tag("Spicy", "Hot"), 1)
+        self.assertEqual(gui_functions.load_tags(), ["Rice", "Chicken", "Hot", "Vegetarian"])
+        for _ in range(2):  # From the cache, then reloaded from the database
+            self.assertEqual(sorted(gui_functions.fetch_menu_items("2", 1)[0].menuTags), ["Chicken", "Hot"])
+            self.assertEqual(gui_functions.fetch_menu_items("Spicy", 2), [])
+            gui_functions.menu_catalog.invalidate()
+
+    def test_merge_tags(self):
+        self.add_menu()
+        gui_functions.update_item_in_database(MenuItems("1", "Egg Rice", 3.0, ["Rice", "Spicy"]))
+        self.assertEqual(gui_functions.merge_menu_item_tags({"Rice", "Spicy"}, "Mains"), 2)
+        self.assertEqual(gui_functions.load_tags(), ["Mains", "Chicken", "Vegetarian"])
+        gui_functions.menu_catalog.invalidate()
+        self.assertEqual([item.menuNumber for item in gui_functions.fetch_menu_items("Mains", 2)], ["1", "2"])
+        self.assertEqual(gui_functions.fetch_menu_items("1", 1)[0].menuTags, ["Mains"])
+
+    def test_remove_tags(self):
+        self.add_menu()
+        self.assertEqual(gui_functions.remove_menu_item_tags({"Chicken", "Rice"}), 2)
+        self.assertEqual(gui_functions.load_tags(), ["Spicy", "Vegetarian"])
+        gui_functions.menu_catalog.invalidate()
+        self.assertEqual(gui_functions.fetch_menu_items("1", 1)[0].menuTags, ["None"])
+        self.assertEqual(gui_functions.fetch_menu_items("2", 1)[0].menuTags, ["Spicy"])
+
+
+class FailingCursor:
+    """Cursor of a reachable server that fails every statement with the given error."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def execute(self, query, params=None):
+        raise self.error
+
+    executemany = execute
+
+
+class FailingConnection:
+    def __init__(self, error):
+        self.error = error
+        self.rolled_back = False
+
+    def cursor(self, *args):
+        return FailingCursor(self.error)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+
+class TestMySQLConnectionErrors(unittest.TestCase):
+    """Which pymysql errors make an order wait in the journal, no server needed."""
+
+    def setUp(self):
+        import pymysql
+        from Helpers.storage import MySQLStorage
+        self.pymysql = pymysql
+        self.storage = MySQLStorage()
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.object(gui_functions.order_journal, "path", os.path.join(self.directory, "order_journal.jsonl"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        use_storage(None)
+        shutil.rmtree(self.directory)
+
+    def test_lost_connection_codes(self):
+        for code in (2002, 2003, 2006, 2013, 2055):
+            with self.subTest(code=code):
+                self.assertTrue(self.storage.is_connection_error(self.pymysql.OperationalError(code, "Lost connection")))
+        self.assertTrue(self.storage.is_connection_error(self.pymysql.InterfaceError(0, "")))
+
+    def test_errors_of_reachable_server(self):
+        for code in (1045, 1054, 1205, 1213, 1452, 3024):
+            with self.subTest(code=code):
+                self.assertFalse(self.storage.is_connection_error(self.pymysql.OperationalError(code, "Rejected")))
+        self.assertFalse(self.storage.is_connection_error(self.pymysql.OperationalError()))
+        self.assertFalse(self.storage.is_connection_error(self.pymysql.IntegrityError(1062, "Duplicate entry")))
+        self.assertFalse(self.storage.is_connection_error(ConnectionError("Failed to establish database connection.")))
+
+    def save_order_failing_with(self, error):
+        connection = FailingConnection(error)
+        self.storage.connect = lambda: connection
+        use_storage(self.storage)
+        order = CustomerOrder("admin", menu_items=[MenuItemOrder(MenuItems("1", "Egg Rice", 3.0))])
+        return gui_functions.add_customer_order(order)
+
+    def test_unknown_column_not_queued(self):
+        error = self.pymysql.OperationalError(1054, "Unknown column 'idempotency_key' in 'field list'")
+        with self.assertRaises(self.pymysql.OperationalError) as raised:
+            self.save_order_failing_with(error)
+        self.assertIs(raised.exception, error)
+        self.assertEqual(gui_functions.get_order_queue_stats()["depth"], 0)
+
+    def test_lost_connection_queued(self):
+        error = self.pymysql.OperationalError(2013, "Lost connection to MySQL server during query")
+        with redirect_stdout(None):
+            self.assertIsNone(self.save_order_failing_with(error))
+        self.assertEqual(gui_functions.get_order_queue_stats()["depth"], 1)
+
+
+class TestSQLiteStorage(StorageTests, unittest.TestCase):
+
+    def create_storage(self):
+        return SQLiteStorage(os.path.join(self.directory, "restaurant.db"))
+
+    def tearDown(self):
+        self.storage.close()
+        super().tearDown()
+
+
+@unittest.skipUnless(os.getenv("TEST_DB_NAME"), "TEST_DB_NAME is not set, no MySQL database to test against")
+class TestMySQLStorage(StorageTests, unittest.TestCase):
+    storage = None
+
+    @classmethod
+    def setUpClass(cls):
+        # Read by the connection pool when it is created
+        os.environ["DB_NAME"] = os.environ["TEST_DB_NAME"]
+        from Helpers.storage import MySQLStorage
+        cls.mysql_storage = MySQLStorage()
+        try:
+            db = cls.mysql_storage.connect()
+        except Exception as e:
+            raise unittest.SkipTest(f"Could not connect to the MySQL server: {e}")
+        if not db:
+            raise unittest.SkipTest("Could not connect to the MySQL server")
+        db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mysql_storage.close()
+
+    def create_storage(self):
+        return self.mysql_storage
+
+    def reset_database(self, storage) -> None:
+        db = storage.connect()
+        try:
+            cursor = db.cursor()
+            cursor.execute("SHOW TABLES")
+            tables = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for table in tables:
+                cursor.execute(f"DROP TABLE `{table}`")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            db.commit()
+        finally:
+            db.close()
+        super().reset_database(storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
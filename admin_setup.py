@@ -1,6 +1,13 @@
-from Helpers.db_connection import create_connection
-from gui_functions import add_user
+from Helpers.storage import get_storage
+from Helpers.migrations import mark_all_applied, migrate, check_query_plans
+from Helpers.order_export import export_orders
+from Helpers.order_archive import archive_orders, archive_cutoff, union_all, union_params
+from gui_functions import (add_user, create_query, rebuild_sales_rollups, PAST_ORDERS_QUERY, PAST_ORDER_ITEMS_QUERY,
+                           ORDER_PAGE_QUERY, ORDER_PAGE_ORDER, ORDER_ITEMS_IN_RANGE_QUERY, order_replayer, order_journal,
+                           get_order_queue_stats, date_range_bounds)
+from datetime import datetime
 import os
+import sys
 
 # Initial admin setup constants
 NAME = "Owner"
@@ -8,48 +15,15 @@ USERNAME = "Admin"
 PASSWORD = "password"
 PERMISSION_LEVEL = 1
 
-# SQL Queries for table creation
-SQL_QUERIES = [
-    """CREATE TABLE menu(  
-        menuNo VARCHAR(10) NOT NULL PRIMARY KEY COMMENT 'Primary Key',
-        name VARCHAR(255) NOT NULL,
-        price DECIMAL(4,2) NOT NULL CHECK (price >= 0),
-        tags JSON CHECK (JSON_VALID(tags))
-    ) COMMENT 'Table for storing menu items';""",
-    
-    """CREATE TABLE users(
-        name VARCHAR(255),
-        username VARCHAR(255) NOT NULL PRIMARY KEY,
-        password VARCHAR(128) NOT NULL,
-        permission_level INT NOT NULL
-    );""",
-    
-    """CREATE table Customer_Orders(
-        order_id INT AUTO_INCREMENT PRIMARY KEY,
-        employee_username VARCHAR(255),
-        time_of_order DATETIME,
-        total_price DECIMAL(10,2) CHECK (total_price >= 0),
-        total_no_of_items INT,
-        FOREIGN KEY (employee_username) REFERENCES users(username)
-    );""",
-    
-    """Create table Menu_Item_order(
-        order_item_id INT AUTO_INCREMENT PRIMARY KEY,
-        order_id INT NOT NULL,
-        menuNo VARCHAR(10) NOT NULL,
-        quantity INT CHECK (quantity > 0),
-        total_price DECIMAL(10,2) CHECK (total_price >= 0),
-        modifications JSON CHECK (JSON_VALID(modifications)),
-        FOREIGN KEY (order_id) REFERENCES Customer_Orders(order_id),
-        FOREIGN KEY (menuNo) REFERENCES menu(menuNo)
-    );""",
-    
-    """CREATE TABLE modifications (
-        modification_id INT PRIMARY KEY AUTO_INCREMENT,
-        modification_name VARCHAR(255) NOT NULL,
-        additional_cost DECIMAL(10, 2) DEFAULT 0.00,
-        tag_name VARCHAR(255) NOT NULL
-    );"""
+# Queries on the busiest paths with sample parameters, checked with EXPLAIN by check-indexes
+HOT_QUERIES = [
+    ("Orders in a date range", PAST_ORDERS_QUERY, union_params((datetime(2024, 1, 1), datetime(2024, 1, 2)))),
+    ("Page of orders in a date range", union_all(ORDER_PAGE_QUERY, order_by=ORDER_PAGE_ORDER, limit=50),
+     union_params((datetime(2024, 1, 1), datetime(2024, 1, 2), datetime(2024, 1, 1, 12), datetime(2024, 1, 1, 12), 100))),
+    ("Items of one order", PAST_ORDER_ITEMS_QUERY, union_params((1,))),
+    ("Items of all orders in a date range", ORDER_ITEMS_IN_RANGE_QUERY,
+     union_params((datetime(2024, 1, 1), datetime(2024, 1, 2)))),
+    ("Menu items with a tag", create_query("Rice", 2), ("Rice",)),
 ]
 
 def setup_database():
@@ -57,11 +31,17 @@ def setup_database():
     Creates all required database tables.
     Should only be run during initial setup.
     """
-    connection = create_connection()
+    storage = get_storage()
+    connection = storage.connect()
+    if not connection:
+        print("Error creating database tables: failed to establish database connection.")
+        return
     try:
         with connection.cursor() as cursor:
-            for query in SQL_QUERIES:
+            for query in storage.tables + storage.rollup_tables + storage.archive_tables:
                 cursor.execute(query)
+            # The tables above are already in the latest schema
+            mark_all_applied(cursor)
         connection.commit()
         print("Database tables created successfully")
     except Exception as e:
@@ -81,5 +61,50 @@ def setup_initial_admin():
         print(f"Error creating admin user: {e}")
 
 if __name__ == "__main__":
-    setup_database()
-    setup_initial_admin()
+    if sys.argv[1:] == ["migrate"]:
+        applied = migrate()
+        print(f"Applied {len(applied)} migration(s), the database is up to date")
+    elif sys.argv[1:2] == ["rebuild-rollups"]:
+        # Optional first and last day, e.g. rebuild-rollups 2024-01-01 2024-01-31
+        rebuild_sales_rollups(*sys.argv[2:4])
+        print("Sales rollups rebuilt")
+    elif sys.argv[1:] == ["check-indexes"]:
+        if not check_query_plans(HOT_QUERIES):
+            sys.exit(1)
+    elif sys.argv[1:] == ["queue-status"]:
+        stats = get_order_queue_stats()
+        oldest = "" if stats["oldest_age"] is None else f", oldest queued {stats['oldest_age']:.0f}s ago"
+        print(f"{stats['depth']} order(s) waiting in the offline order journal{oldest}")
+        if stats["failed"]:
+            print(f"{stats['failed']} order(s) the database rejected are in {order_journal.dead_letter_path}")
+    elif sys.argv[1:] == ["replay-orders"]:
+        print(f"Saved {order_replayer.replay()} queued order(s) to the database")
+    elif sys.argv[1:2] == ["export-orders"] and len(sys.argv) in (5, 6):
+        # export-orders 2024-01-01 2024-03-31 orders.csv [--resume]
+        start, end, path = sys.argv[2:5]
+        stats = export_orders(*date_range_bounds(start, end), path, resume=sys.argv[5:] == ["--resume"],
+                              report=lambda s: print(f"{s['rows']} rows, {s['rows_per_second']:.0f} rows/s", end="\r"))
+        print(f"Exported {stats['rows']} rows of {stats['orders']} orders in {stats['seconds']:.1f}s "
+              f"({stats['rows_per_second']:.0f} rows/s), last order_id {stats['last_order_id']}")
+    elif sys.argv[1:2] == ["archive-orders"] and len(sys.argv) <= 4:
+        # archive-orders [months kept] [batch size], defaults to ARCHIVE_KEEP_MONTHS months in batches of 500
+        keep_months = int(sys.argv[2]) if len(sys.argv) > 2 else int(os.getenv("ARCHIVE_KEEP_MONTHS", 12))
+        cutoff = archive_cutoff(keep_months)
+        print(f"Archiving orders placed before {cutoff.date()}")
+        stats = archive_orders(cutoff, batch_size=int(sys.argv[3]) if len(sys.argv) > 3 else 500,
+                               report=lambda s: print(f"{s['orders']} orders, {s['lines']} lines", end="\r"))
+        for month, orders in sorted(stats["months"].items()):
+            print(f"  {month}: {orders} orders")
+        print(f"Archived {stats['orders']} orders and {stats['lines']} lines in {stats['seconds']:.1f}s")
+    elif sys.argv[1:2] == ["sales-report"] and len(sys.argv) in (3, 4):
+        # sales-report 2024-01-01 [2024-12-31], needs numpy
+        from Helpers.sales_analytics import load_sales_cube
+        cube = load_sales_cube(*date_range_bounds(*sys.argv[2:4]))
+        print(f"Revenue £{cube.by().item():.2f} from {cube.by(measure='quantity').item():.0f} items")
+        for dimension in ("item", "tag", "employee", "hour", "weekday"):
+            print(f"\nTop {dimension}s by revenue")
+            for label, total, percent in cube.top(dimension, 5):
+                print(f"  {str(label):<20} £{total:>10.2f} {percent:6.1f}%")
+    else:
+        setup_database()
+        setup_initial_admin()
@@ -1,14 +1,55 @@
 import Classes.MenuItems as MenuItems
 import Classes.CustomerOrder as CustomerOrder
-import Helpers.db_connection as db_connection
+import Classes.MenuItemOrder as MenuItemOrder
+from Classes.Money import Money
+from Helpers.storage import get_storage
+import Helpers.sales_rollups as sales_rollups
+from Helpers.menu_catalog import MenuCatalog
+from Helpers.modification_catalog import ModificationCatalog
+from Helpers.order_journal import OrderJournal, OrderReplayer, new_idempotency_key
+from Helpers.day_cache import DayCache
+from Helpers.order_archive import union_all, union_params
+from Helpers.live_sales import LiveSales
 import json
+import os
+from datetime import date, datetime, timedelta
 from tkinter import messagebox
 import bcrypt
 
-#TODO Refactor into a class to handle all database functions in database using connection pooling
-def Validate_login(username: str, password: str) -> int:
+# Queries on the busiest paths, also checked against their EXPLAIN plans by Helpers.migrations.
+# They read the live and archived orders together, parameters go through union_params()
+PAST_ORDERS_QUERY = union_all("""SELECT employee_username, order_id, time_of_order, total_no_of_items
+                    FROM {orders}
+                    WHERE time_of_order >= %s AND time_of_order < %s
+                    """, order_by="time_of_order ASC")
+# Order lines hold the name and unit price charged, so history doesn't read the current menu.
+# order_item_id is last so the lines keep their order, build_order_items() doesn't use it
+PAST_ORDER_ITEMS_QUERY = union_all("""SELECT menuNo, name, quantity, unit_price, modifications, order_item_id
+                    FROM {items}
+                    WHERE order_id = %s
+                    """, order_by="order_item_id")
+# Keyset pagination, the page starts after the (time_of_order, order_id) of the last order shown.
+# The time index also holds the primary key, so the page is read in index order without sorting.
+# Run through union_all() with the page size as the limit
+ORDER_PAGE_QUERY = """SELECT order_id, employee_username, time_of_order, total_no_of_items, total_price
+                    FROM {orders}
+                    WHERE time_of_order >= %s AND time_of_order < %s
+                    AND (time_of_order > %s OR (time_of_order = %s AND order_id > %s))
+                    """
+ORDER_PAGE_ORDER = "time_of_order ASC, order_id ASC"
+ORDER_PAGE_SIZE = 50
+ORDER_ITEMS_IN_RANGE_QUERY = union_all("""SELECT mio.order_id AS order_id, mio.menuNo, mio.name, mio.quantity,
+                    mio.unit_price, mio.modifications, mio.order_item_id AS order_item_id
+                    FROM {items} AS mio
+                    JOIN {orders} AS co
+                    ON mio.order_id = co.order_id
+                    WHERE co.time_of_order >= %s AND co.time_of_order < %s
+                    """, order_by="order_id, order_item_id")
+
+#TODO Refactor into a class to handle all database functions in database
+def authenticate(username: str, password: str) -> int:
     """
-    Validate user credentials and return permission level.
+    Check user credentials without any user interface, safe to run off the Tk thread.
 
     Args:
         username (str): The username provided by the user
@@ -18,23 +59,11 @@ def Validate_login(username: str, password: str) -> int:
         int: Permission level (0 if authentication fails)
 
     Raises:
-        Exception: If database connection or query fails
+        Exception: If database query fails
+        ConnectionError: If database connection fails
     """
-    if not username or not password:
-        messagebox.showerror("Error", "Username or password cannot be empty.")
-        return 0
-
-    try:
-        user = get_user(username, password)
-        if user:
-            return user[3]  # Permission level
-        else:
-            messagebox.showerror("Error", "Invalid username or password.")
-            return 0
-    except Exception as e:
-        messagebox.showerror("Error", "An unexpected error occurred during login. Please try again.")
-        print(f"Error details: {e}")
-        return 0
+    user = get_user(username, password)
+    return user[3] if user else 0  # Permission level
 
     
 def add_item_to_database(menuNo: str, name: str, price: float, tags: list) -> None:
@@ -49,7 +78,7 @@ def add_item_to_database(menuNo: str, name: str, price: float, tags: list) -> No
     Raises:
         Exception: If menu number already exists or database operation fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     
     if db:
         try:
@@ -62,15 +91,16 @@ def add_item_to_database(menuNo: str, name: str, price: float, tags: list) -> No
             #Handles if it already exists
             if result[0] > 0:  
                 raise Exception(f"Menu number {menuNo} already exists in the database.")
-            tags_json = json.dumps(tags)
             
             # SQL query to insert a new item into the database
             query = """
-            INSERT INTO menu (menuNo, name, price, tags)
-            VALUES (%s, %s, %s, %s);
+            INSERT INTO menu (menuNo, name, price)
+            VALUES (%s, %s, %s);
             """
-            cursor.execute(query, (menuNo, name, price, tags_json))
+            cursor.execute(query, (menuNo, name, price))
+            insert_menu_tags(cursor, menuNo, tags)
             db.commit()
+            menu_catalog.upsert(MenuItems.MenuItems(menuNo, name, price, tags))
             messagebox.showinfo("Success", "Successfully added to the database")
         except Exception as e:
             messagebox.showerror("Error", f"An error adding to database: {e}")
@@ -79,9 +109,10 @@ def add_item_to_database(menuNo: str, name: str, price: float, tags: list) -> No
     else:
         messagebox.showerror("Error", f"Failed to connect to database: {e}")
 
-#TODO Refactor following 2 functions
 def fetch_menu_items(tag: str, type: int) -> list:
-    """Fetch menu items from database based on tag and search type.
+    """Fetch menu items from the menu cache based on tag and search type.
+
+    The returned items are copies that callers are free to modify.
 
     Args:
         tag (str): Search by tag or "*" for all items
@@ -89,43 +120,89 @@ def fetch_menu_items(tag: str, type: int) -> list:
 
     Returns:
         list: List of MenuItems objects matching the search criteria
+    """
+    try:
+        if tag == "*": #Retrieves all the menu items
+            items = menu_catalog.all_items()
+        elif type == 1: #Searchs for a specific menu item through id
+            item = menu_catalog.get(tag)
+            items = [item] if item else []
+        else: #Search by tags
+            items = menu_catalog.items_with_tag(tag)
+    except Exception as e:
+        messagebox.showerror("Error", f"Error retrieving from the database: {e}")
+        return []
+    return [item.clone() for item in items]
+
+def load_menu_items() -> list:
+    """Load every menu item from the database, used to fill the menu cache.
+
+    Returns:
+        list: List of MenuItems objects ordered by menu number
 
     Raises:
-        Exception: If database connection or query execution fails
+        Exception: If database query fails
+        ConnectionError: If database connection fails
     """
-    menu_items_list = []
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            
-            # Get the appropriate query based on the tag
-            query = create_query(tag,type)
-            if tag == "*": #Retrieves all the menu items
-                cursor.execute(query)
-            elif type == 1: #Searchs for a specific menu item through id
-                cursor.execute(query, (tag,)) #Search by tags
-            else:
-                cursor.execute(query, (f"%{tag}%",))  # Pass the tag as a parameter
-            
-            # Fetch all rows and process them
-            rows = cursor.fetchall()
-            for row in rows:
-                menuNo, name, price, tags_json = row
-                tags = json.loads(tags_json)  # Parse tags from JSON
-                menu_items_list.append(MenuItems.MenuItems(menuNo, name, price, tags))
-        except Exception as e:
-            messagebox.showerror("Error", f"Error retrieving from the database: {e}")
+            cursor.execute(create_query("*", 0))
+            return rows_to_menu_items(cursor.fetchall())
         finally:
-            if db:
-                db.close()
+            db.close()
     else:
-        messagebox.showerror("Error", "Can't connect to database")
-    return menu_items_list
+        raise ConnectionError("Failed to establish database connection.")
+
+def rows_to_menu_items(rows) -> list:
+    """Group (menuNo, name, price, tag) rows into MenuItems objects.
+
+    Rows of the same menu item must be next to each other, which the ordering
+    used by create_query guarantees. The rows come from our own tables, so the
+    items are built without validating them again.
+
+    Args:
+        rows: Rows returned by a query from create_query
+
+    Returns:
+        list: List of MenuItems objects in the order of the rows
+    """
+    menu_items_list = []
+    current = None
+    for menuNo, name, price, tag in rows:
+        if current is None or current[0] != menuNo:
+            current = (menuNo, name, price, [])
+            menu_items_list.append(current)
+        if tag is not None:
+            current[3].append(tag)
+    return MenuItems.MenuItems.from_rows(menu_items_list)
+
+def insert_menu_tags(cursor, menuNo: str, tags: list) -> None:
+    """Add rows to menu_tags for a menu item using an open cursor without committing.
+
+    Args:
+        cursor: Cursor of the connection the transaction runs on
+        menuNo (str): The menu item the tags belong to
+        tags (list): The tags, the "None" placeholder is not stored
+    """
+    rows = [(menuNo, tag) for tag in set(tags or []) if tag != "None"]
+    if rows:
+        cursor.executemany("INSERT INTO menu_tags (menuNo, tag) VALUES (%s, %s)", rows)
+
+# ORDER_DEBUG=1 checks the running order totals against a full recount on every change
+CustomerOrder.CustomerOrder.debug = os.getenv("ORDER_DEBUG") == "1"
+
+# Shared menu cache, MENU_CACHE_TTL seconds (0 to disable) before it reloads itself
+menu_catalog = MenuCatalog(load_menu_items, ttl=float(os.getenv("MENU_CACHE_TTL", 300)))
 
 def create_query(tag: str, type: int) -> str:
     """
     Create SQL query based on search parameters.
+
+    Every query returns one (menuNo, name, price, tag) row per tag of each
+    matching menu item, or a single row with a NULL tag for untagged items.
+    Tag filtering is an index lookup on menu_tags.
     
     Args:
         tag (str): Search tag or "*" for all items
@@ -134,18 +211,23 @@ def create_query(tag: str, type: int) -> str:
     Returns:
         str: SQL query string with proper ordering
     """
+    select = """
+        SELECT m.menuNo, m.name, m.price, t.tag
+        FROM menu AS m
+    """
+    all_tags = "LEFT JOIN menu_tags AS t ON t.menuNo = m.menuNo"
     order_by = """
         ORDER BY 
-            CAST(menuNo AS UNSIGNED), 
-            menuNo
+            CAST(m.menuNo AS UNSIGNED), 
+            m.menuNo
     """
     
     if tag == "*": #Retrieves all menu items
-        return f"SELECT * FROM menu {order_by}"
+        return f"{select} {all_tags} {order_by}"
     elif type == 1: #Finds a specific menu item by id
-        return "SELECT * FROM menu WHERE MenuNo = %s"
+        return f"{select} {all_tags} WHERE m.menuNo = %s"
     else: #Retrieves all menu items that have the tag
-        return f"SELECT * FROM menu WHERE tags LIKE %s {order_by}"
+        return f"{select} JOIN menu_tags AS f ON f.menuNo = m.menuNo AND f.tag = %s {all_tags} {order_by}"
 
 
 def update_item_in_database(item: MenuItems) -> None:
@@ -157,18 +239,20 @@ def update_item_in_database(item: MenuItems) -> None:
     Raises:
         Exception: If database connection or update operation fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            tags_json = json.dumps(item.menuTags)
             query = """
             UPDATE menu
-            SET name = %s, price = %s, tags = %s
+            SET name = %s, price = %s
             WHERE menuNo = %s;
             """
-            cursor.execute(query, (item.menuName, item.menuPrice, tags_json, item.menuNumber))
+            cursor.execute(query, (item.menuName, item.menuPrice, item.menuNumber))
+            cursor.execute("DELETE FROM menu_tags WHERE menuNo = %s", (item.menuNumber,))
+            insert_menu_tags(cursor, item.menuNumber, item.menuTags)
             db.commit()
+            menu_catalog.upsert(MenuItems.MenuItems(item.menuNumber, item.menuName, item.menuPrice, item.menuTags))
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
         finally:
@@ -187,12 +271,12 @@ def add_user(name: str, username: str, password: str, permission_level: int) ->
         Exception: If database operation fails
         ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             salt = bcrypt.gensalt()
             password = password.encode('utf-8')  # Convert to bytes
-            password = bcrypt.hashpw(password, salt)
+            password = bcrypt.hashpw(password, salt).decode('utf-8')  # Stored as text by every backend
             cursor = db.cursor()
 
             query = """
@@ -203,7 +287,6 @@ def add_user(name: str, username: str, password: str, permission_level: int) ->
             cursor.execute(query,(name, username, password, permission_level))
 
             db.commit()
-            print("Works")
         except Exception as e:
             raise Exception(e)
         finally:
@@ -222,19 +305,19 @@ def update_User(name: str, username: str, password: str, permission_level: int)
 
     Raises:
         Exception: If database operation fails
+        ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     
     if not db:
-        messagebox.showerror("Error", "Database connection failed!")
-        return
+        raise ConnectionError("Failed to establish database connection.")
 
     try:
         cursor = db.cursor()
         if password:
             # Hash the password if it's provided
             salt = bcrypt.gensalt()
-            hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
+            hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
             
             query = """
                 UPDATE users
@@ -252,9 +335,8 @@ def update_User(name: str, username: str, password: str, permission_level: int)
             cursor.execute(query, (name, username, permission_level, username))
 
         db.commit()
-        messagebox.showinfo("Success", "User updated successfully!")
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {e}")
+        raise Exception(f"An error occurred: {e}")
     finally:
         if db:
             db.close()
@@ -273,7 +355,7 @@ def get_user(username: str, password: str = False) -> tuple:
         Exception: If database query fails
         ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
@@ -311,7 +393,7 @@ def get_all_user() -> list:
         Exception: If database query fails
         ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
@@ -332,45 +414,163 @@ def get_all_user() -> list:
     else:
         raise ConnectionError("Failed to establish database connection.")
     
-def add_customer_order(order: CustomerOrder) -> bool:
+def add_customer_order(order: CustomerOrder) -> int:
     """Add new customer order to database.
 
+    The order row is inserted first and all of its line items are then sent
+    together as a single multi-row insert. If the database can't be reached the
+    order is written to the local order journal instead and saved later by the
+    order replayer, so an accepted order is never lost.
+
     Args:
         order (CustomerOrder): Order object containing order details
 
     Returns:
-        bool: True if order was successfully added
+        int: The order_id assigned to the new order, None if it was queued in the journal
 
     Raises:
-        Exception: If database operation fails
-        ConnectionError: If database connection fails
+        Exception: The database error if the order was rejected rather than the connection lost
+        OSError: If the database is down and the order journal can't be written
     """
-    db = db_connection.create_connection()
+    key = new_idempotency_key()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            query = """
-                    INSERT INTO customer_orders(employee_username, time_of_order, total_price, total_no_of_items)
-                    VALUES (%s, %s, %s, %s)"""
-            cursor.execute(query,(order.employeeID, order.datetime, order.totalprice, order.total_items))
-            last_inserted_id = cursor.lastrowid
-            for menuItem in order.menu_items:
-                query = """
-                    INSERT INTO menu_item_order(order_id, menuNo, quantity, total_price, modifications)
-                    VALUES (%s, %s, %s, %s, %s)"""
-                modifications_json = json.dumps(menuItem.modifications)
-                cursor.execute(query,(last_inserted_id, menuItem.menuNumber, menuItem.quantity, menuItem.total_price,modifications_json ))
+            order_id = insert_order(cursor, order, key)
             db.commit()
-            return True
+            past_order_cache.invalidate(order.datetime.date())
+            live_sales.record(order)
+            return order_id
         except Exception as e:
-            raise Exception
+            if not get_storage().is_connection_error(e):
+                raise
+            # The connection dropped, possibly after the commit went through.
+            # The replay skips the order if the key turns out to be saved already.
+            print(f"Lost database connection while saving order, queuing it: {e}")
+        finally:
+            db.close()
+    order_journal.append(order, key)
+    live_sales.record(order)  # Taken even though it isn't saved yet
+    return None
+
+def insert_order(cursor, order: CustomerOrder, idempotency_key: str = None) -> int:
+    """Insert an order and its line items using an open cursor without committing.
+
+    The sales rollups are updated in the same transaction.
+
+    Args:
+        cursor: Cursor of the connection the transaction runs on
+        order (CustomerOrder): Order object containing order details
+        idempotency_key (str, optional): Unique key of the order, a second insert with the same key fails
+
+    Returns:
+        int: The order_id assigned to the new order
+    """
+    query = """
+            INSERT INTO customer_orders(employee_username, time_of_order, total_price, total_no_of_items, idempotency_key)
+            VALUES (%s, %s, %s, %s, %s)"""
+    cursor.execute(query,(order.employeeID, order.datetime, order.totalprice, order.total_items, idempotency_key))
+    order_id = cursor.lastrowid
+    rows = [(order_id, menuItem.menuNumber, menuItem.menuName, menuItem.menuPrice, menuItem.quantity,
+             menuItem.total_price, json.dumps(menuItem.modifications))
+            for menuItem in order.menu_items]
+    if rows:
+        # pymysql rewrites executemany on an INSERT ... VALUES into one multi-row statement,
+        # sqlite3 runs it as one prepared statement
+        query = """
+            INSERT INTO menu_item_order(order_id, menuNo, name, unit_price, quantity, total_price, modifications)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)"""
+        cursor.executemany(query, rows)
+    sales_rollups.record_order(cursor, order)
+    return order_id
+
+def save_queued_orders(batch: list) -> None:
+    """Save orders replayed from the order journal in a single transaction.
+
+    Orders whose idempotency key is already in the database were saved by an
+    earlier attempt and are skipped, so replaying a batch twice never creates duplicates.
+
+    Args:
+        batch (list): (idempotency_key, CustomerOrder) pairs
+
+    Raises:
+        ConnectionError: If database connection fails
+        Exception: If database operation fails, nothing in the batch is saved
+    """
+    db = get_storage().connect()
+    if db:
+        try:
+            cursor = db.cursor()
+            keys = [key for key, _ in batch]
+            placeholders = ", ".join(["%s"] * len(keys))
+            # Orders replayed very late may have been archived already
+            cursor.execute(union_all(f"SELECT idempotency_key FROM {{orders}} WHERE idempotency_key IN ({placeholders})"),
+                           union_params(keys))
+            saved = {row[0] for row in cursor.fetchall()}
+            for key, order in batch:
+                if key not in saved:
+                    insert_order(cursor, order, key)
+                    saved.add(key)
+            db.commit()
+            # Replayed orders can belong to days that are already closed
+            for day in {order.datetime.date() for _, order in batch}:
+                past_order_cache.invalidate(day)
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
     else:
         raise ConnectionError("Failed to establish database connection.")
-    
+
+def is_database_unreachable(error: Exception) -> bool:
+    """Tell whether saving failed because no connection could be opened or it was lost,
+    rather than the database rejecting the order.
+
+    Args:
+        error (Exception): The error raised while saving
+
+    Returns:
+        bool: True if saving may succeed later
+    """
+    return isinstance(error, ConnectionError) or get_storage().is_connection_error(error)
+
+def get_order_queue_stats() -> dict:
+    """Get the number of orders waiting in the order journal, the age of the oldest in seconds
+    and the number moved to its dead letter file after the database rejected them.
+
+    Returns:
+        dict: {"depth": int, "oldest_age": float or None, "failed": int}
+    """
+    return order_journal.stats()
+
+# Running figures of the current service for the dashboard, added to as orders are accepted
+live_sales = LiveSales(top_k=int(os.getenv("DASHBOARD_TOP_ITEMS", 10)))
+
+def load_live_sales() -> bool:
+    """Fill the live sales figures with today's orders from the sales rollups, used when the app starts.
+
+    Returns:
+        bool: False if an order was accepted meanwhile and the figures were kept
+
+    Raises:
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    version = live_sales.version
+    today = date.today()
+    names = {item.menuNumber: item.menuName for item in menu_catalog.all_items()}
+    return live_sales.seed(today, get_sales_totals(today), get_hourly_sales(today), get_item_sales(today),
+                           names, version=version)
+
+order_journal = OrderJournal(os.getenv("ORDER_JOURNAL", "MISC/order_journal.jsonl"))
+order_replayer = OrderReplayer(order_journal, save_queued_orders,
+                               interval=float(os.getenv("ORDER_REPLAY_INTERVAL", 15)),
+                               is_connection_error=is_database_unreachable)
+
 def get_mod_from_tag(tag: str) -> list:
-    """Get modifications info associated with a specific tag/grouping.
+    """Get modifications info associated with a specific tag/grouping from the modification cache.
 
     Args:
         tag (str): Group that the modification belongs to, if it's * get all entries on table
@@ -382,31 +582,53 @@ def get_mod_from_tag(tag: str) -> list:
         Exception: If database query fails
         ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    if (tag == "*"):
+        return modification_catalog.all_modifications()
+    return modification_catalog.modifications_for_tag(tag)
+
+def load_modifications() -> list:
+    """Load every modification from the database, used to fill the modification cache.
+
+    Returns:
+        list: (modification_name, additional_cost, tag_name) tuples
+
+    Raises:
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            if (tag == "*"):
-                query = """
-                        SELECT modification_name,additional_cost, tag_name 
-                        FROM modifications
-                        """
-                cursor.execute(query)
-            else:    
-                query = """
-                        SELECT modification_name, additional_cost
-                        FROM modifications
-                        WHERE tag_name = %s
-                        """
-                cursor.execute(query, tag)
-            row = cursor.fetchall()
-            return row 
+            query = """
+                    SELECT modification_name,additional_cost, tag_name 
+                    FROM modifications
+                    ORDER BY modification_id
+                    """
+            cursor.execute(query)
+            return cursor.fetchall()
         except Exception as e:
-            raise Exception
+            raise Exception(f"An error occurred: {e}")
         finally:
             db.close()
     else:
         raise ConnectionError("Failed to establish database connection.")
+
+def load_mod_tags() -> list:
+    """Load the modification tags from MISC/mod_tags.json.
+
+    Returns:
+        list: The tags, empty if the file is missing or invalid
+    """
+    try:
+        with open('MISC/mod_tags.json', 'r') as file:
+            return json.load(file).get("tags", [])  # Fallback to an empty list if "tags" is missing
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading mod_tags.json: {e}")
+        return []
+
+# Shared modification cache, reloaded after modifications are added or removed
+modification_catalog = ModificationCatalog(load_modifications, load_mod_tags)
     
 def add_mod_to_database(name : str, cost : float, tag : str) -> bool:
     """
@@ -419,7 +641,7 @@ def add_mod_to_database(name : str, cost : float, tag : str) -> bool:
         
     Returns:
         bool : True if successful, False if there was an error adding modification"""
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
@@ -428,6 +650,7 @@ def add_mod_to_database(name : str, cost : float, tag : str) -> bool:
                     VALUES (%s, %s, %s)"""
             cursor.execute(query,(name, cost, tag))
             db.commit()
+            modification_catalog.invalidate()
             return True
         # Ensure database changes are rolled back if an error
         except Exception as e:
@@ -448,15 +671,16 @@ def remove_mod(mod : str) -> bool:
         
     Returns:
         bool : True if successfully removed, False if there was an error deleting modification"""
-    db = db_connection.create_connection()
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
             query = """
                     DELETE FROM modifications
                     WHERE modification_name = %s"""
-            cursor.execute(query,(mod))
+            cursor.execute(query,(mod,))
             db.commit()
+            modification_catalog.invalidate()
             return True
         # Ensure database changes are rolled back if an error
         except Exception as e:
@@ -468,9 +692,23 @@ def remove_mod(mod : str) -> bool:
     else:
         raise ConnectionError("Failed to establish database connection.")
 
+def _past_order_day_version(day: date) -> list:
+    """Summarise a day from its daily sales rollup, which changes with every order of the day saved by any process."""
+    totals = get_sales_totals(day)
+    return [totals["orders"], totals["items"], totals["revenue"].pence]
+
+# Results of closed days keyed by day, checked against the day's sales rollup in case
+# another process saved an order of the day
+past_order_cache = DayCache(capacity=int(os.getenv("PAST_ORDER_CACHE_DAYS", 64)),
+                            directory=os.getenv("PAST_ORDER_CACHE_DIR") or None,
+                            version=_past_order_day_version,
+                            check_interval=float(os.getenv("PAST_ORDER_CACHE_CHECK_INTERVAL", 30)))
+
 def get_past_order(date: str) -> list:
     """Get past orders from the database.
 
+    Orders of days before today come from the past order cache after the first request.
+
     Args:
         date (str): Date to search for past orders generally in YYYY-MM-DD format
 
@@ -481,99 +719,447 @@ def get_past_order(date: str) -> list:
         Exception: If database query fails
         ConnectionError: If database connection fails
     """
-    db = db_connection.create_connection()
+    # A half-open range lets the time_of_order index be used, DATE(time_of_order) can't
+    range_start, range_end = date_range_bounds(date)
+    rows = past_order_cache.get(range_start.date(), "orders",
+                                lambda: _fetch_rows(PAST_ORDERS_QUERY, union_params((range_start, range_end))))
+    return [tuple(row) for row in rows]
+    
+def get_past_order_items(order_id: int, day: date = None) -> list:
+    """Get items associated with a past order.
+
+    Args:
+        order_id (int): Order ID to look up items for
+        day (date, optional): Day of the order, the items are cached with the day's results when given
+
+    Returns:
+        list: List of tuples containing item details
+
+    Raises:
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    fetch = lambda: _fetch_rows(PAST_ORDER_ITEMS_QUERY, union_params((order_id,)))
+    rows = fetch() if day is None else past_order_cache.get(day, f"items {order_id}", fetch)
+    return [tuple(row[:5]) for row in rows]
+
+def _fetch_rows(query: str, params: tuple) -> list:
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            query = """SELECT employee_username, order_id, time_of_order, total_no_of_items
-                    FROM customer_orders
-                    WHERE DATE(time_of_order) = %s
-                    ORDER BY time_of_order ASC;
-                    """
-            cursor.execute(query, date)
-            row = cursor.fetchall()
-            return row
+            cursor.execute(query, params)
+            return cursor.fetchall()
         except Exception as e:
-            raise Exception
+            raise Exception(f"An error occurred: {e}")
         finally:
             db.close()
     else:
         raise ConnectionError("Failed to establish database connection.")
     
-def get_past_order_items(order_id: int) -> list:
-    """Get items associated with a past order.
+def get_past_orders_with_items(start_date, end_date=None) -> list:
+    """Load every order and all of their line items for a date or date range.
+
+    Orders and line items are each fetched with one set-based query over the
+    whole range on a single connection, then assembled into objects in one pass.
 
     Args:
-        order_id (int): Order ID to look up items for
+        start_date (date | str): First day to load, a date or a YYYY-MM-DD string
+        end_date (date | str, optional): Last day to load (inclusive). Defaults to start_date
 
     Returns:
-        list: List of tuples containing item details"
-        """
-    db = db_connection.create_connection()
+        list: List of CustomerOrder objects ordered by time of order
+
+    Raises:
+        ValueError: If a date string is not in YYYY-MM-DD format
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    range_start, range_end = date_range_bounds(start_date, end_date)
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
-            query = """SELECT mio.menuNo, m.name ,mio.quantity, m.price, mio.modifications
-                    FROM menu_item_order AS mio
-                    JOIN menu AS m
-                    ON mio.menuNo = m.menuNo
-                    WHERE order_id = %s;
-                    """
-            cursor.execute(query, order_id)
-            row = cursor.fetchall()
-            return row
+            cursor.execute(PAST_ORDERS_QUERY, union_params((range_start, range_end)))
+            order_rows = cursor.fetchall()
+
+            cursor.execute(ORDER_ITEMS_IN_RANGE_QUERY, union_params((range_start, range_end)))
+            item_rows = cursor.fetchall()
         except Exception as e:
-            raise Exception
+            raise Exception(f"An error occurred: {e}")
         finally:
             db.close()
     else:
         raise ConnectionError("Failed to establish database connection.")
-    
-def remove_menu_item_tags(tags_to_remove: set[str]) -> bool:
+
+    items_by_order = {}
+    for row, item in zip(item_rows, build_order_items(row[1:6] for row in item_rows)):
+        items_by_order.setdefault(row[0], []).append(item)
+
+    return [
+        CustomerOrder.CustomerOrder(
+            employee_id,
+            order_id,
+            menu_items=items_by_order.get(order_id, []),
+            date_time=time_of_order,
+            total_items=item_count
+        )
+        for employee_id, order_id, time_of_order, item_count in order_rows
+    ]
+
+def get_past_order_page(start_date, end_date=None, after: tuple = None, limit: int = ORDER_PAGE_SIZE) -> list:
+    """Get one page of order headers in a date range, without their items.
+
+    Pages are read with keyset pagination: each page continues after the last
+    order of the previous one, so every page costs the same however deep into
+    the range it is. Pages of a single day before today come from the past order cache.
+
+    Args:
+        start_date (date | str): First day of the range, a date or a YYYY-MM-DD string
+        end_date (date | str, optional): Last day of the range (inclusive). Defaults to start_date
+        after (tuple, optional): (time_of_order, order_id) of the last order of the previous page,
+                                 None for the first page
+        limit (int): Maximum number of orders in the page
+
+    Returns:
+        list: Dicts with order_id, employee_id, time_of_order, total_items and total_price,
+              ordered by time of order then order ID
+
+    Raises:
+        ValueError: If a date string is not in YYYY-MM-DD format
+        Exception: If database query fails
+        ConnectionError: If database connection fails
     """
-    Removes a set of tags from all menu items in the database.
+    range_start, range_end = date_range_bounds(start_date, end_date)
+    after_time, after_id = after or (range_start, 0)
+    fetch = lambda: _fetch_rows(union_all(ORDER_PAGE_QUERY, order_by=ORDER_PAGE_ORDER, limit=limit),
+                                union_params((range_start, range_end, after_time, after_time, after_id)))
+    if range_end - range_start == timedelta(days=1):
+        # Pages of a single day are cached with the day's results
+        rows = past_order_cache.get(range_start.date(), f"page {after_time.isoformat()} {after_id} {limit}", fetch)
+    else:
+        rows = fetch()
+
+    return [
+        {
+            "order_id": order_id,
+            "employee_id": employee_id,
+            "time_of_order": time_of_order,
+            "total_items": item_count or 0,
+            "total_price": Money.of(total_price or 0),
+        }
+        for order_id, employee_id, time_of_order, item_count, total_price in rows
+    ]
+
+def get_past_order_with_items(header: dict) -> CustomerOrder.CustomerOrder:
+    """Load the items of an order header returned by get_past_order_page.
 
     Args:
-        tags_to_remove (set[str]): A set of tags to be removed from menu items.
+        header (dict): The order header
+
+    Returns:
+        CustomerOrder: The order with its items
+
+    Raises:
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    day = header["time_of_order"].date()
+    items = build_order_items(get_past_order_items(header["order_id"], day))
+    return CustomerOrder.CustomerOrder(
+        header["employee_id"],
+        header["order_id"],
+        menu_items=items,
+        date_time=header["time_of_order"],
+        total_items=header["total_items"]
+    )
+
+def build_order_items(rows) -> list:
+    """Build MenuItemOrders from past order item rows in bulk.
+
+    The rows come from our own tables, so the items are built without validating them again.
+
+    Args:
+        rows (iterable): (menuNo, name, quantity, unit price, modifications JSON) rows
+
+    Returns:
+        list: The ordered items in the order of the rows
+    """
+    parsed = {}  # Lines share a few modifications, each is parsed once and copied for every line
+    return MenuItemOrder.MenuItemOrder.from_rows(
+        (menu_no, product_name, quantity, price, _parse_modifications(parsed, modifications))
+        for menu_no, product_name, quantity, price, modifications in rows
+    )
+
+def _parse_modifications(parsed: dict, modifications) -> dict:
+    """Parse the modifications JSON of an order line into a dict of its own, {} if there is none."""
+    if not isinstance(modifications, str):
+        return {}
+    if modifications not in parsed:
+        parsed[modifications] = json.loads(modifications)
+    return dict(parsed[modifications])
+
+def get_sales_totals(start_date, end_date=None) -> dict:
+    """Get the sales totals of a day or range of days from the daily rollup.
+
+    Args:
+        start_date (date | str): First day, a date or a YYYY-MM-DD string
+        end_date (date | str, optional): Last day (inclusive). Defaults to start_date
+
+    Returns:
+        dict: Number of 'orders', number of 'items' and 'revenue' as Money
+
+    Raises:
+        ValueError: If a date string is not in YYYY-MM-DD format
+        Exception: If database query fails
+        ConnectionError: If database connection fails
+    """
+    orders, items, revenue = _read_sales_rollup(sales_rollups.totals, start_date, end_date)
+    return {"orders": int(orders), "items": int(items), "revenue": Money.of(revenue)}
+
+def get_hourly_sales(start_date, end_date=None) -> list:
+    """Get the sales of each hour of the day over a day or range of days.
 
     Returns:
-        bool: True if the operation is successful, False otherwise.
+        list: (hour, orders, items, revenue) tuples in hour order, revenue as Money
     """
-    db = db_connection.create_connection()
+    return [(int(hour), int(orders), int(items), Money.of(revenue))
+            for hour, orders, items, revenue in _read_sales_rollup(sales_rollups.hourly, start_date, end_date)]
+
+def get_item_sales(start_date, end_date=None) -> list:
+    """Get the sales of each menu item over a day or range of days, best selling first.
+
+    Returns:
+        list: (menuNo, quantity, revenue) tuples, revenue as Money
+    """
+    return [(menuNo, int(quantity), Money.of(revenue))
+            for menuNo, quantity, revenue in _read_sales_rollup(sales_rollups.by_item, start_date, end_date)]
+
+def get_employee_sales(start_date, end_date=None) -> list:
+    """Get the sales taken by each employee over a day or range of days.
+
+    Returns:
+        list: (employee_username, orders, items, revenue) tuples, highest revenue first, revenue as Money
+    """
+    return [(employee, int(orders), int(items), Money.of(revenue))
+            for employee, orders, items, revenue in _read_sales_rollup(sales_rollups.by_employee, start_date, end_date)]
+
+def _read_sales_rollup(reader, start_date, end_date):
+    range_start, range_end = date_range_bounds(start_date, end_date)
+    db = get_storage().connect()
+    if db:
+        try:
+            return reader(db.cursor(), range_start.date(), (range_end - timedelta(days=1)).date())
+        except Exception as e:
+            raise Exception(f"An error occurred: {e}")
+        finally:
+            db.close()
+    else:
+        raise ConnectionError("Failed to establish database connection.")
+
+def rebuild_sales_rollups(start_date=None, end_date=None) -> None:
+    """Recalculate the sales rollups from the order tables.
+
+    Args:
+        start_date (date | str, optional): First day to rebuild. Defaults to every day with orders
+        end_date (date | str, optional): Last day to rebuild (inclusive). Defaults to start_date
+
+    Raises:
+        Exception: If database operation fails
+        ConnectionError: If database connection fails
+    """
+    db = get_storage().connect()
     if db:
         try:
             cursor = db.cursor()
+            if start_date is None:
+                sales_rollups.rebuild_all(cursor)
+            else:
+                sales_rollups.rebuild(cursor, *date_range_bounds(start_date, end_date))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"An error occurred: {e}")
+        finally:
+            db.close()
+    else:
+        raise ConnectionError("Failed to establish database connection.")
 
-            # Retrieve all menu items with their tags
-            query = "SELECT menuNo, tags FROM menu"
-            cursor.execute(query)
-            rows = cursor.fetchall()
+def date_range_bounds(start_date, end_date=None) -> tuple:
+    """Convert an inclusive range of days into a half-open datetime range.
 
-            for row in rows:
-                entry_id = row[0]
-                tags = json.loads(row[1])  # Parse JSON tags into a Python list
+    Args:
+        start_date (date | str): First day of the range, a date or a YYYY-MM-DD string
+        end_date (date | str, optional): Last day of the range (inclusive). Defaults to start_date
 
-                # Remove the specified tags
-                updated_tags = [tag for tag in tags if tag not in tags_to_remove]
+    Returns:
+        tuple: (start datetime, datetime of midnight after the last day)
 
-                # Handle empty tags by adding "None"
-                if not updated_tags:
-                    updated_tags = ["None"]
+    Raises:
+        ValueError: If a date string is not in YYYY-MM-DD format or the range is reversed
+    """
+    def to_date(value) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value).strip())
 
-                # Update the database with the modified tags
-                update_query = "UPDATE menu SET tags = %s WHERE menuNo = %s"
-                cursor.execute(update_query, (json.dumps(updated_tags), entry_id))
+    first = to_date(start_date)
+    last = to_date(end_date) if end_date is not None else first
+    if last < first:
+        raise ValueError("The end date must not be before the start date.")
+    return datetime.combine(first, datetime.min.time()), datetime.combine(last + timedelta(days=1), datetime.min.time())
 
-            db.commit()
-            return True
+def remove_menu_item_tags(tags_to_remove: set[str]) -> int:
+    """
+    Removes a set of tags from all menu items in the database and from the saved tags.
+
+    Args:
+        tags_to_remove (set[str]): A set of tags to be removed from menu items.
+
+    Returns:
+        int: Number of menu items that had at least one of the tags.
+    """
+    tags = [tag for tag in load_tags() if tag not in tags_to_remove]
+    return save_tag_changes(tags, removed=tags_to_remove)
+
+def rename_menu_item_tag(old_tag: str, new_tag: str) -> int:
+    """
+    Renames a tag on all menu items and in the saved tags. Renaming to a tag
+    that already exists merges the two.
+
+    Args:
+        old_tag (str): The tag to rename
+        new_tag (str): Its new name
+
+    Returns:
+        int: Number of menu items that had the old tag.
+    """
+    return merge_menu_item_tags({old_tag}, new_tag)
+
+def merge_menu_item_tags(source_tags: set[str], target_tag: str) -> int:
+    """
+    Replaces several tags with a single tag on all menu items and in the saved tags.
+
+    Args:
+        source_tags (set[str]): The tags to merge away
+        target_tag (str): The tag they are merged into, created if it doesn't exist
 
+    Returns:
+        int: Number of menu items that had at least one of the source tags.
+    """
+    tags = []
+    for tag in load_tags():
+        tag = target_tag if tag in source_tags else tag
+        if tag not in tags:
+            tags.append(tag)
+    if target_tag not in tags:
+        tags.append(target_tag)
+    return save_tag_changes(tags, renamed={tag: target_tag for tag in source_tags})
+
+def save_tag_changes(tags: list, removed: set[str] = (), renamed: dict = None) -> int:
+    """
+    Applies tag removals, renames and merges to every menu item and saves the
+    list of tags to MISC/tags.json, all or nothing.
+
+    Each kind of change is one set-based statement on menu_tags touching only
+    the rows of the affected tags. The tags file is replaced just before the
+    database commit and restored if the commit fails.
+
+    Args:
+        tags (list): The complete list of tags to save
+        removed (set[str], optional): Tags to remove from menu items. Renames are applied first.
+        renamed (dict, optional): Maps old tags to new tags, a new tag that already exists is a merge
+
+    Returns:
+        int: Number of menu items that were changed
+
+    Raises:
+        ValueError: If a tag is renamed to a tag that is itself being renamed
+        Exception: If the database or file update fails, nothing is changed
+        ConnectionError: If database connection fails
+    """
+    removed = set(removed)
+    renamed = {old: new for old, new in (renamed or {}).items() if old != new}
+    if set(renamed) & set(renamed.values()):
+        raise ValueError("A tag cannot be renamed to a tag that is also being renamed.")
+
+    db = get_storage().connect()
+    if db:
+        previous_file = None
+        try:
+            cursor = db.cursor()
+            old_tags = tuple(set(renamed) | removed)
+            changed = 0
+            if old_tags:
+                placeholders = ", ".join(["%s"] * len(old_tags))
+                cursor.execute(f"SELECT COUNT(DISTINCT menuNo) FROM menu_tags WHERE tag IN ({placeholders})", old_tags)
+                changed = cursor.fetchone()[0]
+
+                targets = {}
+                for old, new in renamed.items():
+                    targets.setdefault(new, []).append(old)
+                for new, olds in targets.items():
+                    # Rows of items that already have the new tag are skipped and deleted below
+                    placeholders = ", ".join(["%s"] * len(olds))
+                    cursor.execute(f"{get_storage().update_ignore} menu_tags SET tag = %s WHERE tag IN ({placeholders})", (new, *olds))
+
+                # Items left without tags have no rows and load as ["None"]
+                placeholders = ", ".join(["%s"] * len(old_tags))
+                cursor.execute(f"DELETE FROM menu_tags WHERE tag IN ({placeholders})", old_tags)
+
+            previous_file = _replace_tags_file(tags)
+            db.commit()
         except Exception as e:
             db.rollback()  # Undo changes in case of an error
-            print(f"Error: {e}")
-            return False
-
+            if previous_file is not None:
+                _restore_tags_file(previous_file)
+            raise Exception(f"Tags could not be updated: {e}")
         finally:
             db.close()
     else:
         raise ConnectionError("Failed to establish database connection.")
-        
\ No newline at end of file
+
+    menu_catalog.rename_tags(renamed)
+    menu_catalog.remove_tags(removed)
+    return changed
+
+TAGS_FILE = 'MISC/tags.json'
+
+def load_tags() -> list:
+    """
+    Retrieves the saved menu tags.
+
+    Returns:
+        list: All tags currently on file, empty if the file is missing or invalid
+    """
+    try:
+        with open(TAGS_FILE, 'r') as file:
+            return json.load(file).get("tags", [])
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading tags.json: {e}")
+        return []
+
+def _replace_tags_file(tags: list) -> str:
+    """Atomically replace the tags file, returning its previous contents."""
+    try:
+        with open(TAGS_FILE, 'r') as file:
+            previous = file.read()
+    except FileNotFoundError:
+        previous = ""
+    temp_path = TAGS_FILE + ".tmp"
+    with open(temp_path, 'w') as file:
+        json.dump({"tags": list(tags)}, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, TAGS_FILE)
+    return previous
+
+def _restore_tags_file(previous: str) -> None:
+    """Put back the tags file contents saved by _replace_tags_file."""
+    try:
+        with open(TAGS_FILE, 'w') as file:
+            file.write(previous)
+    except IOError as e:
+        print(f"Error restoring tags.json: {e}")
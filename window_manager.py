@@ -8,11 +8,29 @@ from GUI.employee_gui import EmployeeGui
 from GUI.view_past_order_gui import PastOrdersGUI
 from GUI.edit_tags_gui import EditTagsGUI
 from GUI.edit_modifications_gui import EditModsGUI
+from GUI.dashboard_gui import DashboardGUI
+from Helpers.db_executor import DBExecutor
+from gui_functions import order_replayer, load_live_sales
 
 class WindowManager:
     def __init__(self):
         self.root = Tk()  # The single Tk() instance
         self.root.withdraw()  # Start with the root window hidden
+        # Runs database calls off the Tk thread, every screen shares it
+        self.db_executor = DBExecutor(self.root, on_busy=self.set_busy)
+        # Saves orders queued while the database was unreachable
+        order_replayer.start()
+        # Carry on the dashboard figures from orders already taken today
+        self.db_executor.submit(load_live_sales)
+
+    def set_busy(self, busy: bool) -> None:
+        """Show a busy cursor on every open window while database calls are running."""
+        cursor = "watch" if busy else ""
+        for window in [self.root] + self.root.winfo_children():
+            try:
+                window.config(cursor=cursor)
+            except Exception:
+                pass  # Not every widget supports a cursor option
 
     def show_login_screen(self):
         # Create the login screen within the single root instance
@@ -33,6 +51,8 @@ class WindowManager:
     def run(self):
         self.show_login_screen()
         self.root.mainloop()
+        self.db_executor.shutdown()
+        order_replayer.stop()
 
     def show_add_users(self):
         self.root.withdraw()
@@ -64,6 +84,11 @@ class WindowManager:
         new_window = Toplevel(self.root)
         EditModsGUI(new_window, self)
 
+    def show_dashboard_screen(self):
+        self.root.withdraw()
+        new_window = Toplevel(self.root)
+        DashboardGUI(new_window, self)
+
 if __name__ == "__main__":
     app = WindowManager()
     app.run()